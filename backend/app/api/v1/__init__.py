@@ -1,9 +1,15 @@
 from .health import router as health_router
 from .book import router as book_router
 from .shows import router as shows_router
+from .queue import router as queue_router
+from .payments import router as payments_router
+from .admin import router as admin_router
 
 all_routes = [
     {'router': health_router, 'prefix': '/health', 'tags': ['health']},
     {'router': book_router, 'prefix': '/book', 'tags': ['book']},
     {'router': shows_router, 'prefix': '/show', 'tags': ['show']},
+    {'router': queue_router, 'prefix': '/queue', 'tags': ['queue']},
+    {'router': payments_router, 'prefix': '/payments', 'tags': ['payments']},
+    {'router': admin_router, 'prefix': '/admin', 'tags': ['admin']},
 ]
@@ -0,0 +1,50 @@
+import hmac
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+
+from ...config import CONFIG
+from ...repositories.query_stats import query_stat, query_stats, reset_query_stats
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def require_admin(token: str | None = Header(None, alias=ADMIN_TOKEN_HEADER)) -> None:
+    """Allow callers presenting CONFIG.admin_token; refuse everyone when it is unset."""
+    if not CONFIG.admin_token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin endpoints are disabled")
+    if token is None or not hmac.compare_digest(token, CONFIG.admin_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/queries")
+async def list_queries(
+    sort: Literal["seconds_total", "seconds_avg", "seconds_max", "calls", "slow"] = "seconds_total",
+    limit: int = Query(50, ge=1, le=500),
+):
+    """SQL statement fingerprints of this worker, heaviest first.
+
+    Returns:
+        dict: The slow query threshold, the number of tracked / dropped
+        fingerprints and, per fingerprint, its normalized SQL, call count,
+        total / average / max latency and slow executions.
+    """
+    return query_stats(sort=sort, limit=limit)
+
+
+@router.get("/queries/{fingerprint}")
+async def get_query(fingerprint: str):
+    """One fingerprint with its latency histogram and latest EXPLAIN (ANALYZE, BUFFERS) plans."""
+    stat = query_stat(fingerprint)
+    if stat is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown fingerprint")
+    return stat.details()
+
+
+@router.delete("/queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_queries():
+    """Forget the statistics collected so far (e.g. after a deploy)."""
+    reset_query_stats()
@@ -1,35 +1,73 @@
 import asyncio
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 
 from .schema.request import SeatBookingRequest
-from ...config.auth import enable_auth, get_user
-from ...config import log
+from ...config.auth import (
+    enable_auth,
+    get_user,
+    idempotent,
+    rate_limit,
+    release_admission,
+    require_admission,
+)
+from ...config import log, CONFIG
+from ...domain.errors import BookingInProgress, HoldExpired, PaymentFailed, SeatNotAvailable
+from ...domain.models import BookingDetailsResponse, HoldSeatsResponse, TicketDTO
+from ...repositories.uow import AsyncUnitOfWork
 from ...services.bookings import IBookingService, BookingService
 
 router = APIRouter()
 
+# Bounds the number of seat holds awaiting Redis at once; beyond that the
+# worker sheds load with 429 instead of queueing work on the event loop.
+_reserve_slots = asyncio.Semaphore(CONFIG.reserve_max_in_flight)
+
 
 @router.put("/reserve")
 @enable_auth
+@rate_limit
+@require_admission
 async def reserve_seats(
     request: Request,
     payload: SeatBookingRequest,
 ):
     log.info("[/booking/reserve] api called")
 
+    if _reserve_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many seat holds in flight, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    user_name = get_user(request)
     service: IBookingService = BookingService()
-    asyncio.create_task(
-        service.reserve_seats(show_id=str(payload.show_id), seat_ids=payload.seat_ids))
 
-    response_payload = {
-        "status": "accepted", **payload.model_dump()
-    }
-    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=response_payload)
+    async with _reserve_slots:
+        try:
+            hold: HoldSeatsResponse = await service.reserve_seats(
+                user_id=user_name,
+                show_id=str(payload.show_id),
+                seat_ids=payload.seat_ids,
+                hold_token=payload.hold_token,
+            )
+        except SeatNotAvailable as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "Seats are already held", "seat_ids": e.args[0]},
+            ) from e
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content=hold.model_dump(mode="json"))
 
 
 @router.post("")
 @enable_auth
+@idempotent
+@rate_limit
+@require_admission
 async def book_a_seat(
     request: Request,
     payload: SeatBookingRequest,
@@ -40,10 +78,81 @@ async def book_a_seat(
 
     user_name = get_user(request)
     service: IBookingService = BookingService()
-    await service.book_seats(user_id=user_name, show_id=str(payload.show_id), seat_ids=payload.seat_ids)
+    try:
+        if CONFIG.booking_payment_mode == "async":
+            # Pending until the payment webhook confirms it
+            payment = await service.initiate_booking(
+                user_id=user_name,
+                show_id=str(payload.show_id),
+                seat_ids=payload.seat_ids,
+                hold_token=payload.hold_token,
+            )
+        else:
+            payment = None
+            await service.book_seats(
+                user_id=user_name,
+                show_id=str(payload.show_id),
+                seat_ids=payload.seat_ids,
+                hold_token=payload.hold_token,
+            )
+    except HoldExpired as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Seats are not held by this booking", "seat_ids": e.args[0]},
+        ) from e
+    except SeatNotAvailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Seats are not available", "seat_ids": e.args[0]},
+        ) from e
+    except BookingInProgress as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "A booking is already pending for this hold", "booking_id": e.args[0]},
+        ) from e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    except PaymentFailed as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail={"message": "Payment could not be started", "payment_id": e.args[0]},
+        ) from e
+
+    # Booked: hand the waiting room slot to the next in line
+    await release_admission(request)
+
+    if payment is not None:
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=payment.model_dump(mode="json"))
 
     response_payload = {
         "status": "seats_booked", **payload.model_dump()
     }
 
     return JSONResponse(status_code=status.HTTP_201_CREATED, content=response_payload)
+
+
+@router.get("/{booking_id}")
+@enable_auth
+async def get_booking(request: Request, booking_id: int):
+    """Status and tickets of a booking; poll it after POST /book returned 202."""
+    async with AsyncUnitOfWork() as uow:
+        booking = await uow.table_bookings.get(booking_id)
+        if booking is None or str(booking.user_id) != get_user(request):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+        tickets = await uow.table_tickets.list_for_booking(booking_id)
+
+    details = BookingDetailsResponse(
+        booking_id=booking.booking_id,
+        status=booking.status,
+        tickets=[
+            TicketDTO(
+                ticket_id=t.ticket_id,
+                show_id=t.show_id,
+                seat_id=t.seat_id,
+                ticket_code=t.ticket_code,
+                issued_at=t.issued_at,
+            )
+            for t in tickets
+        ],
+    )
+    return JSONResponse(status_code=status.HTTP_200_OK, content=details.model_dump(mode="json"))
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
 from ...config import log
+from ...repositories.uow import pool_stats
+from ...services.rate_limit import rate_limiter
 
 router = APIRouter()
 
@@ -14,3 +16,25 @@ async def health_check():
     """
     log.info("health_check_called")
     return {"status": "healthy", "version": "1.0.0"}
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    """Connection pool metrics of every DB engine.
+
+    Returns:
+        dict: Per-engine pool size, checked-out / waiting connections,
+        checkout latency and overflow / timeout counters.
+    """
+    return pool_stats()
+
+
+@router.get("/rate-limits")
+async def rate_limit_metrics():
+    """Rate limiter counters of this worker.
+
+    Returns:
+        dict: Allowed requests, rejections per scope (user / show) split by
+        where they were decided (local pre-filter or Redis), Redis errors.
+    """
+    return rate_limiter.stats()
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from .schema.request import PaymentWebhookRequest
+from ...config import CONFIG, log
+from ...db.models import PaymentStatus
+from ...domain.errors import BookingNotFound
+from ...services.bookings import BookingService, IBookingService
+from ...services.payments import StubPaymentProvider, payment_provider, verify_webhook_signature
+
+router = APIRouter()
+
+PAYMENT_SIGNATURE_HEADER = "X-Payment-Signature"
+
+
+@router.post("/webhook")
+async def payment_webhook(
+    request: Request,
+    signature: str | None = Header(None, alias=PAYMENT_SIGNATURE_HEADER),
+):
+    """Payment outcome reported by the provider; confirms or cancels the booking.
+
+    The body is signed with HMAC-SHA256 (see services/payments.py).
+    Deliveries may be retried: settling an already settled payment is a no-op.
+    Refused (503) while no `payment_webhook_secret` is configured.
+    """
+    if not CONFIG.payment_webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Payment webhooks are not configured")
+
+    body = await request.body()
+    if not verify_webhook_signature(body, signature):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
+
+    try:
+        event = PaymentWebhookRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.errors()) from e
+    if event.status not in (PaymentStatus.success.value, PaymentStatus.failed.value):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown payment status {event.status}")
+
+    log.info(f"[/payments/webhook] payment {event.payment_id}: {event.status}")
+
+    service: IBookingService = BookingService()
+    try:
+        booking_status = await service.confirm_payment(
+            event.payment_id, succeeded=event.status == PaymentStatus.success.value)
+    except BookingNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"payment_id": event.payment_id, "booking_status": booking_status.value},
+    )
+
+
+if CONFIG.payment_stub_enabled:
+    # Dev / test only: unauthenticated on purpose, never mounted otherwise
+    @router.post("/stub/{payment_id}")
+    async def complete_stub_payment(payment_id: int, succeeded: bool = True):
+        """Settle a payment of the local stub provider (the stub's "checkout page")."""
+        if not isinstance(payment_provider, StubPaymentProvider):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+        try:
+            await payment_provider.complete(payment_id, succeeded)
+        except BookingNotFound as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+        return JSONResponse(status_code=status.HTTP_200_OK, content={"payment_id": payment_id})
@@ -0,0 +1,71 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+
+from ...config.auth import ADMISSION_TOKEN_HEADER, enable_auth, get_user
+from ...config import log
+from ...domain.models import AdmissionStatus
+from ...services.admission import ADMITTED, admission_queue
+
+router = APIRouter()
+
+# Suggested polling interval for waiting clients
+_POLL_AFTER_SECONDS = 2
+
+
+def _status_response(admission: AdmissionStatus) -> JSONResponse:
+    if admission.state == ADMITTED:
+        return JSONResponse(status_code=status.HTTP_200_OK, content=admission.model_dump())
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=admission.model_dump(),
+        headers={"Retry-After": str(_POLL_AFTER_SECONDS)},
+    )
+
+
+@router.post("/{show_id}")
+@enable_auth
+async def join_queue(
+    request: Request,
+    show_id: int,
+    admission_token: Optional[str] = Header(None, alias=ADMISSION_TOKEN_HEADER),
+):
+    """Join the waiting room of a show (re-joining with a token keeps the place)."""
+    log.info(f"[/queue/{show_id}] join called")
+
+    admission = await admission_queue.join(show_id, get_user(request), admission_token)
+    if admission is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Could not join with this admission token, join again without it",
+        )
+    return _status_response(admission)
+
+
+@router.get("/{show_id}")
+@enable_auth
+async def queue_status(
+    request: Request,
+    show_id: int,
+    admission_token: str = Header(..., alias=ADMISSION_TOKEN_HEADER),
+):
+    """Position and wait estimate, or admission, of a queue token."""
+    admission = await admission_queue.status(show_id, get_user(request), admission_token)
+    if admission is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown or expired admission token, join the queue again",
+        )
+    return _status_response(admission)
+
+
+@router.delete("/{show_id}")
+@enable_auth
+async def leave_queue(
+    request: Request,
+    show_id: int,
+    admission_token: str = Header(..., alias=ADMISSION_TOKEN_HEADER),
+):
+    """Leave the queue, or give back an admission slot."""
+    await admission_queue.leave(show_id, get_user(request), admission_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,7 +1,13 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
 
 class SeatBookingRequest(BaseModel):
     show_id: str
-    seat_ids: List[str]
\ No newline at end of file
+    seat_ids: List[str]
+    hold_token: Optional[str] = None
+
+class PaymentWebhookRequest(BaseModel):
+    payment_id: int
+    # "success" | "failed"
+    status: str
@@ -1,15 +1,38 @@
-from typing import List
-from fastapi import APIRouter, Query, Request, status
+import json
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from ...services.shows import IShowService, ShowListItem, ShowService
+from ...services.shows import IShowService, ShowListItem, ShowPage, ShowService
 
 from ...config.auth import enable_auth, get_user
 from ...config import log
 
 router = APIRouter()
 
+# One entity-tag of an If-None-Match list: optional weak prefix, quoted opaque tag
+_ENTITY_TAG = re.compile(r'(?:W/)?("[^"]*")')
+
+
+def _json_array(items: List[ShowListItem]) -> Iterator[str]:
+    """Encode `items` as a JSON array, one element per chunk."""
+    yield "["
+    for i, item in enumerate(items):
+        yield ("," if i else "") + json.dumps(jsonable_encoder(item))
+    yield "]"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _ENTITY_TAG.fullmatch(etag)
+    wanted = opaque.group(1) if opaque else etag
+    return any(tag == wanted for tag in _ENTITY_TAG.findall(if_none_match))
+
 
 @router.get("")
 @enable_auth
@@ -17,18 +40,36 @@ async def get_events(
     request: Request,
     category: str = Query(...),
     city: str = Query(...),
+    starts_from: Optional[datetime] = Query(None, alias="from"),
+    starts_before: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
 ):
     log.info("[/show] api called")
 
     service: IShowService = ShowService()
-    response_payload: List[ShowListItem] = await service.list_shows(
-        category=category,
-        city=city
-    )
+    try:
+        page: ShowPage = await service.list_shows(
+            category=category,
+            city=city,
+            starts_from=starts_from,
+            starts_before=starts_before,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return JSONResponse(
+    # The body stays a plain array; the next page is advertised in a header
+    headers = {}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+
+    return StreamingResponse(
+        _json_array(page.items),
         status_code=status.HTTP_200_OK,
-        content=jsonable_encoder(response_payload),
+        media_type="application/json",
+        headers=headers,
     )
 
 
@@ -48,3 +89,32 @@ async def book_a_seat(
         status_code=status.HTTP_200_OK,
         content=jsonable_encoder(response_payload),
     )
+
+
+@router.get("/{show_id}/seats")
+@enable_auth
+async def get_seat_map(
+    request: Request,
+    show_id: int,
+):
+
+    log.info(f"[/show/{show_id}/seats] api called")
+
+    service: IShowService = ShowService()
+    try:
+        seat_map = await service.get_seat_map(show_id=show_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if seat_map is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Show not found")
+
+    etag = seat_map.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("If-None-Match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=seat_map.to_dict(),
+        headers=headers,
+    )
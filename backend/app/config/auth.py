@@ -4,9 +4,22 @@ import inspect
 from functools import wraps
 from typing import Any, Callable, Optional
 
-from fastapi import HTTPException, Request, status
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
 
-__all__ = ["enable_auth"]
+from .config import CONFIG
+
+__all__ = [
+    "enable_auth",
+    "idempotent",
+    "rate_limit",
+    "require_admission",
+    "release_admission",
+    "ADMISSION_TOKEN_HEADER",
+]
+
+ADMISSION_TOKEN_HEADER = "X-Admission-Token"
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
 
 
 def enable_auth(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -31,6 +44,206 @@ def enable_auth(func: Callable[..., Any]) -> Callable[..., Any]:
     return wrapper
 
 
+def require_admission(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Let only sessions admitted by the waiting room reach the endpoint.
+
+    A no-op unless CONFIG.admission_queue_enabled. Apply it below
+    `enable_auth`; the endpoint needs a `payload` with a `show_id`. The
+    admission is kept on `request.state.admission` for `release_admission`.
+    """
+    # Imported here: services import the config package
+    from ..services.admission import admission_queue
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if CONFIG.admission_queue_enabled:
+            request = _extract_request(args, kwargs)
+            if request is None:
+                raise RuntimeError("admission decorator requires a FastAPI Request argument.")
+
+            show_id = _payload_show_id(kwargs)
+            token = request.headers.get(ADMISSION_TOKEN_HEADER)
+            if not token or not await admission_queue.is_admitted(show_id, get_user(request), token):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail={
+                        "message": "Not admitted yet, join the queue for this show",
+                        "queue": f"{CONFIG.api_v1_str}/queue/{show_id}",
+                    },
+                )
+            request.state.admission = (show_id, token)
+
+        result = func(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    return wrapper
+
+
+def idempotent(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Honour an `Idempotency-Key` header: duplicates of a request (same
+    user + key) get the first response back instead of running again.
+
+    Apply it below `enable_auth` and above the rate limit / admission
+    checks, so replays skip those. Only final outcomes are stored (see
+    `_stores_outcome`); transient rejections (429, 403 not admitted, 5xx)
+    release the key so a retry runs again.
+    """
+    from ..services.idempotency import (
+        IdempotencyConflict,
+        IdempotencyInProgress,
+        StoredResponse,
+        idempotency_store,
+        request_fingerprint,
+    )
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        request = _extract_request(args, kwargs)
+        if request is None:
+            raise RuntimeError("idempotency decorator requires a FastAPI Request argument.")
+
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return await _call(func, args, kwargs)
+        if len(key) > 255:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{IDEMPOTENCY_KEY_HEADER} is too long",
+            )
+
+        user = get_user(request)
+        payload = kwargs.get("payload")
+        fingerprint = request_fingerprint(
+            payload.model_dump_json() if hasattr(payload, "model_dump_json") else "")
+
+        try:
+            stored = await idempotency_store.begin(user, key, fingerprint)
+        except IdempotencyConflict:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_KEY_HEADER} was already used with a different request",
+            )
+        except IdempotencyInProgress:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The original request is still in progress",
+                headers={"Retry-After": "1"},
+            )
+
+        if stored is not None:
+            return Response(
+                content=stored.body,
+                status_code=stored.status_code,
+                media_type="application/json",
+                headers={**stored.headers, "Idempotent-Replayed": "true"},
+            )
+
+        try:
+            result = await _call(func, args, kwargs)
+        except HTTPException as e:
+            if not _stores_outcome(e.status_code):
+                await idempotency_store.abandon(user, key)
+                raise
+            error = JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+            await idempotency_store.complete(user, key, fingerprint, StoredResponse(
+                e.status_code, bytes(error.body).decode(), dict(e.headers or {})))
+            raise
+        except BaseException:
+            await idempotency_store.abandon(user, key)
+            raise
+
+        if isinstance(result, Response) and _stores_outcome(result.status_code):
+            await idempotency_store.complete(user, key, fingerprint, StoredResponse(
+                result.status_code, bytes(result.body).decode(), {}))
+        else:
+            await idempotency_store.abandon(user, key)
+        return result
+
+    return wrapper
+
+
+def _stores_outcome(status_code: int) -> bool:
+    """Whether a response is the final outcome of a booking request.
+
+    2xx, 409 (seats taken / not held), 410 and 422 come out the same on
+    every retry; anything else (429, 403, 5xx, ...) may succeed later.
+    """
+    return 200 <= status_code < 300 or status_code in (409, 410, 422)
+
+
+async def _call(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    result = func(*args, **kwargs)
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def rate_limit(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Token-bucket limit per user and per show (payload.show_id).
+
+    A no-op unless CONFIG.rate_limit_enabled. Apply it below `enable_auth`.
+    """
+    from ..services.rate_limit import Bucket, rate_limiter
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if CONFIG.rate_limit_enabled:
+            request = _extract_request(args, kwargs)
+            if request is None:
+                raise RuntimeError("rate limit decorator requires a FastAPI Request argument.")
+
+            show_id = _payload_show_id(kwargs)
+            decision = await rate_limiter.acquire([
+                Bucket(
+                    scope="user",
+                    key=f"ratelimit:user:{get_user(request)}",
+                    rate=CONFIG.rate_limit_user_per_second,
+                    burst=CONFIG.rate_limit_user_burst,
+                ),
+                Bucket(
+                    scope="show",
+                    key=f"ratelimit:show:{show_id}",
+                    rate=CONFIG.rate_limit_show_per_second,
+                    burst=CONFIG.rate_limit_show_burst,
+                ),
+            ])
+            if not decision.allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail=f"Rate limit exceeded ({decision.scope}), retry later",
+                    headers={"Retry-After": str(decision.retry_after_seconds)},
+                )
+
+        result = func(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    return wrapper
+
+
+async def release_admission(request: Request) -> None:
+    """Free the admission slot used by this request (e.g. after booking)."""
+    from ..services.admission import admission_queue
+
+    admission = getattr(request.state, "admission", None)
+    if admission is not None:
+        show_id, token = admission
+        await admission_queue.leave(show_id, get_user(request), token)
+
+
+def _payload_show_id(kwargs: dict[str, Any]) -> int:
+    try:
+        return int(getattr(kwargs.get("payload"), "show_id"))
+    except (AttributeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="show_id is required",
+        )
+
+
 def _extract_request(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Optional[Request]:
     request = kwargs.get("request")
     if isinstance(request, Request):
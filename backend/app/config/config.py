@@ -46,6 +46,103 @@ class Config:
         self.description: str = data.get("description") or "API documentation"
         self.api_v1_str: str = data.get("api_v1_str") or "/api/v1"
         self.seat_lock_ttl_seconds: int = data.get("seat_lock_ttl_seconds") or 600
+        self.reserve_max_in_flight: int = data.get("reserve_max_in_flight") or 256
+        self.seat_layout_ttl_seconds: int = data.get("seat_layout_ttl_seconds") or 300
+        # Seat availability bitmaps kept per worker (services/availability.py), LRU
+        self.availability_max_shows: int = data.get("availability_max_shows") or 1024
+        self.listing_cache_ttl_seconds: int = data.get("listing_cache_ttl_seconds") or 60
+        self.listing_cache_max_entries: int = data.get("listing_cache_max_entries") or 256
+        # Per-show seat price tables (services/pricing.py); dropped on pricing changes
+        self.price_table_ttl_seconds: int = data.get("price_table_ttl_seconds") or 3600
+        self.price_table_max_entries: int = data.get("price_table_max_entries") or 256
+        self.show_list_page_size: int = data.get("show_list_page_size") or 50
+        self.show_list_max_page_size: int = data.get("show_list_max_page_size") or 200
+        self.booking_group_commit: bool = data.get("booking_group_commit") or False
+        self.booking_batch_window_ms: int = data.get("booking_batch_window_ms") or 5
+        self.booking_batch_max_size: int = data.get("booking_batch_max_size") or 200
+        # "orm": step-by-step repos; "cte": single chained-CTE statement
+        self.booking_commit_engine: str = data.get("booking_commit_engine") or "orm"
+
+        # Async engine connection pool (see repositories/uow.py)
+        self.db_pool_size: int = data.get("db_pool_size") or 10
+        self.db_max_overflow: int = data.get("db_max_overflow", 10)
+        self.db_pool_timeout_seconds: int = data.get("db_pool_timeout_seconds") or 10
+        self.db_pool_recycle_seconds: int = data.get("db_pool_recycle_seconds") or 1800
+        # Pre-ping costs one RTT per checkout; with recycle set it can be turned off
+        self.db_pool_pre_ping: bool = data.get("db_pool_pre_ping", True)
+        # LIFO keeps hot connections hot and lets idle ones age out via recycle
+        self.db_pool_use_lifo: bool = data.get("db_pool_use_lifo", True)
+
+        # Read replica (REPLICA_DATABASE_URL); reads fall back to the primary
+        # when it lags more than this
+        self.replica_max_lag_seconds: int = data.get("replica_max_lag_seconds") or 5
+        self.replica_lag_check_interval_seconds: int = (
+            data.get("replica_lag_check_interval_seconds") or 2)
+
+        # Hold reaper (services/reaper.py): returns expired holds to sale and
+        # expires bookings left in `initiated`
+        self.hold_reaper_enabled: bool = data.get("hold_reaper_enabled", True)
+        self.hold_reaper_interval_seconds: int = data.get("hold_reaper_interval_seconds") or 5
+        self.hold_reaper_batch_size: int = data.get("hold_reaper_batch_size") or 500
+        # Try to enable `Ex` keyspace notifications; needs CONFIG SET rights
+        self.hold_reaper_configure_keyspace_events: bool = (
+            data.get("hold_reaper_configure_keyspace_events", True))
+        self.booking_initiated_ttl_seconds: int = data.get("booking_initiated_ttl_seconds") or 900
+
+        # Token buckets on /book endpoints (services/rate_limit.py)
+        self.rate_limit_enabled: bool = data.get("rate_limit_enabled", True)
+        # float(): .env values such as 0.5 are parsed as strings
+        self.rate_limit_user_per_second: float = float(data.get("rate_limit_user_per_second") or 2)
+        self.rate_limit_user_burst: int = data.get("rate_limit_user_burst") or 10
+        self.rate_limit_show_per_second: float = float(data.get("rate_limit_show_per_second") or 200)
+        self.rate_limit_show_burst: int = data.get("rate_limit_show_burst") or 400
+
+        # Idempotency-Key on POST /book (services/idempotency.py)
+        self.idempotency_ttl_seconds: int = data.get("idempotency_ttl_seconds") or 86400
+        # Claim lifetime of a request still running; must exceed a booking's duration
+        self.idempotency_pending_ttl_seconds: int = data.get("idempotency_pending_ttl_seconds") or 30
+        # How long a duplicate waits for the in-flight original before 409
+        self.idempotency_wait_seconds: int = data.get("idempotency_wait_seconds") or 10
+
+        # Payments (services/payments.py). "inline": book_seats confirms
+        # with a dummy successful payment; "async": POST /book leaves the
+        # booking `initiated` and the provider webhook confirms it (needs a
+        # payment provider, checked at startup)
+        self.booking_payment_mode: str = data.get("booking_payment_mode") or "inline"
+        # Webhooks are refused until a secret is configured
+        self.payment_webhook_secret: str = data.get("payment_webhook_secret") or ""
+        # Dev / test only: the stub provider and its unauthenticated settle
+        # route (POST /payments/stub/{id}). Off: no provider is configured
+        self.payment_stub_enabled: bool = data.get("payment_stub_enabled") or False
+        # Stub provider: settle every payment on its own after a delay
+        self.payment_stub_auto_complete: bool = data.get("payment_stub_auto_complete", True)
+        self.payment_stub_delay_ms: int = data.get("payment_stub_delay_ms", 200)
+
+        # Request tracing (config/tracing.py): per-stage timings in a
+        # Server-Timing header and GET /metrics. Off: nothing is wrapped
+        self.tracing_enabled: bool = data.get("tracing_enabled") or False
+        self.tracing_server_timing: bool = data.get("tracing_server_timing", True)
+        # Also export spans via OpenTelemetry (needs opentelemetry-api/sdk)
+        self.otel_enabled: bool = data.get("otel_enabled") or False
+
+        # Per-statement stats and slow query log (repositories/query_stats.py)
+        self.query_stats_enabled: bool = data.get("query_stats_enabled", True)
+        self.query_stats_max_fingerprints: int = data.get("query_stats_max_fingerprints") or 500
+        self.slow_query_ms: int = data.get("slow_query_ms") or 250
+        # Parameters can hold personal data: only log them when asked to
+        self.slow_query_log_params: bool = data.get("slow_query_log_params") or False
+        # Share of slow SELECTs re-run as EXPLAIN (ANALYZE, BUFFERS); 0 disables
+        self.slow_query_explain_sample_rate: float = float(data.get("slow_query_explain_sample_rate") or 0)
+        self.slow_query_explain_cooldown_seconds: int = data.get("slow_query_explain_cooldown_seconds") or 300
+        self.slow_query_explain_timeout_ms: int = data.get("slow_query_explain_timeout_ms") or 5000
+        # X-Admin-Token for /admin endpoints; empty disables them
+        self.admin_token: str = data.get("admin_token") or ""
+
+        # Waiting room for on-sale spikes (services/admission.py)
+        self.admission_queue_enabled: bool = data.get("admission_queue_enabled") or False
+        self.admission_capacity_per_show: int = data.get("admission_capacity_per_show") or 200
+        # How long an admitted session may reserve / book before its slot is reused
+        self.admission_session_ttl_seconds: int = data.get("admission_session_ttl_seconds") or 300
 
         self.postgres_host = data.get("postgres_host")
         self.postgres_port = data.get("postgres_port")
@@ -0,0 +1,299 @@
+"""Request-scoped timing: per-stage spans, Server-Timing and Prometheus metrics.
+
+With `CONFIG.tracing_enabled` every HTTP request gets a `RequestTrace`
+(kept in a context variable) that collects
+
+- the time and call count of every stage: repository methods
+  (`repo.<table>.<method>`), seat lock calls (`redis.seat_lock.<method>`),
+  service methods (`service.<name>.<method>`), `uow.commit` /
+  `uow.rollback` and anything wrapped in `span(...)`;
+- the number and total time of SQL statements (`db`).
+
+The stages are returned in a `Server-Timing` header and aggregated into
+histograms served by GET /metrics in the Prometheus text format. With
+`CONFIG.otel_enabled` each span is also exported as an OpenTelemetry span
+(requires the opentelemetry packages; ignored when they are missing).
+
+When tracing is off nothing is wrapped or registered: `span()` returns a
+shared no-op object and classes are left untouched by `instrument_class`.
+"""
+
+from __future__ import annotations
+
+import inspect
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Iterable, Mapping, Optional
+
+from .config import CONFIG
+from .logging import logger as log
+
+__all__ = [
+    "RequestTrace",
+    "current_trace",
+    "span",
+    "instrument_class",
+    "instrument_engine",
+    "StatementHook",
+    "tracing_middleware",
+    "render_metrics",
+]
+
+_current: ContextVar[Optional["RequestTrace"]] = ContextVar("request_trace", default=None)
+
+# Seconds; shared by request and stage histograms
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_otel_tracer: Any = None
+if CONFIG.tracing_enabled and CONFIG.otel_enabled:
+    try:
+        from opentelemetry import trace as _otel_trace
+
+        _otel_tracer = _otel_trace.get_tracer("ticket-booking")
+    except ImportError:
+        log.warning("otel_enabled is set but opentelemetry is not installed; not exporting spans")
+
+
+class RequestTrace:
+    __slots__ = ("stages", "db_statements", "db_seconds")
+
+    def __init__(self) -> None:
+        # stage -> [seconds, calls]
+        self.stages: dict[str, list[float]] = {}
+        self.db_statements = 0
+        self.db_seconds = 0.0
+
+    def add(self, stage: str, seconds: float) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+        _stage_histograms[stage].observe(seconds)
+
+    def server_timing(self) -> str:
+        parts = [
+            f'{stage};dur={seconds * 1000:.2f};desc="{int(calls)}x"'
+            for stage, (seconds, calls) in self.stages.items()
+        ]
+        parts.append(f'db;dur={self.db_seconds * 1000:.2f};desc="{self.db_statements} statements"')
+        return ", ".join(parts)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+class _Span:
+    __slots__ = ("_name", "_started", "_otel")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._started = 0.0
+        self._otel: Any = None
+
+    def __enter__(self) -> "_Span":
+        if _otel_tracer is not None:
+            self._otel = _otel_tracer.start_as_current_span(self._name)
+            self._otel.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        elapsed = time.perf_counter() - self._started
+        trace = _current.get()
+        if trace is not None:
+            trace.add(self._name, elapsed)
+        if self._otel is not None:
+            self._otel.__exit__(exc_type, exc, tb)
+
+    async def __aenter__(self) -> "_Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        return None
+
+    async def __aenter__(self) -> "_NoopSpan":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str) -> Any:
+    """Time a block as stage `name` (sync or async `with`); no-op when tracing is off."""
+    if not CONFIG.tracing_enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def _traced(name: str, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with _Span(name):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def instrument_class(cls: type, prefix: str) -> type:
+    """Time every public coroutine method defined on `cls` as `<prefix>.<method>`.
+
+    Does nothing when tracing is off, so the methods keep zero overhead.
+    """
+    if not CONFIG.tracing_enabled:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or getattr(value, "__traced__", False):
+            continue
+        if inspect.iscoroutinefunction(value):
+            wrapped = _traced(f"{prefix}.{attr}", value)
+            wrapped.__traced__ = True  # type: ignore[attr-defined]
+            setattr(cls, attr, wrapped)
+    return cls
+
+
+# Called with (engine role, engine, statement, parameters, executemany, seconds)
+StatementHook = Callable[[str, Any, str, Any, bool, float], None]
+
+
+def _trace_statement(role: str, engine: Any, statement: str, parameters: Any,
+                     executemany: bool, seconds: float) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.db_statements += 1
+        trace.db_seconds += seconds
+
+
+def instrument_engine(engines: Mapping[str, Any], hooks: Iterable[StatementHook] = ()) -> None:
+    """Time every SQL statement of `engines` (keyed by role) once.
+
+    The elapsed time goes to the current request's trace (when tracing is
+    on) and to each of `hooks`; nothing is registered when there are none.
+    """
+    hooks = [*([_trace_statement] if CONFIG.tracing_enabled else []), *hooks]
+    if not hooks:
+        return
+    from sqlalchemy import event
+
+    def before(conn: Any, *_: Any) -> None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    for role, engine in engines.items():
+        def after(conn: Any, cursor: Any, statement: str, parameters: Any,
+                  context: Any, executemany: bool, role: str = role, engine: Any = engine) -> None:
+            started = conn.info.get("statement_started")
+            if not started:
+                return
+            elapsed = time.perf_counter() - started.pop()
+            for hook in hooks:
+                hook(role, engine, statement, parameters, executemany, elapsed)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before)
+        event.listen(engine.sync_engine, "after_cursor_execute", after)
+
+
+# -------------------------
+# Metrics
+# -------------------------
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, n in zip(_BUCKETS, self.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+_stage_histograms: dict[str, _Histogram] = defaultdict(_Histogram)
+# (method, route, status) -> histogram
+_request_histograms: dict[tuple[str, str, int], _Histogram] = defaultdict(_Histogram)
+# route -> statements
+_db_statements: dict[str, int] = defaultdict(int)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_metrics() -> str:
+    """All collected metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP http_request_duration_seconds Time to produce the response headers.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route, status), hist in sorted(_request_histograms.items()):
+        lines += hist.render(
+            "http_request_duration_seconds",
+            f'method="{method}",route="{_label(route)}",status="{status}"')
+
+    lines += [
+        "# HELP stage_duration_seconds Time spent per instrumented stage call.",
+        "# TYPE stage_duration_seconds histogram",
+    ]
+    for stage, hist in sorted(_stage_histograms.items()):
+        lines += hist.render("stage_duration_seconds", f'stage="{_label(stage)}"')
+
+    lines += [
+        "# HELP db_statements_total SQL statements executed while serving requests.",
+        "# TYPE db_statements_total counter",
+    ]
+    for route, n in sorted(_db_statements.items()):
+        lines.append(f'db_statements_total{{route="{_label(route)}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+async def tracing_middleware(request: Any, call_next: Callable[[Any], Awaitable[Any]]) -> Any:
+    """HTTP middleware (add with `app.middleware("http")`) tracing one request."""
+    trace = RequestTrace()
+    token = _current.set(trace)
+    started = time.perf_counter()
+    try:
+        with span("handler"):
+            response = await call_next(request)
+    finally:
+        _current.reset(token)
+    elapsed = time.perf_counter() - started
+
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    _request_histograms[(request.method, route, response.status_code)].observe(elapsed)
+    _db_statements[route] += trace.db_statements
+    if CONFIG.tracing_server_timing:
+        response.headers["Server-Timing"] = trace.server_timing()
+    return response
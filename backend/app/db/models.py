@@ -7,16 +7,20 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy import (
+    Boolean,
     DateTime,
     Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     PrimaryKeyConstraint,
+    func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import BYTEA
+from sqlalchemy.dialects.postgresql import ARRAY, BYTEA
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -145,6 +149,14 @@ class Venue(Base):
     )
     shows: Mapped[List[Show]] = relationship(back_populates="venue")
 
+    __table_args__ = (
+        # Listings filter on lower(city); covering for the listing join
+        Index(
+            "idx_venues_lower_city",
+            func.lower(city),
+            postgresql_include=["venue_id", "name"]),
+    )
+
 
 class VenueSection(Base):
     __tablename__ = "venue_sections"
@@ -194,6 +206,7 @@ class VenueSeat(Base):
             "row_nums",
             "col_nums",
             name="uq_venue_seats_section_row_col"),
+        Index("idx_venue_seats_section_id", "section_id"),
     )
 
 
@@ -232,6 +245,17 @@ class Show(Base):
     )
     bookings: Mapped[List[Booking]] = relationship(back_populates="show")
     tickets: Mapped[List[Ticket]] = relationship(back_populates="show")
+    summary: Mapped[Optional[ShowSummary]] = relationship(
+        back_populates="show",
+        cascade="all, delete-orphan",
+    )
+
+    __table_args__ = (
+        # Keyset pagination of show listings
+        Index("idx_shows_start_time_show_id", "start_time", "show_id"),
+        Index("idx_shows_venue_id_start_time", "venue_id", "start_time"),
+        Index("idx_shows_event_id", "event_id"),
+    )
 
 
 class ShowPricing(Base):
@@ -298,6 +322,28 @@ class Inventory(Base):
     )
 
 
+class ShowSummary(Base):
+    """Per-show listing projection, maintained incrementally by the
+    booking transaction and by pricing upserts."""
+
+    __tablename__ = "show_summary"
+
+    show_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("shows.show_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    min_price: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    currency: Mapped[Optional[str]] = mapped_column(String(3), nullable=True)
+    total_seats: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_seats: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sold_out: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    show: Mapped[Show] = relationship(back_populates="summary")
+
+
 class Booking(Base):
     __tablename__ = "bookings"
 
@@ -318,6 +364,14 @@ class Booking(Base):
         default=BookingStatus.initiated,
     )
     confirmed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    # Set while `initiated`: the seats and the seat hold awaiting payment
+    seat_ids: Mapped[Optional[List[int]]] = mapped_column(ARRAY(Integer), nullable=True)
+    hold_token: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relationships
     user: Mapped[User] = relationship(back_populates="bookings")
@@ -328,6 +382,21 @@ class Booking(Base):
     )
     tickets: Mapped[List[Ticket]] = relationship(back_populates="booking")
 
+    __table_args__ = (
+        Index("idx_bookings_user_id", "user_id"),
+        # Hold reaper: bookings stuck in `initiated`
+        Index(
+            "idx_bookings_initiated_created_at",
+            "created_at",
+            postgresql_where=text("status = 'initiated'")),
+        # One pending booking per seat hold (BookingsRepo.create_initiated)
+        Index(
+            "uq_bookings_initiated_hold_token",
+            "hold_token",
+            unique=True,
+            postgresql_where=text("status = 'initiated'")),
+    )
+
 
 class Payment(Base):
     __tablename__ = "payments"
@@ -388,3 +457,7 @@ class Ticket(Base):
     booking: Mapped[Booking] = relationship(back_populates="tickets")
     seat: Mapped[VenueSeat] = relationship(back_populates="tickets")
     show: Mapped[Show] = relationship(back_populates="tickets")
+
+    __table_args__ = (
+        Index("idx_tickets_booking_id", "booking_id"),
+    )
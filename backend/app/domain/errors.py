@@ -16,3 +16,7 @@ class BookingNotFound(DomainError):
 
 class PaymentFailed(DomainError):
     ...
+
+
+class BookingInProgress(DomainError):
+    ...
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from .errors import InventoryStatus, BookingStatus, PaymentStatus
+from .enums import InventoryStatus, BookingStatus, PaymentStatus
 from typing import List, Optional
 from datetime import datetime
 
@@ -21,6 +21,17 @@ class HoldSeatsResponse(BaseModel):
     hold_expires_at: datetime
 
 
+class AdmissionStatus(BaseModel):
+    show_id: int
+    token: str
+    state: str  # "waiting" | "admitted"
+    # Waiting: 0-based place in the queue and an upper-bound wait estimate
+    position: Optional[int] = None
+    eta_seconds: Optional[int] = None
+    # Admitted: time left to reserve and book
+    expires_in_seconds: Optional[int] = None
+
+
 class CreateBookingRequest(BaseModel):
     user_id: int
     show_id: int
@@ -36,6 +47,7 @@ class CreateBookingResponse(BaseModel):
 
 
 class PaymentInitResponse(BaseModel):
+    booking_id: int
     payment_id: int
     status: PaymentStatus
     provider_redirect_url: Optional[str] = None
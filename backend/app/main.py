@@ -1,9 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from .config import log, CONFIG
+from .config.tracing import render_metrics, tracing_middleware
 from .api.v1 import all_routes
+from .services.availability import seat_availability
+from .services.payments import check_payment_config
+from .services.pricing import price_table_cache
+from .services.reaper import hold_reaper
+from .services.shows import show_listing_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_payment_config()
+    listeners = [
+        # Keep this worker's seat availability bitmaps in sync with the others
+        asyncio.create_task(seat_availability.listen()),
+        # Drop locally cached show listings when another worker invalidates them
+        asyncio.create_task(show_listing_cache.listen()),
+        # Same for seat price tables after a pricing change
+        asyncio.create_task(price_table_cache.listen()),
+    ]
+    if CONFIG.hold_reaper_enabled:
+        # Return expired holds to sale and expire abandoned bookings
+        listeners.append(asyncio.create_task(hold_reaper.run()))
+    yield
+    for listener in listeners:
+        listener.cancel()
+    for listener in listeners:
+        with suppress(asyncio.CancelledError):
+            await listener
 
 
 app = FastAPI(
@@ -11,6 +42,7 @@ app = FastAPI(
     version=CONFIG.version,
     description=CONFIG.description,
     openapi_url=f"{CONFIG.api_v1_str}/openapi.json",
+    lifespan=lifespan,
 )
 
 log.info(f"Starting application: {CONFIG.project_name} v{CONFIG.version}")
@@ -23,8 +55,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
+if CONFIG.tracing_enabled:
+    # Per-stage timings in Server-Timing and /metrics
+    app.middleware("http")(tracing_middleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint (request / stage histograms when tracing is on)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # Include API router
 for route in all_routes:
     if route.get("isWebSocket", False):
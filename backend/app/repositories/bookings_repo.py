@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Mapping, Optional, Sequence
 
-from sqlalchemy import update
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import Booking, BookingStatus
@@ -19,6 +20,11 @@ class BookingsRepo(IBookingsRepo):
     async def get(self, booking_id: int) -> Optional[Booking]:
         return await self.session.get(Booking, booking_id)
 
+    async def get_for_update(self, booking_id: int) -> Optional[Booking]:
+        stmt = select(Booking).where(Booking.booking_id == booking_id).with_for_update()
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none()
+
     async def create(
         self,
         *,
@@ -26,17 +32,107 @@ class BookingsRepo(IBookingsRepo):
         show_id: int,
         status: BookingStatus,
         confirmed_at: Optional[datetime] = None,
+        seat_ids: Optional[Sequence[int]] = None,
+        hold_token: Optional[str] = None,
     ) -> Booking:
         booking = Booking(
             user_id=user_id,
             show_id=show_id,
             status=status,
             confirmed_at=confirmed_at,
+            seat_ids=list(seat_ids) if seat_ids is not None else None,
+            hold_token=hold_token,
         )
         self.session.add(booking)
         await self.session.flush()  # populate booking_id
         return booking
 
+    async def create_initiated(
+        self,
+        *,
+        user_id: int,
+        show_id: int,
+        seat_ids: Sequence[int],
+        hold_token: str,
+    ) -> Optional[int]:
+        """Insert an `initiated` booking for a seat hold and return its ID.
+
+        Returns None, without inserting, when the hold already has an
+        `initiated` booking (unique partial index on hold_token).
+        """
+        stmt = (
+            pg_insert(Booking)
+            .values(
+                user_id=user_id,
+                show_id=show_id,
+                status=BookingStatus.initiated,
+                seat_ids=list(seat_ids),
+                hold_token=hold_token,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Booking.hold_token],
+                index_where=text("status = 'initiated'"),
+            )
+            .returning(Booking.booking_id)
+        )
+        res = await self.session.execute(stmt)
+        booking_id = res.scalar_one_or_none()
+        return int(booking_id) if booking_id is not None else None
+
+    async def get_initiated_by_hold(self, hold_token: str) -> Optional[Booking]:
+        stmt = select(Booking).where(
+            Booking.hold_token == hold_token,
+            Booking.status == BookingStatus.initiated,
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def create_many(self, *, rows: Sequence[Mapping[str, Any]]) -> list[int]:
+        """Insert several bookings with one multi-row INSERT.
+
+        Returns the new booking IDs in the same order as `rows`.
+        """
+        if not rows:
+            return []
+
+        stmt = insert(Booking).returning(Booking.booking_id, sort_by_parameter_order=True)
+        res = await self.session.execute(stmt, list(rows))
+        return [int(booking_id) for booking_id in res.scalars().all()]
+
+    async def expire_initiated(self, *, created_before: datetime, limit: int) -> list[Any]:
+        """Move up to `limit` bookings stuck in `initiated` since before
+        `created_before` to `expired`.
+
+        Rows locked by a concurrent transaction (e.g. a confirmation in
+        flight) are skipped. Returns rows of (booking_id, show_id, user_id,
+        seat_ids, hold_token) for the expired bookings.
+        """
+        stale = (
+            select(Booking.booking_id)
+            .where(
+                Booking.status == BookingStatus.initiated,
+                Booking.created_at < created_before,
+            )
+            .order_by(Booking.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Booking)
+            .where(Booking.booking_id.in_(stale))
+            .values(status=BookingStatus.expired)
+            .returning(
+                Booking.booking_id,
+                Booking.show_id,
+                Booking.user_id,
+                Booking.seat_ids,
+                Booking.hold_token,
+            )
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
     async def set_status(
         self,
         *,
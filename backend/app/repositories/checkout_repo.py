@@ -0,0 +1,159 @@
+
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Sequence
+
+from sqlalchemy import DateTime, Integer, String, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .interfaces import ICheckoutRepo
+from .tickets_repo import generate_ticket_codes
+
+
+@dataclass(frozen=True)
+class CheckoutResult:
+    """Outcome of a single-statement booking commit."""
+
+    booking_id: int | None
+    ticket_codes: list[str]
+    # Requested seats that were available and got locked
+    locked_seat_ids: list[int]
+
+
+# Availability check, booking, payment, inventory flip and ticket issue as
+# one chained-CTE statement. Every step after `locked` is gated on all
+# requested seats being available, so either everything is written or
+# nothing is. Concurrent callers serialise on the FOR UPDATE in `locked`
+# (in seat order, like InventoryRepo.lock_for_update) and re-check
+# `status` once the winner commits.
+_COMMIT_BOOKING = text(
+    """
+    WITH requested AS (
+        SELECT r.seat_id, r.ticket_code
+        FROM unnest(:seat_ids, :ticket_codes) AS r(seat_id, ticket_code)
+    ),
+    locked AS (
+        SELECT i.seat_id
+        FROM inventories i
+        JOIN requested r ON r.seat_id = i.seat_id
+        WHERE i.show_id = :show_id
+          AND i.status = CAST('available' AS inventory_status)
+        ORDER BY i.seat_id
+        FOR UPDATE OF i
+    ),
+    checked AS (
+        SELECT count(*) = cardinality(:seat_ids) AS ok FROM locked
+    ),
+    booking AS (
+        INSERT INTO bookings (user_id, show_id, status, confirmed_at)
+        SELECT :user_id, :show_id, CAST('confirmed' AS booking_status), :now
+        FROM checked
+        WHERE checked.ok
+        RETURNING booking_id
+    ),
+    payment AS (
+        INSERT INTO payments (booking_id, provider, status, amount, currency, created_at)
+        SELECT booking.booking_id, CAST(:provider AS payment_provider),
+               CAST('success' AS payment_status), :amount, :currency, :now
+        FROM booking
+        RETURNING payment_id
+    ),
+    booked AS (
+        UPDATE inventories i
+        SET status = CAST('not_available' AS inventory_status), booked_by = :user_id
+        FROM booking
+        WHERE i.show_id = :show_id
+          AND i.seat_id IN (SELECT seat_id FROM locked)
+        RETURNING i.seat_id
+    ),
+    summary AS (
+        UPDATE show_summary s
+        SET available_seats = s.available_seats - cardinality(:seat_ids),
+            sold_out = s.available_seats - cardinality(:seat_ids) <= 0,
+            updated_at = :now
+        FROM booking
+        WHERE s.show_id = :show_id
+    ),
+    issued AS (
+        INSERT INTO tickets (booking_id, show_id, seat_id, ticket_code, issued_at, status)
+        SELECT booking.booking_id, :show_id, r.seat_id, r.ticket_code, :now,
+               CAST('active' AS ticket_status)
+        FROM booking
+        CROSS JOIN requested r
+        RETURNING ticket_code
+    )
+    SELECT
+        (SELECT booking_id FROM booking) AS booking_id,
+        (SELECT array_agg(ticket_code) FROM issued) AS ticket_codes,
+        (SELECT array_agg(seat_id) FROM locked) AS locked_seat_ids,
+        (SELECT count(*) FROM booked) AS booked_count,
+        (SELECT count(*) FROM payment) AS payment_count
+    """
+).bindparams(
+    bindparam("seat_ids", type_=ARRAY(Integer)),
+    bindparam("ticket_codes", type_=ARRAY(String)),
+    bindparam("show_id", type_=Integer),
+    bindparam("user_id", type_=Integer),
+    bindparam("provider", type_=String),
+    bindparam("amount", type_=Integer),
+    bindparam("currency", type_=String),
+    bindparam("now", type_=DateTime(timezone=True)),
+)
+
+
+class CheckoutRepo(ICheckoutRepo):
+    """Single round-trip booking commit.
+
+    Runs the whole booking in one server-side statement instead of the
+    lock / insert / flush / update / insert sequence of the other repos.
+    The statement writes within the caller's transaction (UnitOfWork).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def commit_booking(
+        self,
+        *,
+        user_id: int,
+        show_id: int,
+        seat_ids: Sequence[int],
+        amount: int,
+        currency: str,
+        provider: Any,
+        now: datetime,
+    ) -> CheckoutResult:
+        """Book `seat_ids` for `user_id` if all of them are available.
+
+        Returns a CheckoutResult whose `booking_id` is None when any seat
+        was missing or already taken (nothing is written in that case).
+        """
+        res = await self.session.execute(
+            _COMMIT_BOOKING,
+            {
+                "seat_ids": list(seat_ids),
+                "ticket_codes": generate_ticket_codes(len(seat_ids)),
+                "show_id": show_id,
+                "user_id": user_id,
+                "provider": getattr(provider, "value", provider),
+                "amount": amount,
+                "currency": currency,
+                "now": now,
+            },
+        )
+        row = res.one()
+
+        booking_id = row.booking_id
+        if booking_id is not None and row.booked_count != len(seat_ids):
+            raise RuntimeError(
+                f"Inventory update mismatch: updated {row.booked_count}, expected {len(seat_ids)}")
+
+        return CheckoutResult(
+            booking_id=None if booking_id is None else int(booking_id),
+            ticket_codes=list(row.ticket_codes or []),
+            locked_seat_ids=[int(s) for s in row.locked_seat_ids or []],
+        )
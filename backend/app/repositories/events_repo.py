@@ -6,6 +6,7 @@ from sqlalchemy import desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import Event
+from .hooks import TOPIC_EVENTS, mark_changed
 from .interfaces import IEventsRepo
 
 
@@ -22,6 +23,7 @@ class EventsRepo(IEventsRepo):
         event = Event(**kwargs)
         self.session.add(event)
         await self.session.flush()  # populate event_id
+        mark_changed(self.session, TOPIC_EVENTS, event.event_id)
         return event
 
     async def list(self, *, limit: int = 50, offset: int = 0) -> list[Event]:
@@ -0,0 +1,66 @@
+"""Post-commit change notifications from repositories.
+
+Repositories call `mark_changed(session, topic, key)` when they write data
+that something outside the DB caches (show listings, prices, ...). The
+marks are kept on the session and handed to the listeners registered for
+the topic only after `AsyncUnitOfWork.commit()` succeeds; a rollback
+discards them. This keeps the repositories free of cache imports.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import log
+
+__all__ = [
+    "TOPIC_SHOWS",
+    "TOPIC_EVENTS",
+    "TOPIC_PRICING",
+    "on_commit",
+    "mark_changed",
+    "fire_commit_hooks",
+    "discard_changes",
+]
+
+TOPIC_SHOWS = "shows"
+TOPIC_EVENTS = "events"
+TOPIC_PRICING = "pricing"
+
+_SESSION_KEY = "changed"
+
+# listener(keys): keys are whatever the repos passed to mark_changed (e.g. show IDs)
+CommitListener = Callable[[set[Any]], Awaitable[None]]
+
+_listeners: dict[str, list[CommitListener]] = {}
+
+
+def on_commit(topic: str, listener: CommitListener) -> None:
+    """Register `listener` to be awaited after commits that changed `topic`."""
+    _listeners.setdefault(topic, []).append(listener)
+
+
+def mark_changed(session: AsyncSession, topic: str, key: Any = None) -> None:
+    """Record that the current transaction changed `topic` (optionally for `key`)."""
+    changed: dict[str, set[Any]] = session.info.setdefault(_SESSION_KEY, {})
+    changed.setdefault(topic, set()).add(key)
+
+
+def discard_changes(session: AsyncSession) -> None:
+    session.info.pop(_SESSION_KEY, None)
+
+
+async def fire_commit_hooks(session: AsyncSession) -> None:
+    """Notify listeners about the changes of a transaction that just committed.
+
+    Listener failures are logged, never raised: the data is already committed.
+    """
+    changed: dict[str, set[Any]] = session.info.pop(_SESSION_KEY, {})
+    for topic, keys in changed.items():
+        for listener in _listeners.get(topic, []):
+            try:
+                await listener(keys)
+            except Exception as e:
+                log.warning(f"commit hook for {topic!r} failed: {e!r}")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Optional, Protocol, Sequence, runtime_checkable
+from typing import Any, Mapping, Optional, Protocol, Sequence, runtime_checkable
 from datetime import datetime
 
 from ..db.models import InventoryStatus, BookingStatus, PaymentStatus
@@ -40,12 +40,34 @@ class IVenuesRepo(Protocol):
 @runtime_checkable
 class IShowsRepo(Protocol):
     async def get(self, show_id: int) -> Any | None: ...
+    async def create(self, **kwargs: Any) -> Any: ...
+    async def update(self, show_id: int, **values: Any) -> int: ...
+    async def delete(self, show_id: int) -> int: ...
+    async def list_upcoming(
+            self,
+            *,
+            now: datetime | None = None,
+            until: datetime | None = None,
+            after: tuple[datetime, int] | None = None,
+            limit: int = 50) -> list[Any]: ...
 
 
 @runtime_checkable
 class IPricingsRepo(Protocol):
     async def get_for_show(self, show_id: int) -> list[Any]: ...
 
+    async def get_seat_prices(self, show_id: int) -> list[Any]: ...
+
+
+@runtime_checkable
+class IShowSummaryRepo(Protocol):
+    """Listing projection: min price and seats left per show."""
+
+    async def get(self, show_id: int) -> Any | None: ...
+    async def apply_seats_delta(self, *, show_id: int, delta: int) -> None: ...
+    async def refresh_pricing(self, *, show_id: int) -> None: ...
+    async def rebuild(self, *, show_id: Optional[int] = None) -> None: ...
+
 
 @runtime_checkable
 class IInventoryRepo(Protocol):
@@ -60,6 +82,13 @@ class IInventoryRepo(Protocol):
         seat_ids: Sequence[int],
         booked_by: int) -> int: ...
 
+    async def mark_booked_many(self, *, show_id: int, booked_by: Mapping[int, int]) -> int: ...
+
+    async def get_statuses(
+        self,
+        *,
+        seats: Sequence[tuple[int, int]]) -> dict[tuple[int, int], InventoryStatus]: ...
+
     async def set_status(
         self,
         *,
@@ -81,8 +110,27 @@ class IBookingsRepo(Protocol):
         show_id: int,
         status: BookingStatus,
         confirmed_at: Optional[datetime] = None,
+        seat_ids: Optional[Sequence[int]] = None,
+        hold_token: Optional[str] = None,
     ) -> Any: ...
 
+    async def get_for_update(self, booking_id: int) -> Any | None: ...
+
+    async def create_initiated(
+        self,
+        *,
+        user_id: int,
+        show_id: int,
+        seat_ids: Sequence[int],
+        hold_token: str,
+    ) -> Optional[int]: ...
+
+    async def get_initiated_by_hold(self, hold_token: str) -> Any | None: ...
+
+    async def create_many(self, *, rows: Sequence[Mapping[str, Any]]) -> list[int]: ...
+
+    async def expire_initiated(self, *, created_before: datetime, limit: int) -> list[Any]: ...
+
     async def set_status(
         self,
         *,
@@ -105,11 +153,19 @@ class IPaymentsRepo(Protocol):
         created_at: datetime,
     ) -> Any: ...
 
+    async def get(self, payment_id: int) -> Any | None: ...
+
+    async def create_many(self, *, rows: Sequence[Mapping[str, Any]]) -> None: ...
+
+    async def fail_pending(self, *, booking_ids: Sequence[int]) -> int: ...
+
     async def set_status(self, *, payment_id: int, status: PaymentStatus) -> None: ...
 
 
 @runtime_checkable
 class ITicketsRepo(Protocol):
+    async def list_for_booking(self, booking_id: int) -> list[Any]: ...
+
     async def create_many(
         self,
         *,
@@ -119,12 +175,37 @@ class ITicketsRepo(Protocol):
         issued_at: datetime,
     ) -> list[Any]: ...
 
+    async def create_for_bookings(
+        self,
+        *,
+        show_id: int,
+        seats_by_booking: Mapping[int, Sequence[int]],
+        issued_at: datetime,
+    ) -> list[Any]: ...
+
+
+@runtime_checkable
+class ICheckoutRepo(Protocol):
+    """Single-statement booking commit."""
+
+    async def commit_booking(
+        self,
+        *,
+        user_id: int,
+        show_id: int,
+        seat_ids: Sequence[int],
+        amount: int,
+        currency: str,
+        provider: Any,
+        now: datetime,
+    ) -> Any: ...
+
 
 @runtime_checkable
 class IReadsRepo(Protocol):
     """Read-heavy, join-based queries."""
 
-    async def fetch_show_seat_map(self, *, show_id: int) -> list[dict[str, Any]]: ...
+    async def fetch_show_seat_map(self, *, show_id: int) -> Sequence[Any]: ...
 
     async def fetch_show_details(self, *, show_id: int) -> Optional[dict[str, Any]]: ...
 
@@ -150,10 +231,12 @@ class IAsyncUnitOfWork(Protocol):
     table_venues = IVenuesRepo
     table_shows = IShowsRepo
     table_pricing = IPricingsRepo
+    table_summary = IShowSummaryRepo
     table_inventory = IInventoryRepo
     table_bookings = IBookingsRepo
     table_payments = IPaymentsRepo
     table_tickets = ITicketsRepo
+    table_checkout = ICheckoutRepo
     table_read = IReadsRepo
 
     async def __aenter__(self) -> "IAsyncUnitOfWork": ...
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional, Sequence
+from typing import Mapping, Optional, Sequence
 
-from sqlalchemy import select, update
+from sqlalchemy import Integer, column, select, tuple_, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import Inventory, InventoryStatus
@@ -14,7 +14,7 @@ class InventoryRepo(IInventoryRepo):
 
     This repo is concurrency-critical.
     - `lock_for_update()` uses SELECT ... FOR UPDATE to lock inventory rows.
-    - `set_status()` / `mark_booked()` perform bulk updates.
+    - `set_status()` / `mark_booked()` / `mark_booked_many()` perform bulk updates.
 
     All operations run within the caller's transaction boundary (UnitOfWork).
     """
@@ -25,16 +25,33 @@ class InventoryRepo(IInventoryRepo):
     async def lock_for_update(self, *, show_id: int, seat_ids: Sequence[int]) -> list[Inventory]:
         """Lock inventory rows for the given seats in a show.
 
+        Rows are locked in seat order whatever the caller's order, so
+        concurrent lockers of overlapping seats cannot deadlock.
+
         Returns the locked Inventory ORM rows.
         """
         stmt = (
             select(Inventory)
             .where(Inventory.show_id == show_id, Inventory.seat_id.in_(list(seat_ids)))
+            .order_by(Inventory.seat_id)
             .with_for_update()
         )
         res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
+    async def get_statuses(
+            self,
+            *,
+            seats: Sequence[tuple[int, int]]) -> dict[tuple[int, int], InventoryStatus]:
+        """Status of (show_id, seat_id) pairs, possibly across shows, without locking."""
+        if not seats:
+            return {}
+
+        stmt = select(Inventory.show_id, Inventory.seat_id, Inventory.status).where(
+            tuple_(Inventory.show_id, Inventory.seat_id).in_(list(seats)))
+        res = await self.session.execute(stmt)
+        return {(show_id, seat_id): status for show_id, seat_id, status in res.all()}
+
     async def set_status(
         self,
         *,
@@ -63,6 +80,28 @@ class InventoryRepo(IInventoryRepo):
         return await self.set_status(
             show_id=show_id,
             seat_ids=seat_ids,
-            status=InventoryStatus.available,
+            status=InventoryStatus.not_available,
             booked_by=booked_by,
         )
+
+    async def mark_booked_many(self, *, show_id: int, booked_by: Mapping[int, int]) -> int:
+        """Mark seats of a show as booked, each by its own user, in one UPDATE.
+
+        `booked_by` maps seat_id -> user_id. Returns the number of affected rows.
+        """
+        if not booked_by:
+            return 0
+
+        owners = values(
+            column("seat_id", Integer),
+            column("user_id", Integer),
+            name="owners",
+        ).data(list(booked_by.items()))
+
+        stmt = (
+            update(Inventory)
+            .where(Inventory.show_id == show_id, Inventory.seat_id == owners.c.seat_id)
+            .values(status=InventoryStatus.not_available, booked_by=owners.c.user_id)
+        )
+        result = await self.session.execute(stmt)
+        return int(result.rowcount or 0)                # type: ignore
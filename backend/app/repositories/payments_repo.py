@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Mapping, Sequence
 
-from sqlalchemy import update
+from sqlalchemy import insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import Payment, PaymentStatus
@@ -40,6 +40,32 @@ class PaymentsRepo(IPaymentsRepo):
         await self.session.flush()  # populate payment_id
         return payment
 
+    async def get(self, payment_id: int) -> Payment | None:
+        return await self.session.get(Payment, payment_id)
+
+    async def create_many(self, *, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Insert several payments with one multi-row INSERT."""
+        if not rows:
+            return
+
+        await self.session.execute(insert(Payment), list(rows))
+
+    async def fail_pending(self, *, booking_ids: Sequence[int]) -> int:
+        """Mark the pending payments of the given bookings as failed."""
+        if not booking_ids:
+            return 0
+
+        stmt = (
+            update(Payment)
+            .where(
+                Payment.booking_id.in_(list(booking_ids)),
+                Payment.status == PaymentStatus.pending,
+            )
+            .values(status=PaymentStatus.failed)
+        )
+        result = await self.session.execute(stmt)
+        return int(result.rowcount or 0)                # type: ignore
+
     async def set_status(self, *, payment_id: int, status: PaymentStatus) -> None:
         stmt = update(Payment).where(Payment.payment_id == payment_id).values(status=status)
         await self.session.execute(stmt)
@@ -0,0 +1,88 @@
+"""Connection pool instrumentation for the async engines.
+
+`InstrumentedAsyncQueuePool` is a drop-in `AsyncAdaptedQueuePool` that
+records, per pool, how many checkouts are in progress, how long they take
+(including the pre-ping, when enabled), timeouts and overflow connections.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+__all__ = ["PoolMetrics", "InstrumentedAsyncQueuePool"]
+
+# Upper bounds (seconds) of the checkout latency histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolMetrics:
+    """Counters for one connection pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.timeouts = 0
+        self.overflow_events = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        # One counter per bucket in CHECKOUT_BUCKETS, plus +Inf
+        self.checkout_buckets = [0] * (len(CHECKOUT_BUCKETS) + 1)
+
+    def observe_checkout(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.checkout_seconds_total += seconds
+        self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+        self.checkout_buckets[bisect.bisect_left(CHECKOUT_BUCKETS, seconds)] += 1
+
+    def snapshot(self, pool: AsyncAdaptedQueuePool) -> dict[str, Any]:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "overflow_events": self.overflow_events,
+            "checkout_seconds_avg": (
+                self.checkout_seconds_total / self.checkouts if self.checkouts else 0.0),
+            "checkout_seconds_max": self.checkout_seconds_max,
+            "checkout_seconds_buckets": {
+                **{str(le): n for le, n in zip(CHECKOUT_BUCKETS, self.checkout_buckets)},
+                "+Inf": self.checkout_buckets[-1],
+            },
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that keeps `PoolMetrics` about its checkouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):  # type: ignore[override]
+        metrics = self.metrics
+        overflow_before = self.overflow()
+        metrics.waiting += 1
+        metrics.max_waiting = max(metrics.max_waiting, metrics.waiting)
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.waiting -= 1
+
+        metrics.observe_checkout(time.perf_counter() - start)
+        if self.overflow() > max(overflow_before, 0):
+            metrics.overflow_events += 1
+        return conn
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db.models import ShowPricing
+from ..db.models import Inventory, ShowPricing, VenueSeat
+from .hooks import TOPIC_PRICING, mark_changed
 from .interfaces import IPricingsRepo
+from .summary_repo import ShowSummaryRepo
 
 
 class PricingsRepo(IPricingsRepo):
@@ -14,12 +18,43 @@ class PricingsRepo(IPricingsRepo):
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        # Keeps the listing projection's min price in step with the pricings
+        self.table_summary = ShowSummaryRepo(session)
 
     async def get_for_show(self, show_id: int) -> list[ShowPricing]:
         stmt = select(ShowPricing).where(ShowPricing.show_id == show_id)
         res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
+    async def get_seat_prices(self, show_id: int) -> list[Any]:
+        """Every seat of a show with its section, its inventory price and the
+        section price (None when the section is not priced), in one query.
+
+        Rows: (seat_id, section_id, seat_amount, seat_currency,
+        section_amount, section_currency).
+        """
+        stmt = (
+            select(
+                Inventory.seat_id,
+                VenueSeat.section_id,
+                Inventory.price,
+                Inventory.currency,
+                ShowPricing.amount,
+                ShowPricing.currency,
+            )
+            .join(VenueSeat, VenueSeat.seat_id == Inventory.seat_id)
+            .outerjoin(
+                ShowPricing,
+                and_(
+                    ShowPricing.show_id == Inventory.show_id,
+                    ShowPricing.section_id == VenueSeat.section_id,
+                ),
+            )
+            .where(Inventory.show_id == show_id)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
     async def get_price(self, *, show_id: int, section_id: int) -> ShowPricing | None:
         stmt = select(ShowPricing).where(
             ShowPricing.show_id == show_id,
@@ -40,6 +75,8 @@ class PricingsRepo(IPricingsRepo):
         Note: This assumes you have a UNIQUE constraint on (show_id, section_id).
         """
 
+        mark_changed(self.session, TOPIC_PRICING, show_id)
+
         # Preferred: Postgres ON CONFLICT upsert
         try:
             from sqlalchemy.dialects.postgresql import insert
@@ -58,6 +95,7 @@ class PricingsRepo(IPricingsRepo):
             res = await self.session.execute(stmt)
             row = res.scalar_one()
             await self.session.flush()
+            await self.table_summary.refresh_pricing(show_id=show_id)
             return row
         except Exception:
             # Fallback: select then update/insert
@@ -66,6 +104,7 @@ class PricingsRepo(IPricingsRepo):
                 existing.amount = amount
                 existing.currency = currency
                 await self.session.flush()
+                await self.table_summary.refresh_pricing(show_id=show_id)
                 return existing
 
             created = ShowPricing(
@@ -76,4 +115,5 @@ class PricingsRepo(IPricingsRepo):
             )
             self.session.add(created)
             await self.session.flush()
+            await self.table_summary.refresh_pricing(show_id=show_id)
             return created
@@ -0,0 +1,269 @@
+"""Per-statement query statistics, slow query log and sampled EXPLAIN plans.
+
+`record_statement` is registered as a statement hook of the engines (see
+`config.tracing.instrument_engine`, which times each statement once) and keeps,
+per statement fingerprint (the SQL with literals / bind parameters replaced
+by `?` and IN / VALUES lists collapsed), the execution count, total / max
+latency and a latency histogram.
+
+Statements slower than `CONFIG.slow_query_ms` are logged, with their
+parameters only when `CONFIG.slow_query_log_params` is set. A sample of the slow SELECTs (`CONFIG.slow_query_explain_sample_rate`,
+at most one per fingerprint per cooldown and one at a time) is re-run as
+EXPLAIN (ANALYZE, BUFFERS) on a side connection that is not part of the pool,
+and the latest plans are kept per fingerprint. Served by GET /admin/queries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import random
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from ..config import CONFIG, log
+
+__all__ = ["QueryStat", "fingerprint", "record_statement", "query_stats", "reset_query_stats"]
+
+# Upper bounds (seconds) of the statement latency histogram buckets
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_PLANS_KEPT = 3
+_PARAMS_MAX_CHARS = 500
+_SQL_MAX_CHARS = 2000
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_BIND = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+(?!:)")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+_SPACES = re.compile(r"\s+")
+_LOCKING = re.compile(r"\bFOR (?:NO KEY )?(?:UPDATE|SHARE)\b|\bFOR KEY SHARE\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+# statement -> (fingerprint id, normalized SQL); cleared when full
+_fingerprints: dict[str, tuple[str, str]] = {}
+_FINGERPRINT_CACHE_SIZE = 4096
+
+
+def _normalize(statement: str) -> str:
+    sql = _SPACES.sub(" ", statement).strip()
+    # Casts (`::int`) would otherwise look like `:name` binds
+    sql = sql.replace("::", "\x00")
+    sql = _STRING.sub("?", sql)
+    sql = _BIND.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("\x00", "::")
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _ROWS.sub(r"\1, ...", sql)
+
+
+def fingerprint(statement: str) -> tuple[str, str]:
+    """(short id, normalized SQL) of `statement`; equal for the same query shape."""
+    cached = _fingerprints.get(statement)
+    if cached is not None:
+        return cached
+    sql = _normalize(statement)
+    result = (hashlib.sha1(sql.encode()).hexdigest()[:12], sql)
+    if len(_fingerprints) >= _FINGERPRINT_CACHE_SIZE:
+        _fingerprints.clear()
+    _fingerprints[statement] = result
+    return result
+
+
+def _truncate(value: Any, limit: int) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class QueryStat:
+    """Counters for one statement fingerprint."""
+
+    __slots__ = (
+        "fingerprint", "sql", "engine", "calls", "seconds_total", "seconds_max",
+        "buckets", "slow", "last_slow_at", "last_slow_params", "explained_at", "plans",
+    )
+
+    def __init__(self, fingerprint_id: str, sql: str, engine: str) -> None:
+        self.fingerprint = fingerprint_id
+        self.sql = sql[:_SQL_MAX_CHARS]
+        self.engine = engine
+        self.calls = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+        # One counter per bucket in QUERY_BUCKETS, plus +Inf
+        self.buckets = [0] * (len(QUERY_BUCKETS) + 1)
+        self.slow = 0
+        self.last_slow_at: Optional[str] = None
+        self.last_slow_params: Optional[str] = None
+        self.explained_at = 0.0
+        self.plans: deque[dict[str, Any]] = deque(maxlen=_PLANS_KEPT)
+
+    def observe(self, seconds: float) -> None:
+        self.calls += 1
+        self.seconds_total += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
+        self.buckets[bisect.bisect_left(QUERY_BUCKETS, seconds)] += 1
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "engine": self.engine,
+            "sql": self.sql,
+            "calls": self.calls,
+            "seconds_total": round(self.seconds_total, 6),
+            "seconds_avg": round(self.seconds_total / self.calls, 6) if self.calls else 0.0,
+            "seconds_max": round(self.seconds_max, 6),
+            "slow": self.slow,
+            "last_slow_at": self.last_slow_at,
+            "plans": len(self.plans),
+        }
+
+    def details(self) -> dict[str, Any]:
+        return {
+            **self.summary(),
+            "seconds_buckets": {
+                **{str(le): n for le, n in zip(QUERY_BUCKETS, self.buckets)},
+                "+Inf": self.buckets[-1],
+            },
+            "last_slow_params": self.last_slow_params,
+            "plans": list(self.plans),
+        }
+
+
+_stats: dict[str, QueryStat] = {}
+# Fingerprints not tracked because `query_stats_max_fingerprints` was reached
+_dropped = 0
+# EXPLAIN side engines, keyed by engine role; created on first use
+_side_engines: dict[str, AsyncEngine] = {}
+_explaining = False
+_tasks: set[asyncio.Task] = set()
+
+
+def query_stats(sort: str = "seconds_total", limit: int = 50) -> dict[str, Any]:
+    """The top `limit` fingerprints by `sort` (a `QueryStat.summary` key)."""
+    rows = sorted((stat.summary() for stat in _stats.values()), key=lambda s: s[sort], reverse=True)
+    return {
+        "slow_query_ms": CONFIG.slow_query_ms,
+        "fingerprints": len(_stats),
+        "dropped": _dropped,
+        "queries": rows[:limit],
+    }
+
+
+def query_stat(fingerprint_id: str) -> Optional[QueryStat]:
+    return _stats.get(fingerprint_id)
+
+
+def reset_query_stats() -> None:
+    global _dropped
+    _stats.clear()
+    _dropped = 0
+
+
+def _explainable(statement: str, parameters: Any, executemany: bool) -> bool:
+    if executemany or isinstance(parameters, list):
+        return False
+    head = statement.lstrip()[:6].upper()
+    if head == "SELECT":
+        return not _LOCKING.search(statement)
+    if head.startswith("WITH"):
+        # ANALYZE runs the statement: never a data-modifying CTE
+        return not _WRITES.search(statement) and not _LOCKING.search(statement)
+    return False
+
+
+def _side_engine(role: str, engine: AsyncEngine) -> AsyncEngine:
+    side = _side_engines.get(role)
+    if side is None:
+        # Its own connection, outside the pool, and without our listeners
+        side = create_async_engine(engine.url, poolclass=NullPool)
+        _side_engines[role] = side
+    return side
+
+
+async def _explain(stat: QueryStat, role: str, engine: AsyncEngine,
+                   statement: str, parameters: Any, seconds: float) -> None:
+    global _explaining
+    record: dict[str, Any] = {
+        "at": datetime.now(timezone.utc).isoformat(),
+        "seconds": round(seconds, 6),
+        "params": stat.last_slow_params,
+    }
+    try:
+        async with _side_engine(role, engine).connect() as conn:
+            await conn.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {int(CONFIG.slow_query_explain_timeout_ms)}")
+            result = await conn.exec_driver_sql(
+                "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+            plan = result.scalar_one()
+            # Leaves no trace: the connection closes without committing
+            await conn.rollback()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        top = plan[0]
+        record["execution_ms"] = top.get("Execution Time")
+        record["planning_ms"] = top.get("Planning Time")
+        record["plan"] = top["Plan"]
+    except Exception as e:
+        log.warning(f"[query_stats] EXPLAIN of {stat.fingerprint} failed: {e}")
+        record["error"] = str(e)
+    finally:
+        _explaining = False
+    stat.plans.append(record)
+
+
+def _maybe_explain(stat: QueryStat, role: str, engine: AsyncEngine,
+                   statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+    global _explaining
+    if _explaining or random.random() >= CONFIG.slow_query_explain_sample_rate:
+        return
+    now = time.monotonic()
+    if stat.explained_at and now - stat.explained_at < CONFIG.slow_query_explain_cooldown_seconds:
+        return
+    if not _explainable(statement, parameters, executemany):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _explaining = True
+    stat.explained_at = now
+    task = loop.create_task(_explain(stat, role, engine, statement, parameters, seconds))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def record_statement(role: str, engine: AsyncEngine, statement: str, parameters: Any,
+            executemany: bool, seconds: float) -> None:
+    """Statement hook for `instrument_engine`: count `statement` under `role`."""
+    global _dropped
+    fingerprint_id, sql = fingerprint(statement)
+    if role != "primary":
+        fingerprint_id = f"{role}-{fingerprint_id}"
+    stat = _stats.get(fingerprint_id)
+    if stat is None:
+        if len(_stats) >= CONFIG.query_stats_max_fingerprints:
+            _dropped += 1
+            return
+        stat = _stats[fingerprint_id] = QueryStat(fingerprint_id, sql, role)
+    stat.observe(seconds)
+
+    if seconds * 1000 < CONFIG.slow_query_ms:
+        return
+    stat.slow += 1
+    stat.last_slow_at = datetime.now(timezone.utc).isoformat()
+    params = _truncate(parameters, _PARAMS_MAX_CHARS) if CONFIG.slow_query_log_params else "<hidden>"
+    stat.last_slow_params = params
+    log.warning(
+        f"[slow_query] {role} {fingerprint_id} {seconds * 1000:.1f}ms: "
+        f"{_truncate(sql, _SQL_MAX_CHARS)} params={params}")
+    if CONFIG.slow_query_explain_sample_rate > 0:
+        _maybe_explain(stat, role, engine, statement, parameters, executemany, seconds)
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, String, bindparam, select, type_coerce
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import (
@@ -18,68 +18,74 @@ from ..db.models import (
 )
 from .interfaces import IReadsRepo
 
+# Built once and reused: SQLAlchemy compiles each of them a single time and
+# asyncpg keeps them prepared per connection
+_SHOW_SEAT_MAP = (
+    select(
+        VenueSeat.seat_id,
+        VenueSeat.row_nums,
+        VenueSeat.col_nums,
+        VenueSection.section_id,
+        VenueSection.name.label("section_name"),
+        ShowPricing.amount.label("price"),
+        ShowPricing.currency,
+        type_coerce(Inventory.status, String).label("inventory_status"),
+    )
+    .select_from(Inventory)
+    .join(VenueSeat, VenueSeat.seat_id == Inventory.seat_id)
+    .join(VenueSection, VenueSection.section_id == VenueSeat.section_id)
+    .join(
+        ShowPricing,
+        (ShowPricing.show_id == Inventory.show_id)
+        & (ShowPricing.section_id == VenueSection.section_id),
+    )
+    .where(Inventory.show_id == bindparam("show_id"))
+    .order_by(VenueSection.order, VenueSeat.row_nums, VenueSeat.col_nums)
+)
+
+_SHOW_DETAILS = (
+    select(
+        Show.show_id,
+        Show.start_time,
+        Show.end_time,
+        Show.status.label("show_status"),
+        Event.event_id,
+        Event.title.label("event_title"),
+        Event.event_type,
+        Venue.venue_id,
+        Venue.name.label("venue_name"),
+        Venue.city,
+    )
+    .join(Event, Event.event_id == Show.event_id)
+    .join(Venue, Venue.venue_id == Show.venue_id)
+    .where(Show.show_id == bindparam("show_id"))
+)
+
 
 class ReadsRepo(IReadsRepo):
     """Read-heavy, join-based queries.
 
-    These queries intentionally return dictionaries instead of ORM objects
-    to avoid accidental writes and keep the read layer lightweight.
+    These queries intentionally return plain rows / dictionaries instead of
+    ORM objects to avoid accidental writes and keep the read layer lightweight.
     """
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def fetch_show_seat_map(self, *, show_id: int) -> list[dict[str, Any]]:
-        """Return seat map for a show with section, pricing and inventory status."""
-
-        stmt = (
-            select(
-                VenueSeat.seat_id,
-                VenueSeat.row_nums,
-                VenueSeat.col_nums,
-                VenueSection.section_id,
-                VenueSection.name.label("section_name"),
-                ShowPricing.amount.label("price"),
-                ShowPricing.currency,
-                Inventory.status.label("inventory_status"),
-            )
-            .select_from(Inventory)
-            .join(VenueSeat, VenueSeat.seat_id == Inventory.seat_id)
-            .join(VenueSection, VenueSection.section_id == VenueSeat.section_id)
-            .join(
-                ShowPricing,
-                (ShowPricing.show_id == Inventory.show_id)
-                & (ShowPricing.section_id == VenueSection.section_id),
-            )
-            .where(Inventory.show_id == show_id)
-            .order_by(VenueSection.order, VenueSeat.row_nums, VenueSeat.col_nums)
-        )
-
-        rows = (await self.session.execute(stmt)).mappings().all()
-        return [dict(r) for r in rows]
+    async def fetch_show_seat_map(self, *, show_id: int) -> Sequence[Row[Any]]:
+        """Return seat map for a show with section, pricing and inventory status.
+
+        Rows are tuples in `_SHOW_SEAT_MAP` column order (also readable by
+        attribute): (seat_id, row_nums, col_nums, section_id, section_name,
+        price, currency, inventory_status).
+        """
+
+        return (await self.session.execute(_SHOW_SEAT_MAP, {"show_id": show_id})).all()
 
     async def fetch_show_details(self, *, show_id: int) -> dict[str, Any] | None:
         """Return show + event + venue details."""
 
-        stmt = (
-            select(
-                Show.show_id,
-                Show.start_time,
-                Show.end_time,
-                Show.status.label("show_status"),
-                Event.event_id,
-                Event.title.label("event_title"),
-                Event.event_type,
-                Venue.venue_id,
-                Venue.name.label("venue_name"),
-                Venue.city,
-            )
-            .join(Event, Event.event_id == Show.event_id)
-            .join(Venue, Venue.venue_id == Show.venue_id)
-            .where(Show.show_id == show_id)
-        )
-
-        row = (await self.session.execute(stmt)).mappings().first()
+        row = (await self.session.execute(_SHOW_DETAILS, {"show_id": show_id})).mappings().first()
         return dict(row) if row else None
 
 
@@ -4,10 +4,13 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import delete, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.models import Show
+from .hooks import TOPIC_SHOWS, mark_changed
 from .interfaces import IShowsRepo
 
 
@@ -20,6 +23,26 @@ class ShowsRepo(IShowsRepo):
     async def get(self, show_id: int) -> Show | None:
         return await self.session.get(Show, show_id)
 
+    async def create(self, **kwargs: Any) -> Show:
+        show = Show(**kwargs)
+        self.session.add(show)
+        await self.session.flush()  # populate show_id
+        mark_changed(self.session, TOPIC_SHOWS, show.show_id)
+        return show
+
+    async def update(self, show_id: int, **values: Any) -> int:
+        """Update columns of a show; returns the number of affected rows."""
+        stmt = update(Show).where(Show.show_id == show_id).values(**values)
+        result = await self.session.execute(stmt)
+        mark_changed(self.session, TOPIC_SHOWS, show_id)
+        return int(result.rowcount or 0)                # type: ignore
+
+    async def delete(self, show_id: int) -> int:
+        """Delete a show; returns the number of affected rows."""
+        result = await self.session.execute(delete(Show).where(Show.show_id == show_id))
+        mark_changed(self.session, TOPIC_SHOWS, show_id)
+        return int(result.rowcount or 0)                # type: ignore
+
     async def list_by_event(self, event_id: int) -> list[Show]:
         stmt = select(Show).where(Show.event_id == event_id).order_by(Show.start_time)
         res = await self.session.execute(stmt)
@@ -30,14 +53,28 @@ class ShowsRepo(IShowsRepo):
         res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
-    async def list_upcoming(self, *, now: datetime | None = None, limit: int = 50) -> list[Show]:
-        """Return upcoming shows ordered by start time."""
+    async def list_upcoming(
+            self,
+            *,
+            now: datetime | None = None,
+            until: datetime | None = None,
+            after: tuple[datetime, int] | None = None,
+            limit: int = 50) -> list[Show]:
+        """Return upcoming shows ordered by (start_time, show_id).
+
+        `after` is the (start_time, show_id) of the last show of the previous
+        page; the next page starts right after it.
+        """
         now = now or datetime.utcnow()
         stmt = (
             select(Show)
             .where(Show.start_time >= now)
-            .order_by(Show.start_time)
+            .order_by(Show.start_time, Show.show_id)
             .limit(limit)
         )
+        if until is not None:
+            stmt = stmt.where(Show.start_time < until)
+        if after is not None:
+            stmt = stmt.where(tuple_(Show.start_time, Show.show_id) > tuple_(*after))
         res = await self.session.execute(stmt)
         return list(res.scalars().all())
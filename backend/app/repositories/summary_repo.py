@@ -0,0 +1,120 @@
+
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.models import Inventory, InventoryStatus, ShowPricing, ShowSummary
+from .interfaces import IShowSummaryRepo
+
+
+class ShowSummaryRepo(IShowSummaryRepo):
+    """Repository for the `show_summary` listing projection.
+
+    Seat counts are adjusted incrementally by whoever changes inventory, in
+    the same transaction; prices are recomputed from `show_pricings` for a
+    single show. `rebuild()` recomputes everything from scratch (backfill /
+    repair).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, show_id: int) -> Optional[ShowSummary]:
+        return await self.session.get(ShowSummary, show_id)
+
+    async def apply_seats_delta(self, *, show_id: int, delta: int) -> None:
+        """Add `delta` (negative when booking) to the available seat count."""
+        available = ShowSummary.available_seats + delta
+        stmt = (
+            update(ShowSummary)
+            .where(ShowSummary.show_id == show_id)
+            .values(
+                available_seats=available,
+                sold_out=available <= 0,
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+        await self.session.execute(stmt)
+
+    async def refresh_pricing(self, *, show_id: int) -> None:
+        """Recompute min price / currency of a show from its pricings."""
+        stmt = (
+            update(ShowSummary)
+            .where(ShowSummary.show_id == show_id)
+            .values(
+                min_price=select(func.min(ShowPricing.amount))
+                .where(ShowPricing.show_id == show_id)
+                .scalar_subquery(),
+                currency=select(func.min(ShowPricing.currency))
+                .where(ShowPricing.show_id == show_id)
+                .scalar_subquery(),
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+        result = await self.session.execute(stmt)
+        if not result.rowcount:                         # type: ignore
+            await self.rebuild(show_id=show_id)
+
+    async def rebuild(self, *, show_id: Optional[int] = None) -> None:
+        """Recompute the summary of one show (or all shows) from the base tables."""
+        available = func.count(Inventory.seat_id).filter(
+            Inventory.status == InventoryStatus.available)
+        seats = (
+            select(
+                Inventory.show_id,
+                func.count(Inventory.seat_id).label("total_seats"),
+                available.label("available_seats"),
+            )
+            .group_by(Inventory.show_id)
+        )
+        prices = (
+            select(
+                ShowPricing.show_id,
+                func.min(ShowPricing.amount).label("min_price"),
+                func.min(ShowPricing.currency).label("currency"),
+            )
+            .group_by(ShowPricing.show_id)
+        )
+        if show_id is not None:
+            seats = seats.where(Inventory.show_id == show_id)
+            prices = prices.where(ShowPricing.show_id == show_id)
+        seats_sq = seats.subquery()
+        prices_sq = prices.subquery()
+
+        source = (
+            select(
+                prices_sq.c.show_id,
+                prices_sq.c.min_price,
+                prices_sq.c.currency,
+                func.coalesce(seats_sq.c.total_seats, 0),
+                func.coalesce(seats_sq.c.available_seats, 0),
+                func.coalesce(seats_sq.c.available_seats, 0) <= 0,
+                func.now(),
+            )
+            .select_from(prices_sq)
+            .outerjoin(seats_sq, seats_sq.c.show_id == prices_sq.c.show_id)
+        )
+
+        stmt = insert(ShowSummary).from_select(
+            ["show_id", "min_price", "currency", "total_seats",
+             "available_seats", "sold_out", "updated_at"],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ShowSummary.show_id],
+            set_={
+                "min_price": stmt.excluded.min_price,
+                "currency": stmt.excluded.currency,
+                "total_seats": stmt.excluded.total_seats,
+                "available_seats": stmt.excluded.available_seats,
+                "sold_out": stmt.excluded.sold_out,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await self.session.execute(stmt)
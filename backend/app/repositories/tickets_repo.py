@@ -2,22 +2,71 @@
 
 from __future__ import annotations
 
+import base64
 import secrets
 from datetime import datetime
-from typing import Sequence
+from typing import Any, Mapping, Sequence
 
+from sqlalchemy import DateTime, Integer, String, bindparam, column, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db.models import Ticket
+from ..db.models import Ticket, TicketStatus
 from .interfaces import ITicketsRepo
 
+# 12 random bytes encode to exactly 16 url-safe base64 chars (no padding),
+# so one urandom call can be sliced into many codes.
+_TICKET_CODE_BYTES = 12
+_TICKET_CODE_CHARS = 16
+
+
+def generate_ticket_codes(n: int) -> list[str]:
+    """Return `n` random ticket codes generated from a single urandom call."""
+    encoded = base64.urlsafe_b64encode(secrets.token_bytes(n * _TICKET_CODE_BYTES)).decode()
+    return [encoded[i:i + _TICKET_CODE_CHARS] for i in range(0, len(encoded), _TICKET_CODE_CHARS)]
+
+
+# INSERT INTO tickets (...) SELECT ... FROM unnest(:booking_ids, :seat_ids, :ticket_codes)
+# RETURNING ...; one statement and one round trip however many tickets.
+_issue = func.unnest(
+    bindparam("booking_ids", type_=ARRAY(Integer)),
+    bindparam("seat_ids", type_=ARRAY(Integer)),
+    bindparam("ticket_codes", type_=ARRAY(String)),
+).table_valued(
+    column("booking_id", Integer),
+    column("seat_id", Integer),
+    column("ticket_code", String),
+).render_derived(name="issue")
+
+_ISSUE_TICKETS = insert(Ticket).from_select(
+    ["booking_id", "show_id", "seat_id", "ticket_code", "issued_at", "status"],
+    select(
+        _issue.c.booking_id,
+        bindparam("show_id", type_=Integer),
+        _issue.c.seat_id,
+        _issue.c.ticket_code,
+        bindparam("issued_at", type_=DateTime(timezone=True)),
+        literal(TicketStatus.active, Ticket.__table__.c.status.type),
+    ),
+).returning(Ticket.ticket_id, Ticket.booking_id, Ticket.seat_id, Ticket.ticket_code)
+
 
 class TicketsRepo(ITicketsRepo):
-    """Repository for ticket operations."""
+    """Repository for ticket operations.
+
+    Tickets are issued with a single set-based INSERT and returned as plain
+    rows (ticket_id, booking_id, seat_id, ticket_code); no ORM objects are
+    created, so the cost per booking stays flat with the number of seats.
+    """
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def list_for_booking(self, booking_id: int) -> list[Ticket]:
+        stmt = select(Ticket).where(Ticket.booking_id == booking_id).order_by(Ticket.ticket_id)
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
     async def create_many(
         self,
         *,
@@ -25,30 +74,54 @@ class TicketsRepo(ITicketsRepo):
         show_id: int,
         seat_ids: Sequence[int],
         issued_at: datetime,
-    ) -> list[Ticket]:
-        tickets: list[Ticket] = []
-
-        # TicketStatus is optional depending on your models.py
-        TicketStatus = getattr(
-            __import__(
-                "app.db.models",
-                fromlist=["TicketStatus"]),
-            "TicketStatus",
-            None)
-        active_status = getattr(TicketStatus, "active", None) if TicketStatus else None
-
-        for seat_id in seat_ids:
-            t = Ticket(
-                booking_id=booking_id,
-                show_id=show_id,
-                seat_id=seat_id,
-                ticket_code=secrets.token_urlsafe(10)[:20],
-                issued_at=issued_at,
-            )
-            if active_status is not None and hasattr(t, "status"):
-                setattr(t, "status", active_status)
-            tickets.append(t)
-
-        self.session.add_all(tickets)
-        await self.session.flush()              # populate ticket_id(s)
-        return tickets
+    ) -> list[Any]:
+        return await self._issue(
+            show_id=show_id,
+            booking_ids=[booking_id] * len(seat_ids),
+            seat_ids=list(seat_ids),
+            issued_at=issued_at,
+        )
+
+    async def create_for_bookings(
+        self,
+        *,
+        show_id: int,
+        seats_by_booking: Mapping[int, Sequence[int]],
+        issued_at: datetime,
+    ) -> list[Any]:
+        """Issue the tickets of several bookings of a show in one statement."""
+        booking_ids: list[int] = []
+        seat_ids: list[int] = []
+        for booking_id, seats in seats_by_booking.items():
+            booking_ids.extend([booking_id] * len(seats))
+            seat_ids.extend(seats)
+
+        return await self._issue(
+            show_id=show_id,
+            booking_ids=booking_ids,
+            seat_ids=seat_ids,
+            issued_at=issued_at,
+        )
+
+    async def _issue(
+        self,
+        *,
+        show_id: int,
+        booking_ids: list[int],
+        seat_ids: list[int],
+        issued_at: datetime,
+    ) -> list[Any]:
+        if not seat_ids:
+            return []
+
+        res = await self.session.execute(
+            _ISSUE_TICKETS,
+            {
+                "booking_ids": booking_ids,
+                "seat_ids": seat_ids,
+                "ticket_codes": generate_ticket_codes(len(seat_ids)),
+                "show_id": show_id,
+                "issued_at": issued_at,
+            },
+        )
+        return list(res.all())
@@ -0,0 +1,215 @@
+"""Virtual waiting room in front of the booking endpoints.
+
+When `CONFIG.admission_queue_enabled` is on, a client must join the queue
+of a show and wait until it is admitted before `/book/reserve` and `/book`
+accept its requests (see `require_admission` in config/auth.py). At most
+`capacity` sessions per show are admitted at a time, so the load reaching
+Postgres is bounded no matter how many clients arrive at once.
+
+Per show, in Redis:
+- `admission:{show}:queue`     ZSET of waiting members, scored by arrival (FIFO)
+- `admission:{show}:admitted`  ZSET of admitted members, scored by expiry
+- `admission:{show}:seq`       arrival counter
+- `admission:{show}:capacity`  optional per-show capacity override
+
+A member is `"{user}:{token}"`: the token handed out on join only works
+for the user that joined. Waiting members are promoted lazily, by the
+script that every join / status poll runs, so no pump process is needed.
+"""
+
+from __future__ import annotations
+
+import math
+import secrets
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import CONFIG
+from ..db.sessions import redis_client
+from ..domain.models import AdmissionStatus
+
+__all__ = [
+    "ADMITTED",
+    "WAITING",
+    "AdmissionQueue",
+    "admission_member",
+    "admission_queue",
+]
+
+ADMITTED = "admitted"
+WAITING = "waiting"
+
+# Drop expired admissions, enqueue the member (on join), promote waiting
+# members into the free slots and report on one member.
+#
+# KEYS[1]: queue, KEYS[2]: admitted, KEYS[3]: capacity override, KEYS[4]: seq
+# ARGV[1]: member, ARGV[2]: default capacity, ARGV[3]: admission TTL (s),
+# ARGV[4]: "1" to enqueue the member if unknown, ARGV[5]: key TTL (s)
+#
+# Returns {0, seconds_left} when admitted, {1, position} when waiting
+# (0-based) and {2} when the member is unknown.
+_ADMISSION_LUA = """
+local now = tonumber(redis.call('TIME')[1])
+local member = ARGV[1]
+
+-- Prune first: a member whose admission expired re-joins at the back
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+
+if ARGV[4] == '1'
+        and not redis.call('ZSCORE', KEYS[2], member)
+        and not redis.call('ZSCORE', KEYS[1], member) then
+    redis.call('ZADD', KEYS[1], redis.call('INCR', KEYS[4]), member)
+    for i = 1, 4 do
+        redis.call('EXPIRE', KEYS[i], ARGV[5])
+    end
+end
+
+local capacity = tonumber(redis.call('GET', KEYS[3]) or ARGV[2])
+local free = capacity - redis.call('ZCARD', KEYS[2])
+if free > 0 then
+    local promoted = redis.call('ZPOPMIN', KEYS[1], free)
+    for i = 1, #promoted, 2 do
+        redis.call('ZADD', KEYS[2], now + tonumber(ARGV[3]), promoted[i])
+    end
+end
+
+local expires_at = redis.call('ZSCORE', KEYS[2], member)
+if expires_at then
+    return {0, tonumber(expires_at) - now}
+end
+local rank = redis.call('ZRANK', KEYS[1], member)
+if rank then
+    return {1, rank}
+end
+return {2}
+"""
+
+# Whether a member's admission is still valid, by the Redis clock that
+# `_ADMISSION_LUA` scored it with (worker clocks may be skewed).
+#
+# KEYS[1]: admitted, ARGV[1]: member. Returns 1 when admitted, else 0.
+_IS_ADMITTED_LUA = """
+local expires_at = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if expires_at and tonumber(expires_at) > tonumber(redis.call('TIME')[1]) then
+    return 1
+end
+return 0
+"""
+
+# Queue keys of a show outlive its on-sale spike by this much at most
+_KEY_TTL_SECONDS = 24 * 3600
+
+
+def admission_member(user_id: int | str, token: str) -> str:
+    """Queue member of `user_id` holding admission `token`."""
+    return f"{user_id}:{token}"
+
+
+@dataclass(frozen=True)
+class _Keys:
+    queue: str
+    admitted: str
+    capacity: str
+    seq: str
+
+    @classmethod
+    def of(cls, show_id: int | str) -> "_Keys":
+        prefix = f"admission:{show_id}"
+        return cls(f"{prefix}:queue", f"{prefix}:admitted", f"{prefix}:capacity", f"{prefix}:seq")
+
+    def as_list(self) -> list[str]:
+        return [self.queue, self.admitted, self.capacity, self.seq]
+
+
+class AdmissionQueue:
+    def __init__(self, *, capacity: int, admission_ttl_seconds: int) -> None:
+        self._capacity = capacity
+        self._admission_ttl = admission_ttl_seconds
+        self._script = redis_client.register_script(_ADMISSION_LUA)
+        self._is_admitted_script = redis_client.register_script(_IS_ADMITTED_LUA)
+
+    async def _run(
+            self,
+            show_id: int,
+            user_id: int | str,
+            token: str,
+            *,
+            join: bool) -> Optional[AdmissionStatus]:
+        result = await self._script(
+            keys=_Keys.of(show_id).as_list(),
+            args=[
+                admission_member(user_id, token),
+                self._capacity,
+                self._admission_ttl,
+                "1" if join else "0",
+                _KEY_TTL_SECONDS,
+            ],
+        )
+        code = int(result[0])
+        if code == 2:
+            return None
+
+        if code == 0:
+            return AdmissionStatus(
+                show_id=show_id, token=token, state=ADMITTED, expires_in_seconds=int(result[1]))
+
+        position = int(result[1])
+        return AdmissionStatus(
+            show_id=show_id,
+            token=token,
+            state=WAITING,
+            position=position,
+            eta_seconds=await self._eta(show_id, position),
+        )
+
+    async def _eta(self, show_id: int, position: int) -> int:
+        # Upper bound: every admitted session uses its whole window. Sessions
+        # that book (or leave) early free their slot sooner.
+        capacity = await redis_client.get(_Keys.of(show_id).capacity)
+        capacity = int(capacity) if capacity else self._capacity
+        return math.ceil((position + 1) / max(capacity, 1)) * self._admission_ttl
+
+    async def join(
+            self,
+            show_id: int,
+            user_id: int | str,
+            token: Optional[str] = None) -> Optional[AdmissionStatus]:
+        """Enter the queue of a show (idempotent for a known token).
+
+        The script enqueues unknown and expired members, so None is not
+        expected; callers still treat it as "join again".
+        """
+        return await self._run(show_id, user_id, token or secrets.token_urlsafe(16), join=True)
+
+    async def status(self, show_id: int, user_id: int | str, token: str) -> Optional[AdmissionStatus]:
+        """Position / admission of a member; None if unknown or expired."""
+        return await self._run(show_id, user_id, token, join=False)
+
+    async def is_admitted(self, show_id: int, user_id: int | str, token: str) -> bool:
+        """Single round-trip check used on every gated request."""
+        admitted = await self._is_admitted_script(
+            keys=[_Keys.of(show_id).admitted], args=[admission_member(user_id, token)])
+        return bool(int(admitted))
+
+    async def leave(self, show_id: int, user_id: int | str, token: str) -> None:
+        """Give up a place in the queue, or free an admission slot."""
+        keys = _Keys.of(show_id)
+        member = admission_member(user_id, token)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zrem(keys.queue, member)
+            pipe.zrem(keys.admitted, member)
+            await pipe.execute()
+
+    async def set_capacity(self, show_id: int, capacity: Optional[int]) -> None:
+        """Override the capacity of one show (None restores the default)."""
+        key = _Keys.of(show_id).capacity
+        if capacity is None:
+            await redis_client.delete(key)
+        else:
+            await redis_client.set(key, int(capacity), ex=_KEY_TTL_SECONDS)
+
+
+admission_queue = AdmissionQueue(
+    capacity=CONFIG.admission_capacity_per_show,
+    admission_ttl_seconds=CONFIG.admission_session_ttl_seconds,
+)
@@ -0,0 +1,261 @@
+"""Per-show seat availability kept in memory by every API worker.
+
+Each show is represented by two bitsets (held / booked) indexed by the seat
+ordinal, i.e. the seat's position in the seat map ordering returned by
+`ReadsRepo.fetch_show_seat_map`. A show is loaded from the DB (+ Redis for
+live holds) the first time it is needed; after that it is kept current by
+hold / release / booking transitions published on a Redis channel, so hot
+shows are served without touching Postgres.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Sequence
+
+from ..config import CONFIG, log
+from ..db.models import InventoryStatus
+from ..db.sessions import redis_client
+from ..repositories.uow import AsyncUnitOfWork
+from .seat_lock import seat_lock_key
+
+__all__ = [
+    "AVAILABILITY_CHANNEL",
+    "SEAT_AVAILABLE",
+    "SEAT_HELD",
+    "SEAT_BOOKED",
+    "SEAT_RELEASED",
+    "ShowSeatBitmap",
+    "SeatAvailabilityIndex",
+    "seat_availability",
+]
+
+AVAILABILITY_CHANNEL = "seat-availability"
+
+SEAT_AVAILABLE = "available"
+SEAT_HELD = "held"
+SEAT_BOOKED = "booked"
+# Transition only: a hold went away (expired / released) without a booking.
+SEAT_RELEASED = "released"
+
+
+class ShowSeatBitmap:
+    """Availability of every seat of one show, one bit per seat and state."""
+
+    __slots__ = ("seat_ids", "ordinals", "held", "booked", "version")
+
+    def __init__(self, seat_ids: Sequence[int]) -> None:
+        self.seat_ids: list[int] = list(seat_ids)
+        self.ordinals: dict[int, int] = {seat_id: i for i, seat_id in enumerate(self.seat_ids)}
+        size = (len(self.seat_ids) + 7) // 8
+        self.held = bytearray(size)
+        self.booked = bytearray(size)
+        # Bumped on every change; lets readers cheaply detect staleness.
+        self.version = 0
+
+    @staticmethod
+    def _get(bits: bytearray, ordinal: int) -> bool:
+        return bool(bits[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    @staticmethod
+    def _set(bits: bytearray, ordinal: int, on: bool) -> None:
+        if on:
+            bits[ordinal >> 3] |= 1 << (ordinal & 7)
+        else:
+            bits[ordinal >> 3] &= ~(1 << (ordinal & 7)) & 0xFF
+
+    def apply(self, state: str, seat_ids: Iterable[int]) -> None:
+        """Apply a seat transition (held / released / booked / available)."""
+        for seat_id in seat_ids:
+            ordinal = self.ordinals.get(int(seat_id))
+            if ordinal is None:
+                continue
+            if state == SEAT_HELD:
+                self._set(self.held, ordinal, True)
+            elif state == SEAT_RELEASED:
+                self._set(self.held, ordinal, False)
+            elif state == SEAT_BOOKED:
+                self._set(self.held, ordinal, False)
+                self._set(self.booked, ordinal, True)
+            elif state == SEAT_AVAILABLE:
+                self._set(self.held, ordinal, False)
+                self._set(self.booked, ordinal, False)
+        self.version += 1
+
+    def status_at(self, ordinal: int) -> str:
+        if self._get(self.booked, ordinal):
+            return SEAT_BOOKED
+        if self._get(self.held, ordinal):
+            return SEAT_HELD
+        return SEAT_AVAILABLE
+
+    def status(self, seat_id: int) -> Optional[str]:
+        ordinal = self.ordinals.get(seat_id)
+        return None if ordinal is None else self.status_at(ordinal)
+
+    def statuses(self) -> list[str]:
+        """Status of every seat, in ordinal order."""
+        return [self.status_at(i) for i in range(len(self.seat_ids))]
+
+    def digest(self) -> str:
+        """Short hash of the current state; equal across workers for equal state."""
+        return hashlib.blake2b(bytes(self.held) + bytes(self.booked), digest_size=8).hexdigest()
+
+    def booked_among(self, seat_ids: Iterable[int]) -> list[int]:
+        """Seat IDs from `seat_ids` known to be sold."""
+        out = []
+        for seat_id in seat_ids:
+            ordinal = self.ordinals.get(seat_id)
+            if ordinal is not None and self._get(self.booked, ordinal):
+                out.append(seat_id)
+        return out
+
+
+class SeatAvailabilityIndex:
+    """Process-wide registry of `ShowSeatBitmap`s fed by Redis pub/sub.
+
+    Holds at most `max_shows` bitmaps, least recently used evicted first.
+    Transitions published while a show is being loaded are buffered and
+    replayed onto the fresh bitmap, so none is lost between the DB read and
+    the bitmap going live.
+    """
+
+    def __init__(self, *, max_shows: int) -> None:
+        self._max_shows = max_shows
+        self._shows: OrderedDict[int, ShowSeatBitmap] = OrderedDict()
+        self._loading: dict[int, asyncio.Lock] = {}
+        # show_id -> transitions received while its seat map is being read
+        self._pending: dict[int, list[tuple[str, list[int]]]] = {}
+
+    def peek(self, show_id: int) -> Optional[ShowSeatBitmap]:
+        """Return the bitmap only if it is already loaded (never hits the DB)."""
+        bitmap = self._shows.get(show_id)
+        if bitmap is not None:
+            self._shows.move_to_end(show_id)
+        return bitmap
+
+    def track(self, show_id: int) -> None:
+        """Start buffering transitions of a show that is not loaded yet.
+
+        Call it before reading the rows later passed to `get(seat_map=...)`;
+        `get` replays the buffer and stops tracking, `untrack` gives up.
+        """
+        if show_id not in self._shows:
+            self._pending.setdefault(show_id, [])
+
+    def untrack(self, show_id: int) -> None:
+        if show_id not in self._loading:
+            self._pending.pop(show_id, None)
+
+    async def get(
+            self,
+            show_id: int,
+            seat_map: Optional[Sequence[Any]] = None) -> ShowSeatBitmap:
+        """Return the bitmap for a show, loading it on first use.
+
+        `seat_map` (rows of `fetch_show_seat_map`) can be passed by callers
+        that already fetched it, to avoid running the query twice. It is
+        only used if the show was `track`ed before the fetch.
+        """
+        bitmap = self.peek(show_id)
+        if bitmap is not None:
+            return bitmap
+
+        lock = self._loading.setdefault(show_id, asyncio.Lock())
+        async with lock:
+            bitmap = self._shows.get(show_id)
+            if bitmap is None:
+                if show_id not in self._pending:
+                    # Rows read without tracking may have missed transitions
+                    seat_map = None
+                pending = self._pending.setdefault(show_id, [])
+                try:
+                    bitmap = await self._load(show_id, seat_map)
+                finally:
+                    current = self._pending.pop(show_id, None)
+                for state, seat_ids in pending:
+                    bitmap.apply(state, seat_ids)
+                # A resubscribe during the load dropped the buffer: serve it once, uncached
+                if current is pending:
+                    self._store(show_id, bitmap)
+        self._loading.pop(show_id, None)
+        return bitmap
+
+    def _store(self, show_id: int, bitmap: ShowSeatBitmap) -> None:
+        self._shows[show_id] = bitmap
+        self._shows.move_to_end(show_id)
+        while len(self._shows) > self._max_shows:
+            self._shows.popitem(last=False)
+
+    async def _load(
+            self,
+            show_id: int,
+            rows: Optional[Sequence[Any]]) -> ShowSeatBitmap:
+        if rows is None:
+            async with AsyncUnitOfWork() as uow:
+                rows = await uow.table_read.fetch_show_seat_map(show_id=show_id)
+
+        bitmap = ShowSeatBitmap([r.seat_id for r in rows])
+        bitmap.apply(
+            SEAT_BOOKED,
+            [r.seat_id for r in rows if r.inventory_status != InventoryStatus.available],
+        )
+
+        if bitmap.seat_ids:
+            held = await redis_client.mget(
+                [seat_lock_key(show_id, seat_id) for seat_id in bitmap.seat_ids])
+            bitmap.apply(
+                SEAT_HELD,
+                [seat_id for seat_id, owner in zip(bitmap.seat_ids, held) if owner is not None],
+            )
+        return bitmap
+
+    def apply(self, show_id: int, state: str, seat_ids: Iterable[int]) -> None:
+        bitmap = self._shows.get(show_id)
+        if bitmap is not None:
+            bitmap.apply(state, seat_ids)
+            return
+        pending = self._pending.get(show_id)
+        if pending is not None:
+            pending.append((state, list(seat_ids)))
+
+    def clear(self) -> None:
+        self._shows.clear()
+        # Loads in flight may have missed messages too: keep them out of the cache
+        self._pending.clear()
+
+    async def publish(self, show_id: int | str, state: str, seat_ids: Iterable[int | str]) -> None:
+        """Broadcast a seat transition to every worker (including this one)."""
+        message = json.dumps(
+            {"show_id": int(show_id), "state": state, "seat_ids": [int(s) for s in seat_ids]})
+        await redis_client.publish(AVAILABILITY_CHANNEL, message)  # type: ignore
+
+    async def listen(self) -> None:
+        """Apply published transitions until cancelled; resubscribes on errors.
+
+        Bitmaps are dropped whenever the subscription (re)starts since any
+        message sent while disconnected is lost.
+        """
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(AVAILABILITY_CHANNEL)
+                self.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    self.apply(int(data["show_id"]), data["state"], data["seat_ids"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"seat availability subscription lost: {e!r}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+seat_availability = SeatAvailabilityIndex(max_shows=CONFIG.availability_max_shows)
@@ -1,21 +1,46 @@
 import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 
-from ..services.seat_lock import ISeatLockService, RedisSeatLockService
-from ..db.sessions import redis_client
-from datetime import datetime, timezone
+from ..services.seat_lock import (
+    ISeatLockService,
+    RedisSeatLockService,
+    hold_owner,
+    new_hold_token,
+    seat_lock_key,
+)
+from ..domain.errors import (
+    BookingInProgress,
+    BookingNotFound,
+    HoldExpired,
+    PaymentFailed,
+    SeatNotAvailable,
+)
+from ..domain.models import HoldSeatsResponse, PaymentInitResponse
+from ..services.availability import SEAT_BOOKED, SEAT_HELD, SEAT_RELEASED, seat_availability
+from ..services.payments import StubPaymentProvider, payment_provider
+from ..services.pricing import price_seats
+from ..config import CONFIG, log
+from ..config.tracing import instrument_class
+from datetime import datetime, timedelta, timezone
 from ..repositories.uow import AsyncUnitOfWork
 from ..db.models import BookingStatus, InventoryStatus, PaymentStatus
 
 
 class IBookingService(ABC):
     @abstractmethod
-    async def reserve_seats(self, show_id: str, seat_ids: list[str]) -> None:
+    async def reserve_seats(
+            self,
+            user_id: str,
+            show_id: str,
+            seat_ids: list[str],
+            hold_token: str | None = None) -> HoldSeatsResponse:
         """Reserve seats for a user and return a hold token.
 
-        user: User Information
+        user_id: ID of the user holding the seats
         Show ID: ID of the show
         seat_ids: List of seat IDs to reserve
+        hold_token: Token to hold the seats under (generated when omitted)
 
         Raises:
             NotImplementedError
@@ -27,10 +52,26 @@ class IBookingService(ABC):
             self,
             user_id: str,
             show_id: str,
-            seat_ids: list[str]) -> int:
+            seat_ids: list[str],
+            hold_token: str | None) -> int:
         """Book seats for a user using a hold token and return a booking ID."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def initiate_booking(
+            self,
+            user_id: str,
+            show_id: str,
+            seat_ids: list[str],
+            hold_token: str | None) -> PaymentInitResponse:
+        """Create a pending booking + payment for held seats and start the payment."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def confirm_payment(self, payment_id: int, succeeded: bool) -> BookingStatus:
+        """Settle the booking of a payment reported by the provider; return its status."""
+        raise NotImplementedError
+
 
 class BookingService(IBookingService):
     __seat_lock_service: ISeatLockService | None = None
@@ -39,30 +80,87 @@ class BookingService(IBookingService):
         if self.__seat_lock_service is None:
             self.__seat_lock_service = RedisSeatLockService()
 
-    async def reserve_seats(self, show_id: str, seat_ids: list[str]) -> None:
-        """Reserve seats for a user and return a hold token."""
+    async def reserve_seats(
+            self,
+            user_id: str,
+            show_id: str,
+            seat_ids: list[str],
+            hold_token: str | None = None) -> HoldSeatsResponse:
+        """Reserve seats for a user and return a hold token.
+
+        All seats are held atomically in one Redis round trip; if any of
+        them is already held nothing is locked. Each lock key stores the
+        hold owner (user + token) so only this hold can later book or
+        release the seats.
+
+        Raises:
+            SeatNotAvailable: with the list of conflicting seat IDs.
+        """
+
+        if not seat_ids:
+            raise ValueError("seat_ids cannot be empty")
+
+        try:
+            show_id_int = int(show_id)
+            seat_id_ints = [int(s) for s in seat_ids]
+        except ValueError as e:
+            raise ValueError("show_id/seat_ids must be numeric strings") from e
+        if len(set(seat_id_ints)) != len(seat_id_ints):
+            raise ValueError("seat_ids must not contain duplicates")
+
+        # Sold seats never come back on sale, so a locally known sale is
+        # enough to reject without a Redis round trip.
+        bitmap = seat_availability.peek(show_id_int)
+        if bitmap is not None:
+            sold = bitmap.booked_among(seat_id_ints)
+            if sold:
+                raise SeatNotAvailable(sold)
+
+        hold_token = hold_token or new_hold_token()
+        owner = hold_owner(user_id, hold_token)
+
+        seat_keys = {seat_lock_key(show_id_int, seat_id): seat_id for seat_id in seat_id_ints}
+        conflicts = await self.__seat_lock_service.hold_seats(                    # type: ignore
+            list(seat_keys), owner)
+
+        if conflicts:
+            raise SeatNotAvailable([seat_keys[key] for key in conflicts])
 
-        # create a list of coroutines
-        tasks = []
-        for seat_id in seat_ids:
-            seat_key = f"show:{show_id}:seat:{seat_id}"
-            tasks.append(self.__seat_lock_service.lock_seat(seat_key))          # type: ignore
+        await seat_availability.publish(show_id_int, SEAT_HELD, seat_id_ints)
 
-        # trigger all coroutines concurrently
-        await asyncio.gather(*tasks)
+        return HoldSeatsResponse(
+            show_id=show_id_int,
+            seat_ids=seat_id_ints,
+            hold_token=hold_token,
+            hold_expires_at=datetime.now(timezone.utc)
+            + timedelta(seconds=CONFIG.seat_lock_ttl_seconds),
+        )
 
-    async def book_seats(self, user_id: str, show_id: str, seat_ids: list[str]) -> int:
+    async def book_seats(
+            self,
+            user_id: str,
+            show_id: str,
+            seat_ids: list[str],
+            hold_token: str | None) -> int:
         """Book seats for a user and return a booking ID.
 
         MVP behavior:
         - Assumes payment success (dummy)
+        - Verifies the caller still holds every seat in Redis before
+          touching the DB, so losing requests never queue on row locks
         - Uses a single DB transaction via AsyncUnitOfWork
-        - Releases Redis locks only AFTER a successful DB commit
+        - Releases Redis locks only AFTER a successful DB commit, and only
+          the ones still owned by this hold
+
+        Raises:
+            HoldExpired: with the seat IDs not held under `hold_token`.
         """
 
         # --- Basic validation / parsing ---
         if not seat_ids:
             raise ValueError("seat_ids cannot be empty")
+        if not hold_token:
+            raise HoldExpired(list(seat_ids))
 
         try:
             user_id_int = int(user_id)
@@ -70,19 +168,250 @@ class BookingService(IBookingService):
             seat_id_ints = [int(s) for s in seat_ids]
         except ValueError as e:
             raise ValueError("user_id/show_id/seat_ids must be numeric strings") from e
-
-        # once the payment system triggers on the webhook we can proceed with booking
-        payment_successful = True
-        if not payment_successful:
-            raise RuntimeError("Payment failed")
+        if len(set(seat_id_ints)) != len(seat_id_ints):
+            raise ValueError("seat_ids must not contain duplicates")
 
         # Redis keys for locks (release only after commit)
-        lock_keys = [f"show:{show_id}:seat:{seat_id}" for seat_id in seat_ids]
+        owner = hold_owner(user_id, hold_token)
+        seat_keys = {seat_lock_key(show_id_int, seat_id): seat_id for seat_id in seat_id_ints}
+        lock_keys = list(seat_keys)
+
+        # Fencing: every seat must still be held by this caller
+        not_held = await self.__seat_lock_service.verify_holds(lock_keys, owner)  # type: ignore
+        if not_held:
+            raise HoldExpired([seat_keys[key] for key in not_held])
+
+        try:
+            if CONFIG.booking_group_commit:
+                booking_id = await _booking_batcher.submit(
+                    user_id=user_id_int, show_id=show_id_int, seat_ids=seat_id_ints)
+            elif CONFIG.booking_commit_engine == "cte":
+                booking_id = await self._commit_booking_single_statement(
+                    user_id=user_id_int, show_id=show_id_int, seat_ids=seat_id_ints)
+            else:
+                booking_id = await self._commit_booking(
+                    user_id=user_id_int, show_id=show_id_int, seat_ids=seat_id_ints)
+        except SeatNotAvailable as e:
+            # Holds on seats that are already sold can never be booked
+            await self.__seat_lock_service.release_holds(                         # type: ignore
+                [seat_lock_key(show_id_int, seat_id) for seat_id in e.args[0]], owner)
+            raise
+
+        # Release seat locks from redis ONLY after DB commit succeeded
+        await self.__seat_lock_service.release_holds(lock_keys, owner)            # type: ignore
+        await seat_availability.publish(show_id_int, SEAT_BOOKED, seat_id_ints)
+
+        return booking_id
+
+    async def initiate_booking(
+            self,
+            user_id: str,
+            show_id: str,
+            seat_ids: list[str],
+            hold_token: str | None) -> PaymentInitResponse:
+        """Phase one of the async payment flow.
+
+        - Records an `initiated` booking and a `pending` payment in a short
+          transaction without locking inventory rows
+        - Extends the seat holds to outlive the pending booking just before
+          that commit, so nobody else can take the seats while the user
+          pays; a refused booking leaves the holds' TTL untouched
+        - Hands the payment to the provider after the commit
+
+        The seats are booked by `confirm_payment` when the provider's
+        webhook arrives; abandoned bookings are expired by the hold reaper.
+
+        Raises:
+            HoldExpired: with the seat IDs not held under `hold_token`.
+            SeatNotAvailable: with the seat IDs already sold.
+            BookingInProgress: with the booking ID already pending for
+                `hold_token`.
+            PaymentFailed: when the provider refuses the payment.
+        """
+
+        if payment_provider is None:
+            # check_payment_config refuses to start like this
+            raise RuntimeError("no payment provider is configured")
+        if not seat_ids:
+            raise ValueError("seat_ids cannot be empty")
+        if not hold_token:
+            raise HoldExpired(list(seat_ids))
+
+        try:
+            user_id_int = int(user_id)
+            show_id_int = int(show_id)
+            seat_id_ints = [int(s) for s in seat_ids]
+        except ValueError as e:
+            raise ValueError("user_id/show_id/seat_ids must be numeric strings") from e
+        if len(set(seat_id_ints)) != len(seat_id_ints):
+            raise ValueError("seat_ids must not contain duplicates")
+
+        owner = hold_owner(user_id, hold_token)
+        seat_keys = {seat_lock_key(show_id_int, seat_id): seat_id for seat_id in seat_id_ints}
+        lock_keys = list(seat_keys)
+        not_held = await self.__seat_lock_service.verify_holds(lock_keys, owner)  # type: ignore
+        if not_held:
+            raise HoldExpired([seat_keys[key] for key in not_held])
+
+        total_amount, currency = await price_seats(show_id_int, seat_id_ints)
+        now = datetime.now(timezone.utc)
+
+        async with AsyncUnitOfWork() as uow:
+            statuses = await uow.table_inventory.get_statuses(
+                seats=[(show_id_int, seat_id) for seat_id in seat_id_ints])
+            sold = [s for s in seat_id_ints
+                    if statuses.get((show_id_int, s)) != InventoryStatus.available]
+            if sold:
+                raise SeatNotAvailable(sold)
+
+            created = await uow.table_bookings.create_initiated(
+                user_id=user_id_int,
+                show_id=show_id_int,
+                seat_ids=seat_id_ints,
+                hold_token=hold_token,
+            )
+            if created is None:
+                # A double submit: the first request's payment is the one to pay
+                pending = await uow.table_bookings.get_initiated_by_hold(hold_token)
+                raise BookingInProgress(int(pending.booking_id) if pending is not None else None)
+            booking_id = created
+
+            payment = await uow.table_payments.create(
+                booking_id=booking_id,
+                provider="upi",
+                status=PaymentStatus.pending,
+                amount=total_amount,
+                currency=currency,
+                created_at=now,
+            )
+            payment_id = int(payment.payment_id)
+
+            # Checked again by the extension itself; losing a hold now rolls back
+            not_held = await self.__seat_lock_service.extend_holds(               # type: ignore
+                lock_keys, owner, CONFIG.booking_initiated_ttl_seconds + _HOLD_GRACE_SECONDS)
+            if not_held:
+                raise HoldExpired([seat_keys[key] for key in not_held])
+            try:
+                await uow.commit()
+            except Exception:
+                # No pending booking to outlive: back to a plain hold
+                await self.__seat_lock_service.extend_holds(                      # type: ignore
+                    lock_keys, owner, CONFIG.seat_lock_ttl_seconds)
+                raise
+
+        try:
+            redirect_url = await payment_provider.create_payment(
+                payment_id=payment_id, amount=total_amount, currency=currency)
+        except Exception as e:
+            await self.confirm_payment(payment_id, succeeded=False)
+            raise PaymentFailed(payment_id) from e
+
+        return PaymentInitResponse(
+            booking_id=booking_id,
+            payment_id=payment_id,
+            status=PaymentStatus.pending,
+            provider_redirect_url=redirect_url,
+        )
+
+    async def confirm_payment(self, payment_id: int, succeeded: bool) -> BookingStatus:
+        """Phase two of the async payment flow, run by the provider webhook.
+
+        One short transaction locks the booking, then (on success) its
+        inventory rows, and confirms it with its tickets; on failure the
+        booking is cancelled. Holds are released after the commit.
+
+        Settling a booking that is no longer `initiated` (a retried webhook,
+        or a booking the reaper expired) changes nothing and returns its
+        current status.
+
+        Raises:
+            BookingNotFound: for an unknown payment.
+        """
+
+        now = datetime.now(timezone.utc)
+
+        async with AsyncUnitOfWork() as uow:
+            payment = await uow.table_payments.get(payment_id)
+            if payment is None:
+                raise BookingNotFound(f"no booking for payment {payment_id}")
+
+            # Booking first: the reaper locks bookings before their payments
+            booking = await uow.table_bookings.get_for_update(payment.booking_id)
+            if booking is None:
+                raise BookingNotFound(f"no booking for payment {payment_id}")
+
+            if booking.status != BookingStatus.initiated:
+                if succeeded and booking.status != BookingStatus.confirmed:
+                    log.warning(
+                        f"payment {payment_id} succeeded for {booking.status.value} "
+                        f"booking {booking.booking_id}: refund needed")
+                return booking.status
+
+            booking_id = int(booking.booking_id)
+            user_id = int(booking.user_id)
+            show_id = int(booking.show_id)
+            seat_ids = list(booking.seat_ids or [])
+            hold_token = booking.hold_token
+
+            unavailable: list[int] = []
+            if succeeded:
+                locked_rows = await uow.table_inventory.lock_for_update(
+                    show_id=show_id, seat_ids=seat_ids)
+                locked = {r.seat_id for r in locked_rows if r.status == InventoryStatus.available}
+                unavailable = [s for s in seat_ids if s not in locked]
+
+            if succeeded and not unavailable:
+                updated = await uow.table_inventory.mark_booked(
+                    show_id=show_id, seat_ids=seat_ids, booked_by=user_id)
+                if updated != len(seat_ids):
+                    raise RuntimeError(
+                        f"Inventory update mismatch: updated {updated}, expected {len(seat_ids)}")
+                await uow.table_summary.apply_seats_delta(show_id=show_id, delta=-len(seat_ids))
+                await uow.table_bookings.set_status(
+                    booking_id=booking_id, status=BookingStatus.confirmed, confirmed_at=now)
+                await uow.table_payments.set_status(
+                    payment_id=payment_id, status=PaymentStatus.success)
+                await uow.table_tickets.create_many(
+                    booking_id=booking_id,
+                    show_id=show_id,
+                    seat_ids=seat_ids,
+                    issued_at=now,
+                )
+                status = BookingStatus.confirmed
+            else:
+                if unavailable:
+                    # Only possible if the holds were lost (e.g. Redis flushed)
+                    log.warning(
+                        f"payment {payment_id} succeeded but seats {unavailable} of booking "
+                        f"{booking_id} are taken: refund needed")
+                await uow.table_bookings.set_status(
+                    booking_id=booking_id, status=BookingStatus.cancelled)
+                await uow.table_payments.set_status(
+                    payment_id=payment_id,
+                    status=PaymentStatus.success if succeeded else PaymentStatus.failed,
+                )
+                status = BookingStatus.cancelled
+
+            await uow.commit()
+
+        if hold_token:
+            lock_keys = [seat_lock_key(show_id, seat_id) for seat_id in seat_ids]
+            await self.__seat_lock_service.release_holds(                         # type: ignore
+                lock_keys, hold_owner(user_id, hold_token))
 
-        # Dummy pricing for now (replace with pricing lookup later)
-        price_per_seat = 250
-        total_amount = price_per_seat * len(seat_id_ints)
-        currency = "INR"
+        if status == BookingStatus.confirmed:
+            await seat_availability.publish(show_id, SEAT_BOOKED, seat_ids)
+        else:
+            released = [s for s in seat_ids if s not in unavailable]
+            if released:
+                await seat_availability.publish(show_id, SEAT_RELEASED, released)
+
+        return status
+
+    async def _commit_booking(self, *, user_id: int, show_id: int, seat_ids: list[int]) -> int:
+        """Book seats in a transaction of its own and return the booking ID."""
+
+        total_amount, currency = await price_seats(show_id, seat_ids)
         now = datetime.now(timezone.utc)
 
         booking_id: int
@@ -90,19 +419,19 @@ class BookingService(IBookingService):
         async with AsyncUnitOfWork() as uow:
             # 1) Concurrency-safe lock on inventory rows
             # we need to check with the (show_id + seat_id) as the primary_key
-            locked_rows = await uow.table_inventory.lock_for_update(show_id=show_id_int, seat_ids=seat_id_ints)
+            locked_rows = await uow.table_inventory.lock_for_update(show_id=show_id, seat_ids=seat_ids)
 
-            if len(locked_rows) != len(seat_id_ints):
+            if len(locked_rows) != len(seat_ids):
                 raise RuntimeError("One or more seats not found in inventories")
 
             unavailable = [r.seat_id for r in locked_rows if r.status != InventoryStatus.available]
             if unavailable:
-                raise RuntimeError(f"Some seats are not available: {unavailable}")
+                raise SeatNotAvailable(unavailable)
 
             # 2) Create booking (confirmed)
             booking = await uow.table_bookings.create(
-                user_id=user_id_int,
-                show_id=show_id_int,
+                user_id=user_id,
+                show_id=show_id,
                 status=BookingStatus.confirmed,
                 confirmed_at=now,
             )
@@ -120,24 +449,216 @@ class BookingService(IBookingService):
 
             # 4) Mark inventories booked
             updated = await uow.table_inventory.mark_booked(
-                show_id=show_id_int, seat_ids=seat_id_ints, booked_by=user_id_int)
-            if updated != len(seat_id_ints):
+                show_id=show_id, seat_ids=seat_ids, booked_by=user_id)
+            if updated != len(seat_ids):
                 raise RuntimeError(
-                    f"Inventory update mismatch: updated {updated}, expected {len(seat_id_ints)}")
+                    f"Inventory update mismatch: updated {updated}, expected {len(seat_ids)}")
+            await uow.table_summary.apply_seats_delta(show_id=show_id, delta=-len(seat_ids))
 
             # 5) Create tickets
             await uow.table_tickets.create_many(
                 booking_id=booking_id,
-                show_id=show_id_int,
-                seat_ids=seat_id_ints,
+                show_id=show_id,
+                seat_ids=seat_ids,
                 issued_at=now,
             )
 
             # 6) Commit all changes
             await uow.commit()
 
-        # Release seat locks from redis ONLY after DB commit succeeded
-        if lock_keys:
-            await redis_client.delete(*lock_keys)  # type: ignore
-
         return booking_id
+
+    async def _commit_booking_single_statement(
+            self,
+            *,
+            user_id: int,
+            show_id: int,
+            seat_ids: list[int]) -> int:
+        """Book seats with one chained-CTE statement (one DB round trip + commit)."""
+
+        total_amount, currency = await price_seats(show_id, seat_ids)
+        now = datetime.now(timezone.utc)
+
+        async with AsyncUnitOfWork() as uow:
+            result = await uow.table_checkout.commit_booking(
+                user_id=user_id,
+                show_id=show_id,
+                seat_ids=seat_ids,
+                amount=total_amount,
+                currency=currency,
+                provider="upi",
+                now=now,
+            )
+            if result.booking_id is None:
+                locked = set(result.locked_seat_ids)
+                raise SeatNotAvailable([s for s in seat_ids if s not in locked])
+
+            await uow.commit()
+
+        return result.booking_id
+
+
+# Seat holds of a pending booking outlive it, so the reaper expires the
+# booking before its seats can be held by someone else
+_HOLD_GRACE_SECONDS = 60
+
+
+async def _settle_payment(payment_id: int, succeeded: bool) -> None:
+    await BookingService().confirm_payment(payment_id, succeeded)
+
+
+if isinstance(payment_provider, StubPaymentProvider):
+    payment_provider.on_settled(_settle_payment)
+
+
+@dataclass
+class _PendingBooking:
+    user_id: int
+    seat_ids: list[int]
+    amount: int
+    currency: str
+    result: asyncio.Future[int]
+
+
+class BookingBatcher:
+    """Group commit for `book_seats`.
+
+    Requests for the same show that arrive within `booking_batch_window_ms`
+    are committed together: the union of their seats is locked once, seat
+    conflicts are resolved in memory (first come, first served) and every
+    winning booking, payment, inventory update and ticket is written with
+    multi-row statements in a single transaction. Each caller still gets
+    its own booking ID, or its own exception.
+    """
+
+    def __init__(self, window_ms: int, max_size: int) -> None:
+        self._window = window_ms / 1000
+        self._max_size = max_size
+        self._queues: dict[int, list[_PendingBooking]] = {}
+        self._flushers: dict[int, asyncio.Task[None]] = {}
+
+    async def submit(self, *, user_id: int, show_id: int, seat_ids: list[int]) -> int:
+        # Priced up front: nothing but the writes runs under the batch's locks
+        amount, currency = await price_seats(show_id, seat_ids)
+        pending = _PendingBooking(
+            user_id=user_id,
+            seat_ids=seat_ids,
+            amount=amount,
+            currency=currency,
+            result=asyncio.get_running_loop().create_future(),
+        )
+        queue = self._queues.setdefault(show_id, [])
+        queue.append(pending)
+
+        if len(queue) >= self._max_size:
+            self._cancel_flusher(show_id)
+            self._spawn(show_id, delay=0)
+        elif show_id not in self._flushers:
+            self._spawn(show_id, delay=self._window)
+
+        return await pending.result
+
+    def _spawn(self, show_id: int, *, delay: float) -> None:
+        batch = self._queues.pop(show_id) if delay == 0 else None
+        task = asyncio.create_task(self._flush(show_id, delay, batch))
+        if batch is None:
+            self._flushers[show_id] = task
+
+    def _cancel_flusher(self, show_id: int) -> None:
+        task = self._flushers.pop(show_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _flush(self, show_id: int, delay: float, batch: list[_PendingBooking] | None) -> None:
+        if batch is None:
+            await asyncio.sleep(delay)
+            self._flushers.pop(show_id, None)
+            batch = self._queues.pop(show_id, [])
+        if not batch:
+            return
+
+        try:
+            await self._commit(show_id, batch)
+        except Exception as e:
+            for pending in batch:
+                if not pending.result.done():
+                    pending.result.set_exception(e)
+
+    async def _commit(self, show_id: int, batch: list[_PendingBooking]) -> None:
+        now = datetime.now(timezone.utc)
+        all_seats = sorted({seat_id for pending in batch for seat_id in pending.seat_ids})
+
+        async with AsyncUnitOfWork() as uow:
+            locked_rows = await uow.table_inventory.lock_for_update(show_id=show_id, seat_ids=all_seats)
+            available = {r.seat_id for r in locked_rows if r.status == InventoryStatus.available}
+
+            # Resolve conflicts in arrival order
+            winners: list[_PendingBooking] = []
+            taken: set[int] = set()
+            for pending in batch:
+                seats = set(pending.seat_ids)
+                lost = sorted((seats - available) | (seats & taken))
+                if lost:
+                    if not pending.result.done():
+                        pending.result.set_exception(SeatNotAvailable(lost))
+                    continue
+                taken |= seats
+                winners.append(pending)
+
+            if not winners:
+                return
+
+            booking_ids = await uow.table_bookings.create_many(
+                rows=[
+                    {
+                        "user_id": pending.user_id,
+                        "show_id": show_id,
+                        "status": BookingStatus.confirmed,
+                        "confirmed_at": now,
+                    }
+                    for pending in winners
+                ],
+            )
+
+            payments = []
+            for booking_id, pending in zip(booking_ids, winners):
+                payments.append({
+                    "booking_id": booking_id,
+                    "provider": "upi",
+                    "status": PaymentStatus.success,
+                    "amount": pending.amount,
+                    "currency": pending.currency,
+                    "created_at": now,
+                })
+            await uow.table_payments.create_many(rows=payments)
+
+            booked_by = {seat_id: pending.user_id for pending in winners for seat_id in pending.seat_ids}
+            updated = await uow.table_inventory.mark_booked_many(show_id=show_id, booked_by=booked_by)
+            if updated != len(booked_by):
+                raise RuntimeError(
+                    f"Inventory update mismatch: updated {updated}, expected {len(booked_by)}")
+            await uow.table_summary.apply_seats_delta(show_id=show_id, delta=-len(booked_by))
+
+            await uow.table_tickets.create_for_bookings(
+                show_id=show_id,
+                seats_by_booking={
+                    booking_id: pending.seat_ids
+                    for booking_id, pending in zip(booking_ids, winners)
+                },
+                issued_at=now,
+            )
+
+            await uow.commit()
+
+        for booking_id, pending in zip(booking_ids, winners):
+            if not pending.result.done():
+                pending.result.set_result(booking_id)
+
+
+_booking_batcher = BookingBatcher(
+    window_ms=CONFIG.booking_batch_window_ms,
+    max_size=CONFIG.booking_batch_max_size,
+)
+
+
+instrument_class(BookingService, "service.bookings")
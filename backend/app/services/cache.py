@@ -0,0 +1,181 @@
+"""Two-level read-through cache: in-process LRU with TTL in front of Redis.
+
+- Local hits cost a dict lookup; misses go to Redis, then to the loader.
+- Concurrent misses for the same key in a worker share one loader call,
+  so an expired hot key cannot stampede the database.
+- `invalidate_all()` bumps a generation counter in Redis, drops the Redis
+  entries and tells every worker (via a Redis channel) to clear its local
+  entries. Redis entries carry the generation they were loaded under: a
+  loader that started before an invalidation, in any worker, can neither
+  write its value back (the write is a compare-and-set on the generation)
+  nor have it read as current.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+from ..config import log
+from ..db.sessions import redis_client
+
+__all__ = ["TwoLevelCache"]
+
+T = TypeVar("T")
+
+# Store an entry only if no invalidation happened since it was loaded.
+#
+# KEYS[1]: generation, KEYS[2]: entry, KEYS[3]: key set
+# ARGV[1]: generation the entry was loaded under, ARGV[2]: entry, ARGV[3]: TTL (s)
+_STORE_LUA = """
+if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[3], KEYS[2])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return 1
+"""
+
+
+class TwoLevelCache(Generic[T]):
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl_seconds: int,
+        max_entries: int,
+        dumps: Callable[[T], str],
+        loads: Callable[[str], T],
+    ) -> None:
+        self.namespace = namespace
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._dumps = dumps
+        self._loads = loads
+        self._local: "OrderedDict[Tuple[Hashable, ...], Tuple[float, T]]" = OrderedDict()
+        self._inflight: dict[Tuple[Hashable, ...], asyncio.Future[T]] = {}
+        # Bumped on invalidation so loads started before it are not stored
+        self._generation = 0
+        self._store_script = redis_client.register_script(_STORE_LUA)
+
+    @property
+    def _channel(self) -> str:
+        return f"{self.namespace}:invalidate"
+
+    @property
+    def _key_set(self) -> str:
+        return f"{self.namespace}:keys"
+
+    @property
+    def _generation_key(self) -> str:
+        # Shared by all workers; never expires, so it only moves forward
+        return f"{self.namespace}:generation"
+
+    def _redis_key(self, key: Tuple[Hashable, ...]) -> str:
+        return ":".join([self.namespace, *map(str, key)])
+
+    async def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[T]]) -> T:
+        entry = self._local.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                return value
+            del self._local[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, loader)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters (if any) re-raise it themselves
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[T]]) -> T:
+        generation = self._generation
+        redis_key = self._redis_key(key)
+
+        # Redis generation at read time; None when Redis could not be read
+        shared_generation: Optional[str] = None
+        cached: Optional[str] = None
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(self._generation_key)
+                pipe.get(redis_key)
+                raw_generation, raw = await pipe.execute()
+            shared_generation = raw_generation or "0"
+            if raw is not None:
+                entry_generation, _, payload = raw.partition(":")
+                # Entries of an earlier generation were invalidated
+                if entry_generation == shared_generation:
+                    cached = payload
+        except Exception as e:
+            log.warning(f"{self.namespace} cache: redis read failed: {e!r}")
+
+        if cached is not None:
+            value = self._loads(cached)
+        else:
+            value = await loader()
+            if shared_generation is not None and generation == self._generation:
+                try:
+                    await self._store_script(
+                        keys=[self._generation_key, redis_key, self._key_set],
+                        args=[shared_generation, f"{shared_generation}:{self._dumps(value)}", self._ttl],
+                    )
+                except Exception as e:
+                    log.warning(f"{self.namespace} cache: redis write failed: {e!r}")
+
+        if generation == self._generation:
+            self._store_local(key, value)
+        return value
+
+    def _store_local(self, key: Tuple[Hashable, ...], value: T) -> None:
+        self._local[key] = (time.monotonic() + self._ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    def clear_local(self) -> None:
+        self._generation += 1
+        self._local.clear()
+
+    async def invalidate_all(self) -> None:
+        """Drop every entry, in Redis and in all workers."""
+        self.clear_local()
+        # First: loads in flight anywhere can no longer store their value
+        await redis_client.incr(self._generation_key)
+        keys = await redis_client.smembers(self._key_set)  # type: ignore
+        await redis_client.delete(self._key_set, *keys)
+        await redis_client.publish(self._channel, "all")  # type: ignore
+
+    async def listen(self) -> None:
+        """Clear local entries on invalidation messages until cancelled."""
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                # Anything published while unsubscribed is lost
+                self.clear_local()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.clear_local()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"{self.namespace} cache: invalidation subscription lost: {e!r}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
@@ -0,0 +1,125 @@
+"""Idempotency-Key support: replay the stored response of a repeated request.
+
+The first request with a given (user, key) claims a Redis record with
+SET NX and runs; its final response is then stored on the record.
+Duplicates get that response back, or poll until the in-flight original
+finishes. A retried booking thus costs one Redis lookup instead of a
+contended transaction that would fail with "not available".
+
+Server errors are not stored: the record is dropped so a retry can run
+again (book_seats is fenced by the seat holds, so a re-run is safe).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import CONFIG
+from ..db.sessions import redis_client
+
+__all__ = [
+    "IdempotencyConflict",
+    "IdempotencyInProgress",
+    "StoredResponse",
+    "IdempotencyStore",
+    "idempotency_store",
+    "request_fingerprint",
+]
+
+_PENDING = "pending"
+_DONE = "done"
+
+# Poll intervals (s) while waiting for an in-flight original
+_POLL_START = 0.05
+_POLL_MAX = 0.5
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used with a different request payload."""
+
+
+class IdempotencyInProgress(Exception):
+    """The original request is still running after the wait timeout."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: str
+    headers: dict[str, str]
+
+
+def request_fingerprint(payload: str) -> str:
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, *, namespace: str, pending_ttl_seconds: int, ttl_seconds: int, wait_seconds: float) -> None:
+        self._namespace = namespace
+        self._pending_ttl = pending_ttl_seconds
+        self._ttl = ttl_seconds
+        self._wait = wait_seconds
+
+    def _key(self, user_id: str, key: str) -> str:
+        return f"idem:{self._namespace}:{user_id}:{key}"
+
+    async def begin(self, user_id: str, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """Claim the key, or return the response stored for it.
+
+        Returns None when the caller owns the key and must run the request
+        (then `complete()` or `abandon()` it). Raises IdempotencyConflict /
+        IdempotencyInProgress.
+        """
+        redis_key = self._key(user_id, key)
+        claim = json.dumps({"state": _PENDING, "fingerprint": fingerprint})
+        if await redis_client.set(redis_key, claim, nx=True, ex=self._pending_ttl):
+            return None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait
+        delay = _POLL_START
+        while True:
+            raw = await redis_client.get(redis_key)
+            if raw is None:
+                # Original abandoned (server error / expired claim): take over
+                if await redis_client.set(redis_key, claim, nx=True, ex=self._pending_ttl):
+                    return None
+                continue
+
+            record = json.loads(raw)
+            if record["fingerprint"] != fingerprint:
+                raise IdempotencyConflict(key)
+            if record["state"] == _DONE:
+                return StoredResponse(record["status_code"], record["body"], record["headers"])
+
+            if loop.time() >= deadline:
+                raise IdempotencyInProgress(key)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_MAX)
+
+    async def complete(self, user_id: str, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """Store the final response of the request that owns the key."""
+        record = {
+            "state": _DONE,
+            "fingerprint": fingerprint,
+            "status_code": response.status_code,
+            "body": response.body,
+            "headers": response.headers,
+        }
+        await redis_client.set(self._key(user_id, key), json.dumps(record), ex=self._ttl)
+
+    async def abandon(self, user_id: str, key: str) -> None:
+        """Release the claim without a stored response so a retry runs again."""
+        await redis_client.delete(self._key(user_id, key))
+
+
+idempotency_store = IdempotencyStore(
+    namespace="book",
+    pending_ttl_seconds=CONFIG.idempotency_pending_ttl_seconds,
+    ttl_seconds=CONFIG.idempotency_ttl_seconds,
+    wait_seconds=CONFIG.idempotency_wait_seconds,
+)
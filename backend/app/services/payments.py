@@ -0,0 +1,113 @@
+"""Payment providers and webhook signatures.
+
+POST /book (in `booking_payment_mode="async"`) only records an `initiated`
+booking and a `pending` payment, then hands the payment to the provider.
+The provider reports the outcome later on POST /payments/webhook, signed
+with `CONFIG.payment_webhook_secret`, and `BookingService.confirm_payment`
+settles the booking. No row lock is held while the provider is working.
+
+`StubPaymentProvider` stands in for a real provider locally and in tests
+(only with `CONFIG.payment_stub_enabled`): it settles every payment
+successfully after `payment_stub_delay_ms`, or waits for
+POST /payments/stub/{payment_id} when auto-complete is off. Without it no
+provider is configured, and `check_payment_config` refuses to start the
+app in async mode.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+from ..config import CONFIG, log
+
+__all__ = [
+    "IPaymentProvider",
+    "StubPaymentProvider",
+    "check_payment_config",
+    "payment_provider",
+    "sign_webhook",
+    "verify_webhook_signature",
+]
+
+# (payment_id, succeeded) -> settles the booking of the payment
+SettleCallback = Callable[[int, bool], Awaitable[None]]
+
+
+def sign_webhook(body: bytes, secret: Optional[str] = None) -> str:
+    """Hex HMAC-SHA256 of a webhook body."""
+    key = secret or CONFIG.payment_webhook_secret
+    if not key:
+        raise ValueError("payment_webhook_secret is not configured")
+    return hmac.new(key.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_webhook_signature(body: bytes, signature: Optional[str], secret: Optional[str] = None) -> bool:
+    """False for a missing / wrong signature, and always without a secret."""
+    if not signature or not (secret or CONFIG.payment_webhook_secret):
+        return False
+    return hmac.compare_digest(sign_webhook(body, secret), signature)
+
+
+class IPaymentProvider(ABC):
+    @abstractmethod
+    async def create_payment(self, *, payment_id: int, amount: int, currency: str) -> Optional[str]:
+        """Start collecting a payment; return the URL to send the user to, if any."""
+        raise NotImplementedError
+
+
+class StubPaymentProvider(IPaymentProvider):
+    def __init__(self, *, auto_complete: bool, delay_ms: int) -> None:
+        self._auto_complete = auto_complete
+        self._delay = delay_ms / 1000
+        self._settle: Optional[SettleCallback] = None
+        # Keeps pending settlements referenced until they finish
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def on_settled(self, callback: SettleCallback) -> None:
+        """Register what the stub calls in place of a webhook delivery."""
+        self._settle = callback
+
+    async def create_payment(self, *, payment_id: int, amount: int, currency: str) -> Optional[str]:
+        if self._auto_complete:
+            task = asyncio.create_task(self._complete_later(payment_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return f"{CONFIG.api_v1_str}/payments/stub/{payment_id}"
+
+    async def complete(self, payment_id: int, succeeded: bool = True) -> None:
+        if self._settle is None:
+            raise RuntimeError("stub payment provider has no settle callback")
+        await self._settle(payment_id, succeeded)
+
+    async def _complete_later(self, payment_id: int) -> None:
+        await asyncio.sleep(self._delay)
+        try:
+            await self.complete(payment_id)
+        except Exception as e:
+            log.warning(f"stub payment provider: settling payment {payment_id} failed: {e!r}")
+
+
+# None until a real provider is integrated, unless the stub is enabled
+payment_provider: Optional[IPaymentProvider] = (
+    StubPaymentProvider(
+        auto_complete=CONFIG.payment_stub_auto_complete,
+        delay_ms=CONFIG.payment_stub_delay_ms,
+    )
+    if CONFIG.payment_stub_enabled
+    else None
+)
+
+
+def check_payment_config() -> None:
+    """Fail fast when async bookings are enabled without a payment provider."""
+    if CONFIG.booking_payment_mode not in ("inline", "async"):
+        raise RuntimeError(
+            f"booking_payment_mode must be 'inline' or 'async', not {CONFIG.booking_payment_mode!r}")
+    if CONFIG.booking_payment_mode == "async" and payment_provider is None:
+        raise RuntimeError(
+            "booking_payment_mode=async needs a payment provider: none is configured "
+            "(set payment_stub_enabled=true for local development)")
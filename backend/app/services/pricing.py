@@ -0,0 +1,130 @@
+"""Seat prices of a show, served from memory.
+
+A show's price table is loaded with one query the first time the show is
+priced: the section of every seat, the price of every priced section and,
+for seats of unpriced sections, their own `inventories.price`. Pricing a
+booking is then a dict lookup per seat, done before the booking transaction
+opens so no query runs while inventory rows are locked.
+
+Tables are cached per show in a TwoLevelCache and dropped by a commit hook
+whenever `PricingsRepo.upsert` changes a show's pricing.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from ..config import CONFIG
+from ..domain.errors import SeatNotAvailable
+from ..repositories.hooks import TOPIC_PRICING, on_commit
+from ..repositories.uow import AsyncUnitOfWork
+from .cache import TwoLevelCache
+
+__all__ = ["ShowPriceTable", "price_seats", "price_table_cache", "get_price_table"]
+
+
+@dataclass(frozen=True)
+class ShowPriceTable:
+    show_id: int
+    # section_id -> (amount, currency) from show_pricings
+    section_prices: dict[int, tuple[int, str]]
+    # seat_id -> section_id
+    seat_sections: dict[int, int]
+    # seat_id -> (amount, currency) for seats whose section is not priced
+    seat_prices: dict[int, tuple[int, str]]
+
+    @classmethod
+    def from_rows(cls, show_id: int, rows: Iterable[Any]) -> "ShowPriceTable":
+        section_prices: dict[int, tuple[int, str]] = {}
+        seat_sections: dict[int, int] = {}
+        seat_prices: dict[int, tuple[int, str]] = {}
+        for seat_id, section_id, seat_amount, seat_currency, section_amount, section_currency in rows:
+            seat_sections[seat_id] = section_id
+            if section_amount is not None:
+                section_prices[section_id] = (section_amount, section_currency)
+            else:
+                seat_prices[seat_id] = (seat_amount, seat_currency)
+        return cls(show_id, section_prices, seat_sections, seat_prices)
+
+    def price_of(self, seat_id: int) -> tuple[int, str] | None:
+        section_id = self.seat_sections.get(seat_id)
+        if section_id is None:
+            return None
+        return self.section_prices.get(section_id) or self.seat_prices.get(seat_id)
+
+    def total(self, seat_ids: Iterable[int]) -> tuple[int, str]:
+        """Total price and currency of some seats of the show.
+
+        Raises:
+            SeatNotAvailable: with the seat IDs that are not part of the show.
+            ValueError: if the seats are priced in different currencies.
+        """
+        total = 0
+        currencies: set[str] = set()
+        unknown: list[int] = []
+        for seat_id in seat_ids:
+            price = self.price_of(seat_id)
+            if price is None:
+                unknown.append(seat_id)
+                continue
+            total += price[0]
+            currencies.add(price[1])
+
+        if unknown:
+            raise SeatNotAvailable(unknown)
+        if len(currencies) > 1:
+            raise ValueError(f"seats of show {self.show_id} are priced in {sorted(currencies)}")
+        return total, currencies.pop() if currencies else "INR"
+
+
+def _dump_price_table(table: ShowPriceTable) -> str:
+    return json.dumps({
+        "show_id": table.show_id,
+        "sections": {str(k): list(v) for k, v in table.section_prices.items()},
+        "seat_sections": {str(k): v for k, v in table.seat_sections.items()},
+        "seats": {str(k): list(v) for k, v in table.seat_prices.items()},
+    })
+
+
+def _load_price_table(raw: str) -> ShowPriceTable:
+    data = json.loads(raw)
+    return ShowPriceTable(
+        show_id=data["show_id"],
+        section_prices={int(k): (v[0], v[1]) for k, v in data["sections"].items()},
+        seat_sections={int(k): v for k, v in data["seat_sections"].items()},
+        seat_prices={int(k): (v[0], v[1]) for k, v in data["seats"].items()},
+    )
+
+
+price_table_cache: TwoLevelCache[ShowPriceTable] = TwoLevelCache(
+    "price_table:v1",
+    ttl_seconds=CONFIG.price_table_ttl_seconds,
+    max_entries=CONFIG.price_table_max_entries,
+    dumps=_dump_price_table,
+    loads=_load_price_table,
+)
+
+
+async def _invalidate_price_tables(_: set[Any]) -> None:
+    # Pricing changes are rare admin writes; dropping every table is simpler
+    # than tracking keys and costs one query per show priced afterwards
+    await price_table_cache.invalidate_all()
+
+
+on_commit(TOPIC_PRICING, _invalidate_price_tables)
+
+
+async def get_price_table(show_id: int) -> ShowPriceTable:
+    async def load() -> ShowPriceTable:
+        async with AsyncUnitOfWork() as uow:
+            rows = await uow.table_pricing.get_seat_prices(show_id)
+        return ShowPriceTable.from_rows(show_id, rows)
+
+    return await price_table_cache.get_or_load((show_id,), load)
+
+
+async def price_seats(show_id: int, seat_ids: Iterable[int]) -> tuple[int, str]:
+    """Total price and currency of seats of a show (see ShowPriceTable.total)."""
+    return (await get_price_table(show_id)).total(seat_ids)
@@ -0,0 +1,168 @@
+"""Token-bucket rate limiting of the booking endpoints, per user and per show.
+
+The authoritative buckets live in Redis and are checked (and charged) for
+all of a request's keys by one Lua script, so the user and show limits are
+applied atomically in one round trip.
+
+Each worker also keeps a local copy of every bucket it has seen, charged
+only for requests Redis allowed. A worker's own admitted traffic is a
+lower bound of the global one, so when the local bucket is empty the
+Redis bucket is too and the request is rejected without a round trip;
+after a Redis rejection the key is blocked locally until its retry time.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Sequence
+
+from ..config import log
+from ..db.sessions import redis_client
+
+__all__ = ["Bucket", "RateLimitDecision", "TokenBucketLimiter", "rate_limiter"]
+
+# KEYS: bucket keys
+# ARGV: rate (tokens / s) and burst for each key, in KEYS order
+#
+# Takes one token from every bucket if all of them have one. Returns
+# {1, 0} when allowed, otherwise {0, retry_after_ms, index of the first
+# empty bucket (1-based)} and nothing is charged.
+_TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tokens = {}
+local wait = 0
+local blocking = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local level = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    level = math.min(burst, level + (now - ts) * rate / 1000)
+    tokens[i] = level
+    if level < 1 then
+        local need = math.ceil((1 - level) * 1000 / rate)
+        if need > wait then
+            wait = need
+            blocking = i
+        end
+    end
+end
+if blocking > 0 then
+    return {0, wait, blocking}
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(burst * 1000 / rate) + 1000)
+end
+return {1, 0}
+"""
+
+# Local buckets / blocks kept per worker
+_LOCAL_MAX_KEYS = 10_000
+
+
+@dataclass(frozen=True)
+class Bucket:
+    scope: str  # "user" | "show"; used for reject counters
+    key: str
+    rate: float  # tokens per second
+    burst: int
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after_seconds: int = 0
+    scope: str = ""
+
+
+class _LocalBucket:
+    __slots__ = ("tokens", "ts", "blocked_until")
+
+    def __init__(self, burst: int, now: float) -> None:
+        self.tokens = float(burst)
+        self.ts = now
+        self.blocked_until = 0.0
+
+    def level(self, bucket: Bucket, now: float) -> float:
+        self.tokens = min(bucket.burst, self.tokens + (now - self.ts) * bucket.rate)
+        self.ts = now
+        return self.tokens
+
+
+class TokenBucketLimiter:
+    def __init__(self) -> None:
+        self._script = redis_client.register_script(_TOKEN_BUCKET_LUA)
+        self._local: "OrderedDict[str, _LocalBucket]" = OrderedDict()
+        # scope -> counter
+        self.allowed = 0
+        self.rejected_local: dict[str, int] = {}
+        self.rejected_redis: dict[str, int] = {}
+        self.redis_errors = 0
+
+    def _local_bucket(self, bucket: Bucket, now: float) -> _LocalBucket:
+        local = self._local.get(bucket.key)
+        if local is None:
+            local = self._local[bucket.key] = _LocalBucket(bucket.burst, now)
+            while len(self._local) > _LOCAL_MAX_KEYS:
+                self._local.popitem(last=False)
+        else:
+            self._local.move_to_end(bucket.key)
+        return local
+
+    def _reject(self, counters: dict[str, int], scope: str, retry_after: float) -> RateLimitDecision:
+        counters[scope] = counters.get(scope, 0) + 1
+        return RateLimitDecision(False, max(1, math.ceil(retry_after)), scope)
+
+    async def acquire(self, buckets: Sequence[Bucket]) -> RateLimitDecision:
+        """Take one token from every bucket, or none if any of them is empty."""
+        now = time.monotonic()
+        locals_ = [self._local_bucket(bucket, now) for bucket in buckets]
+
+        for bucket, local in zip(buckets, locals_):
+            if local.blocked_until > now:
+                return self._reject(self.rejected_local, bucket.scope, local.blocked_until - now)
+            if local.level(bucket, now) < 1:
+                return self._reject(
+                    self.rejected_local, bucket.scope, (1 - local.tokens) / bucket.rate)
+
+        args: list[float | int] = []
+        for bucket in buckets:
+            args += [bucket.rate, bucket.burst]
+        try:
+            result = await self._script(keys=[bucket.key for bucket in buckets], args=args)
+        except Exception as e:
+            # Fail open: the limiter must not take booking down with Redis
+            self.redis_errors += 1
+            log.warning(f"rate limiter: redis check failed: {e!r}")
+            return RateLimitDecision(True)
+
+        if int(result[0]) == 1:
+            self.allowed += 1
+            for local in locals_:
+                local.tokens -= 1
+            return RateLimitDecision(True)
+
+        retry_after = int(result[1]) / 1000
+        blocking = int(result[2]) - 1
+        locals_[blocking].blocked_until = now + retry_after
+        return self._reject(self.rejected_redis, buckets[blocking].scope, retry_after)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "allowed": self.allowed,
+            "rejected_local": dict(self.rejected_local),
+            "rejected_redis": dict(self.rejected_redis),
+            "redis_errors": self.redis_errors,
+            "local_keys": len(self._local),
+        }
+
+
+rate_limiter = TokenBucketLimiter()
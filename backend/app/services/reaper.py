@@ -0,0 +1,271 @@
+"""Background reaper for seat holds and abandoned bookings.
+
+Seat holds expire through their Redis TTL, which nobody hears about: the
+availability bitmaps keep showing the seats as held. The reaper
+
+- listens to Redis `expired` keyspace events and, as a fallback for missed
+  events, sweeps `HOLD_EXPIRY_INDEX` in batches for holds past their expiry;
+- checks the seats of expired holds against `inventories` and publishes
+  `SEAT_RELEASED` (or `SEAT_BOOKED` when a booking committed but its
+  publish was lost);
+- drops holds left on seats that are already sold (e.g. `book_seats`
+  crashed between the DB commit and the hold release);
+- expires bookings stuck in `initiated`, fails their pending payments and
+  releases the seat holds they were waiting on.
+
+Every expired hold is claimed with a ZREM from the index, so several
+reapers (one per API worker, or a standalone `python -m
+app.services.reaper`) never publish the same release twice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from ..config import CONFIG, log
+from ..db.models import InventoryStatus
+from ..db.sessions import redis_client
+from ..repositories.uow import AsyncUnitOfWork
+from .availability import SEAT_BOOKED, SEAT_RELEASED, seat_availability
+from .seat_lock import (
+    HOLD_EXPIRY_INDEX,
+    RedisSeatLockService,
+    hold_owner,
+    parse_seat_lock_key,
+    seat_lock_key,
+)
+
+__all__ = ["HoldReaper", "hold_reaper"]
+
+# Claim holds that are gone from Redis: a key is claimed by whoever removes
+# it from the expiry index.
+#
+# KEYS[1]: HOLD_EXPIRY_INDEX
+# KEYS[2..]: candidate seat lock keys
+#
+# Returns the claimed keys.
+_CLAIM_EXPIRED_LUA = """
+local claimed = {}
+for i = 2, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 0 and redis.call('ZREM', KEYS[1], KEYS[i]) == 1 then
+        claimed[#claimed + 1] = KEYS[i]
+    end
+end
+return claimed
+"""
+
+# Drop holds on seats that are already sold, whoever owns them.
+#
+# KEYS[1]: HOLD_EXPIRY_INDEX
+# KEYS[2..]: seat lock keys
+#
+# Returns the keys removed from the index.
+_DROP_HOLDS_LUA = """
+local dropped = {}
+for i = 2, #KEYS do
+    redis.call('DEL', KEYS[i])
+    if redis.call('ZREM', KEYS[1], KEYS[i]) == 1 then
+        dropped[#dropped + 1] = KEYS[i]
+    end
+end
+return dropped
+"""
+
+
+def _seats(keys: Iterable[str]) -> list[tuple[int, int]]:
+    seats = []
+    for key in keys:
+        seat = parse_seat_lock_key(key)
+        if seat is not None:
+            seats.append(seat)
+    return seats
+
+
+def _by_show(seats: Iterable[tuple[int, int]]) -> dict[int, list[int]]:
+    grouped: dict[int, list[int]] = defaultdict(list)
+    for show_id, seat_id in seats:
+        grouped[show_id].append(seat_id)
+    return grouped
+
+
+class HoldReaper:
+    def __init__(self, *, interval_seconds: int, batch_size: int, booking_ttl_seconds: int) -> None:
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._booking_ttl = timedelta(seconds=booking_ttl_seconds)
+        self._claim_script = redis_client.register_script(_CLAIM_EXPIRED_LUA)
+        self._drop_script = redis_client.register_script(_DROP_HOLDS_LUA)
+        self._seat_locks = RedisSeatLockService()
+        # ZSCAN position of the sold-seat check; it walks the index across sweeps
+        self._scan_cursor = 0
+
+    async def run(self) -> None:
+        """Listen for expirations and sweep periodically until cancelled."""
+        await asyncio.gather(self._watch_expirations(), self._sweep_forever())
+
+    async def sweep(self) -> None:
+        """One reconciliation pass over Redis holds and pending bookings."""
+        now, _ = await redis_client.time()  # type: ignore[misc]
+        while True:
+            keys = await redis_client.zrangebyscore(
+                HOLD_EXPIRY_INDEX, "-inf", now, start=0, num=self._batch_size)
+            claimed = await self.release_expired(keys) if keys else 0
+            # Stop when nothing more can be claimed (e.g. keys still alive)
+            if len(keys) < self._batch_size or not claimed:
+                break
+
+        await self._drop_sold_holds()
+        await self.expire_bookings()
+
+    async def release_expired(self, keys: list[str]) -> int:
+        """Return the seats of expired seat lock keys to sale.
+
+        Returns how many of `keys` this reaper claimed.
+        """
+        claimed = await self._claim_script(keys=[HOLD_EXPIRY_INDEX, *keys])
+        seats = _seats(claimed or [])
+        if not seats:
+            return len(claimed or [])
+
+        async with AsyncUnitOfWork() as uow:
+            statuses = await uow.table_inventory.get_statuses(seats=seats)
+
+        sold = [seat for seat in seats if statuses.get(seat) == InventoryStatus.not_available]
+        unsold = [seat for seat in seats if statuses.get(seat) != InventoryStatus.not_available]
+
+        # A seat may have been held again since its key expired
+        if unsold:
+            current = await redis_client.mget([seat_lock_key(*seat) for seat in unsold])
+            unsold = [seat for seat, owner in zip(unsold, current) if owner is None]
+
+        for show_id, seat_ids in _by_show(unsold).items():
+            await seat_availability.publish(show_id, SEAT_RELEASED, seat_ids)
+        for show_id, seat_ids in _by_show(sold).items():
+            await seat_availability.publish(show_id, SEAT_BOOKED, seat_ids)
+
+        if unsold or sold:
+            log.info(f"hold reaper: released {len(unsold)} seat(s), {len(sold)} already sold")
+        return len(claimed)
+
+    async def _drop_sold_holds(self) -> None:
+        cursor, entries = await redis_client.zscan(
+            HOLD_EXPIRY_INDEX, cursor=self._scan_cursor, count=self._batch_size)
+        self._scan_cursor = cursor
+        seats = _seats(key for key, _ in entries)
+        if not seats:
+            return
+
+        async with AsyncUnitOfWork() as uow:
+            statuses = await uow.table_inventory.get_statuses(seats=seats)
+
+        sold = [seat for seat in seats if statuses.get(seat) == InventoryStatus.not_available]
+        if not sold:
+            return
+
+        dropped = await self._drop_script(
+            keys=[HOLD_EXPIRY_INDEX, *(seat_lock_key(*seat) for seat in sold)])
+        for show_id, seat_ids in _by_show(_seats(dropped or [])).items():
+            await seat_availability.publish(show_id, SEAT_BOOKED, seat_ids)
+        log.info(f"hold reaper: dropped {len(dropped or [])} hold(s) on sold seats")
+
+    async def expire_bookings(self) -> int:
+        """Expire bookings left in `initiated` past the booking TTL."""
+        created_before = datetime.now(timezone.utc) - self._booking_ttl
+        total = 0
+        while True:
+            async with AsyncUnitOfWork() as uow:
+                expired = await uow.table_bookings.expire_initiated(
+                    created_before=created_before, limit=self._batch_size)
+                await uow.table_payments.fail_pending(
+                    booking_ids=[row.booking_id for row in expired])
+                await uow.commit()
+
+            # Pending bookings keep their seats held; give them back
+            for row in expired:
+                if not row.seat_ids or not row.hold_token:
+                    continue
+                await self._seat_locks.release_holds(
+                    [seat_lock_key(row.show_id, seat_id) for seat_id in row.seat_ids],
+                    hold_owner(row.user_id, row.hold_token),
+                )
+                await seat_availability.publish(row.show_id, SEAT_RELEASED, list(row.seat_ids))
+            total += len(expired)
+            if len(expired) < self._batch_size:
+                break
+
+        if total:
+            log.info(f"hold reaper: expired {total} abandoned booking(s)")
+        return total
+
+    async def _enable_keyspace_events(self) -> None:
+        if not CONFIG.hold_reaper_configure_keyspace_events:
+            return
+        try:
+            current = (await redis_client.config_get("notify-keyspace-events")).get(
+                "notify-keyspace-events", "")
+            missing = ("" if "E" in current else "E") + (
+                "" if "x" in current or "A" in current else "x")
+            if missing:
+                await redis_client.config_set("notify-keyspace-events", current + missing)
+        except Exception as e:
+            log.warning(f"hold reaper: cannot enable keyspace events, sweeping only: {e!r}")
+
+    async def _watch_expirations(self) -> None:
+        await self._enable_keyspace_events()
+        db = redis_client.connection_pool.connection_kwargs.get("db", 0)
+        channel = f"__keyevent@{db}__:expired"
+
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(channel)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    # Drain what is already buffered so a burst costs one DB query
+                    keys = [message["data"]]
+                    while len(keys) < self._batch_size:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+                        if message is None:
+                            break
+                        keys.append(message["data"])
+
+                    keys = [key for key in keys if parse_seat_lock_key(key) is not None]
+                    if keys:
+                        await self.release_expired(keys)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"hold reaper: expiry subscription lost: {e!r}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"hold reaper: sweep failed: {e!r}")
+            await asyncio.sleep(self._interval)
+
+
+hold_reaper = HoldReaper(
+    interval_seconds=CONFIG.hold_reaper_interval_seconds,
+    batch_size=CONFIG.hold_reaper_batch_size,
+    booking_ttl_seconds=CONFIG.booking_initiated_ttl_seconds,
+)
+
+
+if __name__ == "__main__":
+    # Standalone worker: `python -m app.services.reaper` (with
+    # hold_reaper_enabled=false on the API workers)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(hold_reaper.run())
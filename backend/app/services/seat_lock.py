@@ -1,12 +1,119 @@
 
 import asyncio
+import secrets
 from redis.asyncio import Redis
 from abc import ABC, abstractmethod
 
 from ..config import CONFIG
+from ..config.tracing import instrument_class
 from ..db.sessions import redis_client
 
 
+# Sorted set of every seat lock key scored by its expiry (unix seconds, by
+# the Redis clock). Lets the hold reaper find expired holds in batches.
+HOLD_EXPIRY_INDEX = "seat-holds:expiry"
+
+# All-or-nothing multi-seat hold (SET NX semantics for every key).
+#
+# KEYS[1]: HOLD_EXPIRY_INDEX
+# KEYS[2..]: seat lock keys
+# ARGV[1]: hold owner stored on every key
+# ARGV[2]: TTL in seconds
+#
+# Returns the keys that are already held. When that list is non-empty
+# nothing has been written.
+_HOLD_SEATS_LUA = """
+local conflicts = {}
+for i = 2, #KEYS do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        conflicts[#conflicts + 1] = KEYS[i]
+    end
+end
+if #conflicts > 0 then
+    return conflicts
+end
+local expires_at = tonumber(redis.call('TIME')[1]) + tonumber(ARGV[2])
+for i = 2, #KEYS do
+    redis.call('SET', KEYS[i], ARGV[1], 'EX', ARGV[2])
+    redis.call('ZADD', KEYS[1], expires_at, KEYS[i])
+end
+return conflicts
+"""
+
+# Compare-and-delete: only drop keys that still belong to the given owner,
+# so a late release can never wipe a hold taken over by someone else.
+#
+# KEYS[1]: HOLD_EXPIRY_INDEX
+# KEYS[2..]: seat lock keys
+# ARGV[1]: hold owner
+#
+# Returns the number of keys deleted.
+_RELEASE_SEATS_LUA = """
+local released = 0
+for i = 2, #KEYS do
+    if redis.call('GET', KEYS[i]) == ARGV[1] then
+        released = released + redis.call('DEL', KEYS[i])
+        redis.call('ZREM', KEYS[1], KEYS[i])
+    end
+end
+return released
+"""
+
+# Compare-and-expire: push the expiry of keys still held by the owner, e.g.
+# to keep seats held while a payment is pending. Nothing is extended unless
+# every key is held by the owner.
+#
+# KEYS[1]: HOLD_EXPIRY_INDEX
+# KEYS[2..]: seat lock keys
+# ARGV[1]: hold owner
+# ARGV[2]: new TTL in seconds
+#
+# Returns the keys that are not held by the owner.
+_EXTEND_SEATS_LUA = """
+local missing = {}
+for i = 2, #KEYS do
+    if redis.call('GET', KEYS[i]) ~= ARGV[1] then
+        missing[#missing + 1] = KEYS[i]
+    end
+end
+if #missing > 0 then
+    return missing
+end
+local expires_at = tonumber(redis.call('TIME')[1]) + tonumber(ARGV[2])
+for i = 2, #KEYS do
+    redis.call('EXPIRE', KEYS[i], ARGV[2])
+    redis.call('ZADD', KEYS[1], expires_at, KEYS[i])
+end
+return missing
+"""
+
+
+def new_hold_token() -> str:
+    """Random, unguessable token identifying one seat hold."""
+    return secrets.token_urlsafe(16)
+
+
+def hold_owner(user_id: int | str, hold_token: str) -> str:
+    """Value stored on a seat lock key: who holds it and under which hold."""
+    return f"{user_id}:{hold_token}"
+
+
+def seat_lock_key(show_id: int | str, seat_id: int | str) -> str:
+    """Redis key holding the lock for one seat of a show."""
+    return f"show:{show_id}:seat:{seat_id}"
+
+
+def parse_seat_lock_key(key: str) -> tuple[int, int] | None:
+    """Inverse of `seat_lock_key`: (show_id, seat_id), or None for other keys."""
+    parts = key.split(":")
+    if len(parts) != 4 or parts[0] != "show" or parts[2] != "seat":
+        return None
+    try:
+        return int(parts[1]), int(parts[3])
+    except ValueError:
+        return None
+
+
 class ISeatLockService(ABC):
     def __init__(self, redis_client) -> None:
         self.redis_client = redis_client
@@ -17,6 +124,32 @@ class ISeatLockService(ABC):
         # Implementation goes here
         return True
 
+    @abstractmethod
+    async def hold_seats(self, seat_keys: list[str], owner: str) -> list[str]:
+        """Atomically lock every seat key for `owner`, or none of them.
+
+        Returns the keys that were already locked (empty on success).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def verify_holds(self, seat_keys: list[str], owner: str) -> list[str]:
+        """Return the seat keys that are NOT currently held by `owner`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def extend_holds(self, seat_keys: list[str], owner: str, ttl_seconds: int) -> list[str]:
+        """Reset the TTL of seat keys held by `owner`, all or none.
+
+        Returns the keys NOT held by `owner` (empty on success).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release_holds(self, seat_keys: list[str], owner: str) -> int:
+        """Release the seat keys still held by `owner`; return how many were released."""
+        raise NotImplementedError
+
     @abstractmethod
     async def release_seat(self, seat_key: str) -> None:
         """Release a locked seat."""
@@ -37,19 +170,66 @@ class RedisSeatLockService(ISeatLockService):
     def __init__(self) -> None:
         self.__client = redis_client
         self.__ttl = CONFIG.seat_lock_ttl_seconds
+        self.__hold_script = self.__client.register_script(_HOLD_SEATS_LUA)
+        self.__release_script = self.__client.register_script(_RELEASE_SEATS_LUA)
+        self.__extend_script = self.__client.register_script(_EXTEND_SEATS_LUA)
 
-    async def lock_seat(self, seat_key: str) -> None:
-        """Lock a seat for a specified TTL (in seconds)."""
+    async def lock_seat(self, seat_key: str) -> bool:
+        """Lock a seat for a specified TTL (in seconds).
+
+        Returns False if the seat is already locked.
+        """
         if self.__ttl is None:
             raise ValueError("TTL not set for locking a seat.")
 
-        await self.__client.set(seat_key, int(True), ex=self.__ttl)
+        return bool(await self.__client.set(seat_key, int(True), ex=self.__ttl, nx=True))
+
+    async def hold_seats(self, seat_keys: list[str], owner: str) -> list[str]:
+        """Lock all seat keys for `owner` in a single round trip (all-or-nothing).
+
+        Returns the keys that conflicted; nothing is locked in that case.
+        """
+        if self.__ttl is None:
+            raise ValueError("TTL not set for locking a seat.")
+        if not seat_keys:
+            return []
+
+        conflicts = await self.__hold_script(
+            keys=[HOLD_EXPIRY_INDEX, *seat_keys], args=[owner, self.__ttl])
+        return list(conflicts or [])
+
+    async def verify_holds(self, seat_keys: list[str], owner: str) -> list[str]:
+        """Check ownership of all seat keys with a single MGET round trip."""
+        if not seat_keys:
+            return []
+
+        values = await self.__client.mget(seat_keys)
+        return [key for key, value in zip(seat_keys, values) if value != owner]
+
+    async def extend_holds(self, seat_keys: list[str], owner: str, ttl_seconds: int) -> list[str]:
+        """Compare-and-expire every seat key in a single round trip."""
+        if not seat_keys:
+            return []
+
+        missing = await self.__extend_script(
+            keys=[HOLD_EXPIRY_INDEX, *seat_keys], args=[owner, ttl_seconds])
+        return list(missing or [])
+
+    async def release_holds(self, seat_keys: list[str], owner: str) -> int:
+        """Compare-and-delete every seat key held by `owner`."""
+        if not seat_keys:
+            return 0
+
+        return int(await self.__release_script(
+            keys=[HOLD_EXPIRY_INDEX, *seat_keys], args=[owner]))
 
     async def release_seat(self, seat_key: str) -> None:
         """Release a locked seat."""
-        await self.__client.set(seat_key, int(False))
+        await self.__client.delete(seat_key)
 
     async def is_seat_locked(self, seat_key: str) -> bool:
         """Check if a seat is locked."""
-        val = await self.__client.get(seat_key)
-        return bool(val)
+        return bool(await self.__client.exists(seat_key))
+
+
+instrument_class(RedisSeatLockService, "redis.seat_lock")
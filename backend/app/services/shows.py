@@ -1,14 +1,24 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Protocol, runtime_checkable
-
-from sqlalchemy import func, select
-
-from ..db.models import Event, Show, ShowPricing, Venue
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+from sqlalchemy import String, bindparam, func, select, tuple_, type_coerce
+
+from ..config import CONFIG
+from ..config.tracing import instrument_class
+from ..db.models import Event, Show, ShowSummary, Venue
+from ..repositories.hooks import TOPIC_EVENTS, TOPIC_PRICING, TOPIC_SHOWS, on_commit
 from ..repositories.uow import AsyncUnitOfWork
+from .availability import ShowSeatBitmap, seat_availability
+from .cache import TwoLevelCache
 
 
 
@@ -26,6 +36,18 @@ class ShowListItem:
     city: str
     min_price: int
     currency: str
+    # From the show_summary projection; may lag behind by the listing cache TTL
+    available_seats: int
+    sold_out: bool
+
+
+@dataclass(frozen=True)
+class ShowPage:
+    """One page of the show listing."""
+
+    items: List[ShowListItem]
+    # Opaque cursor for the next page; None on the last page
+    next_cursor: Optional[str]
 
 
 # ShowDetails DTO for full show details
@@ -57,11 +79,253 @@ class ShowDetails:
     address: str
 
 
+@dataclass(frozen=True)
+class SeatLayout:
+    """Static part of a show's seat map (seats, sections, prices)."""
+
+    show_id: int
+    # (seat_id, row, col, section_id, section_name, price, currency), seat map order
+    seats: Tuple[Tuple[int, int, int, int, str, int, str], ...]
+    digest: str
+    loaded_at: float
+
+
+@dataclass(frozen=True)
+class ShowSeatMap:
+    """Static layout merged with the live availability of a show."""
+
+    layout: SeatLayout
+    availability: ShowSeatBitmap
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.layout.digest}-{self.availability.digest()}"'
+
+    def to_dict(self) -> Dict[str, Any]:
+        status = self.availability.status
+        return {
+            "show_id": self.layout.show_id,
+            "seats": [
+                {
+                    "seat_id": seat_id,
+                    "row": row,
+                    "col": col,
+                    "section_id": section_id,
+                    "section_name": section_name,
+                    "price": price,
+                    "currency": currency,
+                    "status": status(seat_id),
+                }
+                for seat_id, row, col, section_id, section_name, price, currency in self.layout.seats
+            ],
+        }
+
+
+class _SeatLayoutCache:
+    """Per-worker TTL cache of `SeatLayout`s (the layout rarely changes)."""
+
+    def __init__(self) -> None:
+        self._layouts: Dict[int, SeatLayout] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    async def get(self, show_id: int) -> SeatLayout | None:
+        layout = self._layouts.get(show_id)
+        if layout is not None and not self._expired(layout):
+            return layout
+
+        lock = self._locks.setdefault(show_id, asyncio.Lock())
+        async with lock:
+            layout = self._layouts.get(show_id)
+            if layout is None or self._expired(layout):
+                layout = await self._load(show_id)
+                if layout is not None:
+                    self._layouts[show_id] = layout
+        self._locks.pop(show_id, None)
+        return layout
+
+    def invalidate(self, show_id: int) -> None:
+        self._layouts.pop(show_id, None)
+
+    @staticmethod
+    def _expired(layout: SeatLayout) -> bool:
+        return time.monotonic() - layout.loaded_at > CONFIG.seat_layout_ttl_seconds
+
+    @staticmethod
+    async def _load(show_id: int) -> SeatLayout | None:
+        # Primary, not replica: these rows also seed the availability bitmap.
+        # Transitions published from here on are replayed onto it.
+        seat_availability.track(show_id)
+        try:
+            async with AsyncUnitOfWork() as uow:
+                rows = await uow.table_read.fetch_show_seat_map(show_id=show_id)
+        except BaseException:
+            seat_availability.untrack(show_id)
+            raise
+
+        if not rows:
+            seat_availability.untrack(show_id)
+            return None
+
+        # The same rows seed the availability bitmap if this worker has none yet
+        await seat_availability.get(show_id, seat_map=rows)
+
+        # Row prefix: (seat_id, row, col, section_id, section_name, price, currency)
+        seats = tuple(tuple(r[:7]) for r in rows)
+        digest = hashlib.blake2b(repr(seats).encode(), digest_size=8).hexdigest()
+        return SeatLayout(show_id=show_id, seats=seats, digest=digest, loaded_at=time.monotonic())
+
+
+_seat_layouts = _SeatLayoutCache()
+
+
+# Read statements, built once: every call reuses SQLAlchemy's compiled form
+# and asyncpg's prepared statement. Enum columns are read as plain strings.
+_SHOW_DETAILS = (
+    select(
+        # Show
+        Show.show_id,
+        Show.start_time,
+        Show.end_time,
+        type_coerce(Show.status, String),
+        # Event
+        Event.event_id,
+        type_coerce(Event.event_type, String),
+        Event.title,
+        Event.duration_min,
+        Event.language,
+        Event.genre,
+        # Venue
+        Venue.venue_id,
+        Venue.name,
+        Venue.location,
+        Venue.city,
+        Venue.country,
+        Venue.pincode,
+        Venue.address,
+    )
+    .select_from(Show)
+    .join(Event, Event.event_id == Show.event_id)
+    .join(Venue, Venue.venue_id == Show.venue_id)
+    .where(Show.show_id == bindparam("show_id"))
+)
+
+
+def _show_listing_stmt(starts_from: bool, starts_before: bool, after: bool) -> Any:
+    stmt = (
+        select(
+            Show.show_id,
+            Event.event_id,
+            type_coerce(Event.event_type, String),
+            Event.title,
+            Show.start_time,
+            Show.end_time,
+            Venue.name,
+            Venue.city,
+            ShowSummary.min_price,
+            ShowSummary.currency,
+            ShowSummary.available_seats,
+            ShowSummary.sold_out,
+        )
+        .select_from(Show)
+        .join(Event, Event.event_id == Show.event_id)
+        .join(Venue, Venue.venue_id == Show.venue_id)
+        .join(ShowSummary, ShowSummary.show_id == Show.show_id)
+        .where(func.lower(Venue.city) == bindparam("city"))
+        .where(Event.event_type.in_(bindparam("categories", expanding=True)))
+        .where(ShowSummary.min_price.is_not(None))
+        .order_by(Show.start_time, Show.show_id)
+        .limit(bindparam("limit"))
+    )
+    if starts_from:
+        stmt = stmt.where(Show.start_time >= bindparam("starts_from"))
+    if starts_before:
+        stmt = stmt.where(Show.start_time < bindparam("starts_before"))
+    if after:
+        stmt = stmt.where(
+            tuple_(Show.start_time, Show.show_id)
+            > tuple_(
+                bindparam("after_start_time", type_=Show.start_time.type),
+                bindparam("after_show_id", type_=Show.show_id.type),
+            ))
+    return stmt
+
+
+# One listing statement per combination of the optional filters
+# (starts_from, starts_before, after cursor)
+_SHOW_LISTINGS = {
+    (f, b, a): _show_listing_stmt(f, b, a)
+    for f in (False, True) for b in (False, True) for a in (False, True)
+}
+
+
+def _dump_show_list(items: List[ShowListItem]) -> str:
+    return json.dumps([asdict(item) for item in items], default=datetime.isoformat)
+
+
+def _load_show_list(payload: str) -> List[ShowListItem]:
+    items = []
+    for d in json.loads(payload):
+        d["start_time"] = datetime.fromisoformat(d["start_time"])
+        d["end_time"] = datetime.fromisoformat(d["end_time"])
+        items.append(ShowListItem(**d))
+    return items
+
+
+def _encode_cursor(start_time: datetime, show_id: int) -> str:
+    raw = json.dumps([start_time.isoformat(), show_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_time, show_id = json.loads(raw)
+        return datetime.fromisoformat(start_time), int(show_id)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+# First pages of the show listings per (category, city, window, limit); any
+# show / event / pricing change drops them all
+show_listing_cache: TwoLevelCache[List[ShowListItem]] = TwoLevelCache(
+    # Bump the version when ShowListItem changes shape
+    "show_listing:v2",
+    ttl_seconds=CONFIG.listing_cache_ttl_seconds,
+    max_entries=CONFIG.listing_cache_max_entries,
+    dumps=_dump_show_list,
+    loads=_load_show_list,
+)
+
+
+async def _invalidate_show_listings(_: set[Any]) -> None:
+    await show_listing_cache.invalidate_all()
+
+
+for _topic in (TOPIC_SHOWS, TOPIC_EVENTS, TOPIC_PRICING):
+    on_commit(_topic, _invalidate_show_listings)
+
+
 @runtime_checkable
 class IShowService(Protocol):
     async def get_show(self, show_id: int) -> ShowDetails | None: ...
 
-    async def list_shows(self, category: str, city: str) -> List[ShowListItem]: ...
+    async def get_seat_map(self, show_id: int) -> ShowSeatMap | None: ...
+
+    async def list_shows(
+            self,
+            category: str,
+            city: str,
+            *,
+            starts_from: Optional[datetime] = None,
+            starts_before: Optional[datetime] = None,
+            cursor: Optional[str] = None,
+            limit: Optional[int] = None) -> ShowPage: ...
 
     async def create_show(self, show_data: dict): ...
 
@@ -81,77 +345,62 @@ class ShowService(IShowService):
         if show_id <= 0:
             raise ValueError("show_id must be a positive integer")
 
-        stmt = (
-            select(
-                # Show
-                Show.show_id.label("show_id"),
-                Show.start_time.label("start_time"),
-                Show.end_time.label("end_time"),
-                Show.status.label("status"),
-                # Event
-                Event.event_id.label("event_id"),
-                Event.event_type.label("category"),
-                Event.title.label("title"),
-                Event.duration_min.label("duration_min"),
-                Event.language.label("language"),
-                Event.genre.label("genre"),
-                # Venue
-                Venue.venue_id.label("venue_id"),
-                Venue.name.label("venue_name"),
-                Venue.location.label("location"),
-                Venue.city.label("city"),
-                Venue.country.label("country"),
-                Venue.pincode.label("pincode"),
-                Venue.address.label("address"),
-            )
-            .select_from(Show)
-            .join(Event, Event.event_id == Show.event_id)
-            .join(Venue, Venue.venue_id == Show.venue_id)
-            .where(Show.show_id == show_id)
-        )
+        async with AsyncUnitOfWork(readonly=True) as uow:
+            row = (await uow.session.execute(_SHOW_DETAILS, {"show_id": show_id})).first()  # type: ignore[attr-defined]
 
-        async with AsyncUnitOfWork() as uow:
-            row = (await uow.session.execute(stmt)).mappings().first()  # type: ignore[attr-defined]
+        # Columns are selected in ShowDetails field order
+        return ShowDetails(*row) if row is not None else None
+
+    async def get_seat_map(self, show_id: int) -> ShowSeatMap | None:
+        """Seat map of a show: cached static layout + in-memory availability.
+
+        Neither layer queries the DB once warm; the layout is reloaded after
+        `seat_layout_ttl_seconds` and availability follows Redis pub/sub.
+
+        Returns:
+            ShowSeatMap if the show has inventory, else None.
+        """
+
+        if show_id <= 0:
+            raise ValueError("show_id must be a positive integer")
 
-        if row is None:
+        layout = await _seat_layouts.get(show_id)
+        if layout is None:
             return None
 
-        return ShowDetails(
-            # Show
-            show_id=int(row["show_id"]),
-            start_time=row["start_time"],
-            end_time=row["end_time"],
-            status=str(row["status"]),
-            # Event
-            event_id=int(row["event_id"]),
-            category=str(row["category"]),
-            title=str(row["title"]),
-            duration_min=int(row["duration_min"]),
-            language=str(row["language"]),
-            genre=str(row["genre"]),
-            # Venue
-            venue_id=int(row["venue_id"]),
-            venue_name=str(row["venue_name"]),
-            location=str(row["location"]),
-            city=str(row["city"]),
-            country=str(row["country"]),
-            pincode=str(row["pincode"]),
-            address=str(row["address"]),
-        )
+        availability = await seat_availability.get(show_id)
+        return ShowSeatMap(layout=layout, availability=availability)
 
-    async def list_shows(self, category: str, city: str) -> List[ShowListItem]:
-        """List shows for UI cards.
+    async def list_shows(
+            self,
+            category: str,
+            city: str,
+            *,
+            starts_from: Optional[datetime] = None,
+            starts_before: Optional[datetime] = None,
+            cursor: Optional[str] = None,
+            limit: Optional[int] = None) -> ShowPage:
+        """List shows for UI cards, one page at a time.
 
         Args:
             category: "movie" | "concert" | "all"
             city: "Bangalore" | "Mumbai" (case-insensitive)
+            starts_from: only shows starting at or after this time
+            starts_before: only shows starting before this time
+            cursor: `next_cursor` of the previous page
+            limit: page size (default CONFIG.show_list_page_size)
 
         Returns:
-            List of ShowListItem ordered by start_time.
+            ShowPage with items ordered by (start_time, show_id).
 
         Notes:
-            - Uses UNION ALL for category == "all" to keep the intent explicit.
-            - Computes min price per show from show_pricings.
+            - Keyset pagination on (start_time, show_id): every page is an
+              index range scan of `limit + 1` rows, however deep it is.
+            - Reads min price and seats left from the show_summary projection,
+              so no aggregation runs per request. Shows without pricing are
+              left out.
+            - First pages are served from `show_listing_cache`; pages after a
+              cursor always hit the database.
         """
 
         category_norm = (category or "").strip().lower()
@@ -163,76 +412,87 @@ class ShowService(IShowService):
         if city_norm not in {"bangalore", "mumbai"}:
             raise ValueError("city must be either Bangalore or Mumbai")
 
-        def _base_stmt(event_type: str):
-            return (
-                select(
-                    Show.show_id.label("show_id"),
-                    Event.event_id.label("event_id"),
-                    Event.event_type.label("category"),
-                    Event.title.label("title"),
-                    Show.start_time.label("start_time"),
-                    Show.end_time.label("end_time"),
-                    Venue.name.label("venue_name"),
-                    Venue.city.label("city"),
-                    func.min(ShowPricing.amount).label("min_price"),
-                    func.min(ShowPricing.currency).label("currency"),
-                )
-                .select_from(Show)
-                .join(Event, Event.event_id == Show.event_id)
-                .join(Venue, Venue.venue_id == Show.venue_id)
-                .join(ShowPricing, ShowPricing.show_id == Show.show_id)
-                .where(func.lower(Venue.city) == city_norm)
-                .where(Event.event_type == event_type)
-                .group_by(
-                    Show.show_id,
-                    Event.event_id,
-                    Event.event_type,
-                    Event.title,
-                    Show.start_time,
-                    Show.end_time,
-                    Venue.name,
-                    Venue.city,
-                )
+        limit = limit or CONFIG.show_list_page_size
+        if not 0 < limit <= CONFIG.show_list_max_page_size:
+            raise ValueError(f"limit must be between 1 and {CONFIG.show_list_max_page_size}")
+
+        starts_from = _as_utc(starts_from)
+        starts_before = _as_utc(starts_before)
+        if starts_from and starts_before and starts_from >= starts_before:
+            raise ValueError("from must be earlier than to")
+
+        after = _decode_cursor(cursor) if cursor else None
+
+        def _load() -> Any:
+            return self._query_shows(
+                category_norm, city_norm,
+                starts_from=starts_from, starts_before=starts_before,
+                after=after, limit=limit + 1,
             )
 
+        if after is None:
+            window = tuple(t.isoformat() if t else "" for t in (starts_from, starts_before))
+            rows = await show_listing_cache.get_or_load(
+                (category_norm, city_norm, *window, limit), _load)
+        else:
+            rows = await _load()
+
+        # The extra row only tells whether there is a next page
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = _encode_cursor(last.start_time, last.show_id)
+        return ShowPage(items=items, next_cursor=next_cursor)
+
+    async def _query_shows(
+            self,
+            category_norm: str,
+            city_norm: str,
+            *,
+            starts_from: Optional[datetime],
+            starts_before: Optional[datetime],
+            after: Optional[Tuple[datetime, int]],
+            limit: int) -> List[ShowListItem]:
+        params: Dict[str, Any] = {
+            "city": city_norm,
+            "categories": ["movie", "concert"] if category_norm == "all" else [category_norm],
+            "limit": limit,
+        }
+        if starts_from is not None:
+            params["starts_from"] = starts_from
+        if starts_before is not None:
+            params["starts_before"] = starts_before
+        if after is not None:
+            params["after_start_time"], params["after_show_id"] = after
+        stmt = _SHOW_LISTINGS[(starts_from is not None, starts_before is not None, after is not None)]
+
+        async with AsyncUnitOfWork(readonly=True) as uow:
+            rows = (await uow.session.execute(stmt, params)).all()
+
+        # Columns are selected in ShowListItem field order
+        return [ShowListItem(*row) for row in rows]
+
+    async def create_show(self, show_data: dict) -> int:
+        """Create a show and return its ID."""
         async with AsyncUnitOfWork() as uow:
-            if category_norm == "all":
-                movies = _base_stmt("movie")
-                concerts = _base_stmt("concert")
-                stmt = movies.union_all(concerts).order_by("start_time")
-            else:
-                stmt = _base_stmt(category_norm).order_by("start_time")
-
-            rows = (await uow.session.execute(stmt)).mappings().all()  # type: ignore[attr-defined]
-
-        # Map rows -> DTOs
-        out: List[ShowListItem] = []
-        for r in rows:
-            out.append(
-                ShowListItem(
-                    show_id=int(r["show_id"]),
-                    event_id=int(r["event_id"]),
-                    category=str(r["category"]),
-                    title=str(r["title"]),
-                    start_time=r["start_time"],
-                    end_time=r["end_time"],
-                    venue_name=str(r["venue_name"]),
-                    city=str(r["city"]),
-                    min_price=int(r["min_price"]),
-                    currency=str(r["currency"]),
-                )
-            )
+            show = await uow.table_shows.create(**show_data)
+            await uow.commit()
+        return int(show.show_id)
 
-        return out
+    async def update_show(self, show_id: int, show_data: dict) -> bool:
+        """Update a show; returns False if it does not exist."""
+        async with AsyncUnitOfWork() as uow:
+            updated = await uow.table_shows.update(show_id, **show_data)
+            await uow.commit()
+        return updated > 0
 
-    async def create_show(self, show_data: dict):
-        # Not implemented in this step
-        raise NotImplementedError
+    async def delete_show(self, show_id: int) -> bool:
+        """Delete a show; returns False if it does not exist."""
+        async with AsyncUnitOfWork() as uow:
+            deleted = await uow.table_shows.delete(show_id)
+            await uow.commit()
+        return deleted > 0
 
-    async def update_show(self, show_id: int, show_data: dict):
-        # Not implemented in this step
-        raise NotImplementedError
 
-    async def delete_show(self, show_id: int):
-        # Not implemented in this step
-        raise NotImplementedError
+instrument_class(ShowService, "service.shows")
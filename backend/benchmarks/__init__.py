@@ -0,0 +1,24 @@
+"""Load tests for the browse and booking paths.
+
+The FastAPI `app` runs in-process (httpx ASGITransport, lifespan included)
+against the Postgres / Redis of DATABASE_URL and the redis_* settings, i.e.
+the local docker-compose stand-ins, never production. Bookings write to
+the database: run against a scratch database seeded with
+`db/data_add_query.sql`, and re-seed it between runs.
+
+    python -m benchmarks generate -o benchmarks/workloads/mixed.jsonl
+    python -m benchmarks run benchmarks/workloads/mixed.jsonl -c 50 \\
+        --save benchmarks/baselines/mixed.json
+    python -m benchmarks run benchmarks/workloads/mixed.jsonl -c 50 \\
+        --compare benchmarks/baselines/mixed.json
+
+A workload is a JSONL file of sessions (see workload.py); `generate` records
+one from the catalogue in the database. `run` reports throughput,
+p50/p95/p99 latency, conflict / rejection rates and DB round trips per
+request for every endpoint; `--compare` exits non-zero on a regression
+against a stored baseline.
+
+Bookings use the app's payment mode, "inline" unless configured otherwise;
+`run --payment-mode async` measures the two-phase flow, settled by the stub
+payment provider.
+"""
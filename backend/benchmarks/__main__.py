@@ -0,0 +1,169 @@
+"""CLI: python -m benchmarks {generate,run,contention} ... (from backend/)."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from app.config import CONFIG
+
+_DEFAULT_WORKLOAD = Path(__file__).resolve().parent / "workloads" / "mixed.jsonl"
+
+
+def _payment_options() -> argparse.ArgumentParser:
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("--payment-mode", choices=("inline", "async"),
+                         help="override booking_payment_mode; async settles through the stub provider")
+    return options
+
+
+def _configure_payments(args: argparse.Namespace) -> None:
+    # The payment provider and its routes are picked when the app is
+    # imported, so this runs before any module that imports it
+    if args.payment_mode is not None:
+        CONFIG.booking_payment_mode = args.payment_mode
+    if args.payment_mode == "async":
+        CONFIG.payment_stub_enabled = True
+
+
+async def _generate(args: argparse.Namespace) -> int:
+    from .workload import generate_workload, parse_mix, save_workload
+
+    sessions = await generate_workload(
+        sessions=args.sessions,
+        mix=parse_mix(args.mix),
+        seed=args.seed,
+        hot_show_id=args.hot_show,
+    )
+    count = save_workload(args.output, sessions)
+    print(f"wrote {count} sessions to {args.output}")
+    return 0
+
+
+async def _run(args: argparse.Namespace) -> int:
+    from .report import compare, format_summary, load_baseline, save_baseline, summarize
+    from .runner import run_workload
+    from .workload import load_workload
+
+    # The limits would mostly measure themselves; opt in to include them
+    CONFIG.rate_limit_enabled = args.rate_limits
+    CONFIG.admission_queue_enabled = False
+
+    sessions = load_workload(args.workload)
+    result = await run_workload(
+        sessions, concurrency=args.concurrency, repeat=args.repeat, warmup=args.warmup)
+    summary = summarize(result)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary))
+
+    if args.save:
+        save_baseline(args.save, summary, workload=str(args.workload))
+        print(f"baseline saved to {args.save}")
+
+    if args.compare:
+        problems = compare(load_baseline(args.compare), summary, tolerance=args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            return 1
+        print(f"no regression against {args.compare}")
+    return 0
+
+
+async def _contention(args: argparse.Namespace) -> int:
+    from .contention import check_invariants, reset_show, run_contention
+
+    CONFIG.rate_limit_enabled = False
+    if args.reset:
+        await reset_show(args.show)
+
+    result = await run_contention(
+        show_id=args.show,
+        clients=args.clients,
+        concurrency=args.concurrency,
+        distribution=args.distribution,
+        engine=args.engine,
+        bypass_holds=args.bypass_holds,
+        max_seats=args.max_seats,
+        hot_fraction=args.hot_fraction,
+        hot_probability=args.hot_probability,
+        seed=args.seed,
+    )
+    summary = {
+        "show_id": args.show,
+        "engine": args.engine,
+        "distribution": args.distribution,
+        "bypass_holds": args.bypass_holds,
+        "clients": args.clients,
+        "concurrency": args.concurrency,
+        **result.summary(),
+    }
+    problems = await check_invariants(args.show, result)
+    summary["violations"] = problems
+    print(json.dumps(summary, indent=2))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    for problem in problems:
+        print(f"VIOLATION {problem}")
+    return 1 if problems else 0
+
+
+def main() -> int:
+    payment_options = _payment_options()
+    _configure_payments(payment_options.parse_known_args()[0])
+    from .contention import DISTRIBUTIONS, ENGINES
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="record a workload from the seeded catalogue")
+    gen.add_argument("-o", "--output", type=Path, default=_DEFAULT_WORKLOAD)
+    gen.add_argument("-n", "--sessions", type=int, default=2000)
+    gen.add_argument("--mix", help="scenario weights, e.g. browse=50,details=20,book=30")
+    gen.add_argument("--hot-show", type=int, help="show the reserve / book scenarios target")
+    gen.add_argument("--seed", type=int, default=1)
+
+    run = commands.add_parser("run", help="replay a workload and report", parents=[payment_options])
+    run.add_argument("workload", type=Path, nargs="?", default=_DEFAULT_WORKLOAD)
+    run.add_argument("-c", "--concurrency", type=int, default=50)
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument("--warmup", type=int, default=50, help="untimed sessions run first")
+    run.add_argument("--rate-limits", action="store_true", help="keep the token-bucket limits on")
+    run.add_argument("--json", action="store_true", help="print the summary as JSON")
+    run.add_argument("--save", type=Path, help="store the summary as a baseline")
+    run.add_argument("--compare", type=Path, help="fail on a regression against this baseline")
+    run.add_argument("--tolerance", type=float, default=0.2,
+                     help="allowed latency / throughput drift (fraction)")
+
+    con = commands.add_parser("contention", help="concurrent bookings on one show + invariant checks")
+    con.add_argument("--show", type=int, required=True)
+    con.add_argument("-n", "--clients", type=int, default=2000)
+    con.add_argument("-c", "--concurrency", type=int, default=200)
+    con.add_argument("--distribution", choices=DISTRIBUTIONS, default="skewed")
+    con.add_argument("--engine", choices=ENGINES, default="orm")
+    con.add_argument("--bypass-holds", action="store_true",
+                     help="commit directly, contending on the inventory row locks")
+    con.add_argument("--max-seats", type=int, default=4, help="seats per booking: 1..N")
+    con.add_argument("--hot-fraction", type=float, default=0.1, help="share of seats that are hot")
+    con.add_argument("--hot-probability", type=float, default=0.8,
+                     help="chance a skewed booking targets the hot seats")
+    con.add_argument("--seed", type=int, default=1)
+    con.add_argument("--reset", action="store_true",
+                     help="put the show back on sale first (scratch databases only)")
+    con.add_argument("--save", type=Path, help="write the summary as JSON")
+
+    args = parser.parse_args()
+    handler = {"generate": _generate, "run": _run, "contention": _contention}[args.command]
+    return asyncio.run(handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
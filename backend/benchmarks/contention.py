@@ -0,0 +1,360 @@
+"""Contention harness and correctness oracle for seat booking on one show.
+
+Thousands of simulated clients pick overlapping seat sets of one show
+(`uniform` over all its seats, or `skewed` towards a small hot set) and call
+`BookingService.reserve_seats` then `book_seats` concurrently. With
+`--bypass-holds` they go straight to the commit path of the selected engine
+(orm / cte / group commit), so every conflict is resolved by the
+`lock_for_update` row locks instead of the Redis holds, which is the path to
+compare locking strategies on.
+
+Afterwards the oracle checks the show in Postgres and Redis:
+
+- no seat is sold twice (by the clients' results and by active tickets);
+- active tickets match the sold inventory rows, seat for seat, and every
+  sold seat is booked by the user of its confirmed booking;
+- show_summary.available_seats matches the available inventory rows;
+- no seat hold is left on a sold seat, missing from the expiry index or
+  without a TTL.
+
+    python -m benchmarks contention --show 1 --reset -n 5000 -c 200 --distribution skewed
+
+`--reset` wipes the bookings, tickets, payments and holds of the show and
+puts all its seats back on sale first: scratch databases only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.config import CONFIG
+from app.db.models import (
+    Booking,
+    BookingStatus,
+    Inventory,
+    InventoryStatus,
+    Payment,
+    ShowSummary,
+    Ticket,
+    TicketStatus,
+    User,
+)
+from app.db.sessions import redis_client
+from app.domain.errors import HoldExpired, SeatNotAvailable
+from app.repositories.uow import AsyncUnitOfWork
+from app.services.bookings import BookingService, _booking_batcher
+from app.services.seat_lock import HOLD_EXPIRY_INDEX, seat_lock_key
+
+from .report import _percentile
+from .runner import _db_calls, count_db_round_trips
+
+__all__ = ["ContentionResult", "run_contention", "check_invariants", "reset_show"]
+
+ENGINES = ("orm", "cte", "group")
+DISTRIBUTIONS = ("uniform", "skewed")
+
+
+@dataclass
+class ContentionResult:
+    # operation ("reserve" / "book" / "commit") -> outcome -> latencies (ms)
+    latencies: dict[str, dict[str, list[float]]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(list)))
+    # seat_id -> booking IDs the clients were told they got it with
+    sold: dict[int, list[int]] = field(default_factory=lambda: defaultdict(list))
+    db_round_trips: int = 0
+    duration_seconds: float = 0.0
+
+    def record(self, operation: str, outcome: str, started: float) -> None:
+        self.latencies[operation][outcome].append((time.perf_counter() - started) * 1000)
+
+    def summary(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"duration_seconds": round(self.duration_seconds, 3), "operations": {}}
+        total = 0
+        for operation, outcomes in self.latencies.items():
+            all_ms = sorted(ms for values in outcomes.values() for ms in values)
+            total += len(all_ms)
+            out["operations"][operation] = {
+                "calls": len(all_ms),
+                "outcomes": {k: len(v) for k, v in sorted(outcomes.items())},
+                "p50_ms": round(_percentile(all_ms, 0.50), 2),
+                "p95_ms": round(_percentile(all_ms, 0.95), 2),
+                "p99_ms": round(_percentile(all_ms, 0.99), 2),
+            }
+        out["db_round_trips_per_call"] = round(self.db_round_trips / total, 2) if total else 0.0
+        out["seats_sold"] = len(self.sold)
+        return out
+
+
+def _outcome(e: Optional[BaseException]) -> str:
+    if e is None:
+        return "ok"
+    if isinstance(e, SeatNotAvailable):
+        return "seat_not_available"
+    if isinstance(e, HoldExpired):
+        return "hold_expired"
+    return f"error:{type(e).__name__}"
+
+
+class _SeatPicker:
+    def __init__(
+            self,
+            seat_ids: list[int],
+            *,
+            distribution: str,
+            hot_fraction: float,
+            hot_probability: float,
+            max_seats: int,
+            rng: random.Random) -> None:
+        self._seats = seat_ids
+        self._hot = seat_ids[:max(1, int(len(seat_ids) * hot_fraction))]
+        self._distribution = distribution
+        self._hot_probability = hot_probability
+        self._max_seats = max_seats
+        self._rng = rng
+
+    def pick(self) -> list[int]:
+        pool = self._seats
+        if self._distribution == "skewed" and self._rng.random() < self._hot_probability:
+            pool = self._hot
+        k = self._rng.randint(1, min(self._max_seats, len(pool)))
+        return sorted(self._rng.sample(pool, k))
+
+
+async def _load_show(show_id: int) -> tuple[list[int], list[int]]:
+    async with AsyncUnitOfWork() as uow:
+        seat_ids = list((await uow.session.execute(
+            select(Inventory.seat_id).where(Inventory.show_id == show_id).order_by(Inventory.seat_id)
+        )).scalars())
+        user_ids = list((await uow.session.execute(
+            select(User.user_id).order_by(User.user_id))).scalars())
+    if not seat_ids:
+        raise RuntimeError(f"show {show_id} has no inventory")
+    if not user_ids:
+        raise RuntimeError("no users in the database")
+    return seat_ids, user_ids
+
+
+async def _hold_keys(show_id: int) -> list[str]:
+    return [key async for key in redis_client.scan_iter(match=seat_lock_key(show_id, "*"), count=1000)]
+
+
+async def reset_show(show_id: int) -> None:
+    """Put every seat of the show back on sale and drop its bookings and holds."""
+    async with AsyncUnitOfWork() as uow:
+        booking_ids = select(Booking.booking_id).where(Booking.show_id == show_id)
+        await uow.session.execute(delete(Ticket).where(Ticket.show_id == show_id))
+        await uow.session.execute(delete(Payment).where(Payment.booking_id.in_(booking_ids)))
+        await uow.session.execute(delete(Booking).where(Booking.show_id == show_id))
+        await uow.session.execute(
+            update(Inventory)
+            .where(Inventory.show_id == show_id)
+            .values(status=InventoryStatus.available, booked_by=None)
+        )
+        await uow.table_summary.rebuild(show_id=show_id)
+        await uow.commit()
+
+    keys = await _hold_keys(show_id)
+    if keys:
+        await redis_client.delete(*keys)
+        await redis_client.zrem(HOLD_EXPIRY_INDEX, *keys)
+
+
+async def _client(
+        service: BookingService,
+        *,
+        show_id: int,
+        user_id: int,
+        seat_ids: list[int],
+        engine: str,
+        bypass_holds: bool,
+        result: ContentionResult) -> None:
+    seats = [str(s) for s in seat_ids]
+
+    if bypass_holds:
+        started = time.perf_counter()
+        error: Optional[BaseException] = None
+        booking_id = None
+        try:
+            if engine == "group":
+                booking_id = await _booking_batcher.submit(
+                    user_id=user_id, show_id=show_id, seat_ids=seat_ids)
+            elif engine == "cte":
+                booking_id = await service._commit_booking_single_statement(
+                    user_id=user_id, show_id=show_id, seat_ids=seat_ids)
+            else:
+                booking_id = await service._commit_booking(
+                    user_id=user_id, show_id=show_id, seat_ids=seat_ids)
+        except Exception as e:
+            error = e
+        result.record("commit", _outcome(error), started)
+        if booking_id is not None:
+            for seat_id in seat_ids:
+                result.sold[seat_id].append(booking_id)
+        return
+
+    started = time.perf_counter()
+    try:
+        hold = await service.reserve_seats(str(user_id), str(show_id), seats)
+    except Exception as e:
+        result.record("reserve", _outcome(e), started)
+        return
+    result.record("reserve", "ok", started)
+
+    started = time.perf_counter()
+    try:
+        booking_id = await service.book_seats(str(user_id), str(show_id), seats, hold.hold_token)
+    except Exception as e:
+        result.record("book", _outcome(e), started)
+        return
+    result.record("book", "ok", started)
+    for seat_id in seat_ids:
+        result.sold[seat_id].append(booking_id)
+
+
+async def run_contention(
+        *,
+        show_id: int,
+        clients: int,
+        concurrency: int,
+        distribution: str,
+        engine: str,
+        bypass_holds: bool,
+        max_seats: int = 4,
+        hot_fraction: float = 0.1,
+        hot_probability: float = 0.8,
+        seed: int = 1) -> ContentionResult:
+    """Run `clients` booking attempts on one show, `concurrency` at a time."""
+    CONFIG.booking_group_commit = engine == "group"
+    CONFIG.booking_commit_engine = "cte" if engine == "cte" else "orm"
+
+    seat_ids, user_ids = await _load_show(show_id)
+    rng = random.Random(seed)
+    picker = _SeatPicker(
+        seat_ids,
+        distribution=distribution,
+        hot_fraction=hot_fraction,
+        hot_probability=hot_probability,
+        max_seats=max_seats,
+        rng=rng,
+    )
+    plans = [(rng.choice(user_ids), picker.pick()) for _ in range(clients)]
+
+    service = BookingService()
+    result = ContentionResult()
+    queue: asyncio.Queue[tuple[int, list[int]]] = asyncio.Queue()
+    for plan in plans:
+        queue.put_nowait(plan)
+
+    calls = [0]
+
+    async def worker() -> None:
+        while True:
+            try:
+                user_id, seats = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await _client(
+                service,
+                show_id=show_id,
+                user_id=user_id,
+                seat_ids=seats,
+                engine=engine,
+                bypass_holds=bypass_holds,
+                result=result,
+            )
+
+    token = _db_calls.set(calls)
+    try:
+        with count_db_round_trips():
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            result.duration_seconds = time.perf_counter() - started
+    finally:
+        _db_calls.reset(token)
+    result.db_round_trips = calls[0]
+    return result
+
+
+async def check_invariants(show_id: int, result: Optional[ContentionResult] = None) -> list[str]:
+    """Invariant violations of a show after a run, one line each (empty when sound)."""
+    problems: list[str] = []
+
+    if result is not None:
+        for seat_id, bookings in sorted(result.sold.items()):
+            if len(bookings) > 1:
+                problems.append(f"seat {seat_id} reported sold to bookings {bookings}")
+
+    async with AsyncUnitOfWork() as uow:
+        tickets = (await uow.session.execute(
+            select(Ticket.seat_id, Ticket.booking_id)
+            .where(Ticket.show_id == show_id, Ticket.status == TicketStatus.active)
+        )).all()
+        sold = {
+            seat_id: booked_by
+            for seat_id, booked_by in (await uow.session.execute(
+                select(Inventory.seat_id, Inventory.booked_by)
+                .where(Inventory.show_id == show_id, Inventory.status == InventoryStatus.not_available)
+            )).all()
+        }
+        available = int((await uow.session.execute(
+            select(func.count())
+            .select_from(Inventory)
+            .where(Inventory.show_id == show_id, Inventory.status == InventoryStatus.available)
+        )).scalar_one())
+        booking_users = dict((await uow.session.execute(
+            select(Booking.booking_id, Booking.user_id)
+            .where(Booking.show_id == show_id, Booking.status == BookingStatus.confirmed)
+        )).all())
+        summary_available = (await uow.session.execute(
+            select(ShowSummary.available_seats).where(ShowSummary.show_id == show_id)
+        )).scalar_one_or_none()
+
+    ticket_counts = Counter(seat_id for seat_id, _ in tickets)
+    for seat_id, n in sorted(ticket_counts.items()):
+        if n > 1:
+            problems.append(f"seat {seat_id} has {n} active tickets")
+
+    ticketed = set(ticket_counts)
+    for seat_id in sorted(set(sold) - ticketed):
+        problems.append(f"seat {seat_id} is sold without a ticket")
+    for seat_id in sorted(ticketed - set(sold)):
+        problems.append(f"seat {seat_id} has a ticket but is not sold")
+
+    for seat_id, booking_id in tickets:
+        user_id = booking_users.get(booking_id)
+        if user_id is None:
+            problems.append(f"ticket for seat {seat_id} belongs to unconfirmed booking {booking_id}")
+        elif sold.get(seat_id) not in (None, user_id):
+            problems.append(
+                f"seat {seat_id} booked by user {sold[seat_id]}, booking {booking_id} is user {user_id}")
+
+    if result is not None:
+        for seat_id in sorted(set(result.sold) - set(sold)):
+            problems.append(f"seat {seat_id} reported sold but available in inventories")
+
+    if summary_available is not None and summary_available != available:
+        problems.append(
+            f"show_summary.available_seats is {summary_available}, inventories have {available}")
+
+    keys = await _hold_keys(show_id)
+    if keys:
+        indexed = await redis_client.zmscore(HOLD_EXPIRY_INDEX, keys)
+        ttls = await asyncio.gather(*(redis_client.ttl(key) for key in keys))
+        prefix = len(seat_lock_key(show_id, ""))
+        for key, score, ttl in zip(keys, indexed, ttls):
+            seat_id = int(key[prefix:])
+            if seat_id in sold:
+                problems.append(f"hold {key} left on a sold seat")
+            if score is None:
+                problems.append(f"hold {key} missing from {HOLD_EXPIRY_INDEX}")
+            if ttl == -1:
+                problems.append(f"hold {key} never expires")
+
+    return problems
@@ -0,0 +1,127 @@
+"""Summaries of a run, JSON baselines and regression checks."""
+
+from __future__ import annotations
+
+import json
+import math
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .runner import RunResult, Sample
+
+__all__ = ["summarize", "format_summary", "save_baseline", "load_baseline", "compare"]
+
+# DB round trips are deterministic for a given code path; allow this much
+# drift (mean per request) before calling it a regression
+_DB_ROUND_TRIP_SLACK = 0.5
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(q * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _stats(samples: list[Sample], duration: float) -> dict[str, Any]:
+    latencies = sorted(s.latency_ms for s in samples)
+    statuses: dict[str, int] = defaultdict(int)
+    for s in samples:
+        statuses[str(s.status)] += 1
+    count = len(samples)
+    return {
+        "requests": count,
+        "throughput_rps": round(count / duration, 2) if duration else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        # Lost the race for a seat (409) / shed by rate limits or slots (429)
+        "conflict_rate": round(statuses.get("409", 0) / count, 4) if count else 0.0,
+        "rejected_rate": round(statuses.get("429", 0) / count, 4) if count else 0.0,
+        "error_rate": round(
+            sum(n for code, n in statuses.items() if int(code) == 0 or int(code) >= 500) / count, 4)
+        if count else 0.0,
+        "db_round_trips_per_request": round(sum(s.db_round_trips for s in samples) / count, 2)
+        if count else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def summarize(result: RunResult) -> dict[str, Any]:
+    by_name: dict[str, list[Sample]] = defaultdict(list)
+    for sample in result.samples:
+        by_name[sample.name].append(sample)
+
+    return {
+        "concurrency": result.concurrency,
+        "sessions": result.sessions,
+        "duration_seconds": round(result.duration_seconds, 3),
+        "overall": _stats(result.samples, result.duration_seconds),
+        "endpoints": {
+            name: _stats(samples, result.duration_seconds)
+            for name, samples in sorted(by_name.items())
+        },
+    }
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    header = (f"{'endpoint':<24}{'req':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+              f"{'409%':>7}{'429%':>7}{'err%':>7}{'db/req':>8}")
+    lines = [
+        f"{summary['sessions']} sessions, concurrency {summary['concurrency']}, "
+        f"{summary['duration_seconds']}s",
+        header,
+        "-" * len(header),
+    ]
+    rows = [*summary["endpoints"].items(), ("overall", summary["overall"])]
+    for name, s in rows:
+        lines.append(
+            f"{name:<24}{s['requests']:>7}{s['throughput_rps']:>9.1f}"
+            f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}"
+            f"{s['conflict_rate'] * 100:>7.1f}{s['rejected_rate'] * 100:>7.1f}"
+            f"{s['error_rate'] * 100:>7.1f}{s['db_round_trips_per_request']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def save_baseline(path: Path, summary: dict[str, Any], *, workload: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "workload": workload,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        **summary,
+    }
+    path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], *, tolerance: float) -> list[str]:
+    """Regressions of `current` against `baseline`, one line each.
+
+    Latency (p95 / p99) may grow and throughput may drop by `tolerance`
+    (a fraction); error rates may not grow and DB round trips per request
+    may not grow by more than `_DB_ROUND_TRIP_SLACK`.
+    """
+    problems = []
+    for name, base in baseline["endpoints"].items():
+        now = current["endpoints"].get(name)
+        if now is None:
+            problems.append(f"{name}: missing from this run")
+            continue
+
+        for metric in ("p95_ms", "p99_ms"):
+            if base[metric] and now[metric] > base[metric] * (1 + tolerance):
+                problems.append(f"{name}: {metric} {base[metric]} -> {now[metric]}")
+        if base["throughput_rps"] and now["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            problems.append(f"{name}: throughput {base['throughput_rps']} -> {now['throughput_rps']} rps")
+        if now["error_rate"] > base["error_rate"]:
+            problems.append(f"{name}: error rate {base['error_rate']} -> {now['error_rate']}")
+        db_base, db_now = base["db_round_trips_per_request"], now["db_round_trips_per_request"]
+        if db_now > db_base + _DB_ROUND_TRIP_SLACK:
+            problems.append(f"{name}: DB round trips per request {db_base} -> {db_now}")
+    return problems
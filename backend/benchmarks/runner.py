@@ -0,0 +1,166 @@
+"""Replay a workload against the in-process app and collect samples."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+import httpx
+from sqlalchemy import event
+
+from app.main import app
+from app.repositories.uow import engines
+
+from .workload import Session, Step
+
+__all__ = ["Sample", "RunResult", "run_workload", "count_db_round_trips"]
+
+_VARIABLE = re.compile(r"\$\{(\w+)\}")
+
+# Statements + commits issued on behalf of the current session step. Tasks
+# the request spawns (e.g. the stub payment settlement) copy the context
+# and are counted for that step too.
+_db_calls: ContextVar[Optional[list[int]]] = ContextVar("benchmark_db_calls", default=None)
+
+
+def _count(*_: Any) -> None:
+    calls = _db_calls.get()
+    if calls is not None:
+        calls[0] += 1
+
+
+@contextmanager
+def count_db_round_trips() -> Iterator[None]:
+    """Count cursor executions and commits on every engine while active."""
+    targets = [engine.sync_engine for engine in engines().values()]
+    for target in targets:
+        event.listen(target, "before_cursor_execute", _count)
+        event.listen(target, "commit", _count)
+    try:
+        yield
+    finally:
+        for target in targets:
+            event.remove(target, "before_cursor_execute", _count)
+            event.remove(target, "commit", _count)
+
+
+@dataclass(frozen=True)
+class Sample:
+    scenario: str
+    name: str
+    status: int  # 0: transport error / exception
+    latency_ms: float
+    db_round_trips: int
+
+
+@dataclass(frozen=True)
+class RunResult:
+    samples: list[Sample]
+    duration_seconds: float
+    concurrency: int
+    sessions: int
+
+
+def _substitute(value: Any, variables: dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return _VARIABLE.sub(lambda m: variables.get(m[1], m[0]), value)
+    if isinstance(value, list):
+        return [_substitute(v, variables) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, variables) for k, v in value.items()}
+    return value
+
+
+async def _run_step(
+        client: httpx.AsyncClient,
+        session: Session,
+        step: Step,
+        variables: dict[str, str]) -> tuple[Sample, Optional[httpx.Response]]:
+    calls = [0]
+    token = _db_calls.set(calls)
+    started = time.perf_counter()
+    response: Optional[httpx.Response] = None
+    try:
+        response = await client.request(
+            step.method,
+            _substitute(step.path, variables),
+            json=_substitute(step.json, variables),
+            headers={"Authorization": f"Bearer {step.user}"},
+        )
+    except Exception:
+        pass
+    finally:
+        latency = (time.perf_counter() - started) * 1000
+        _db_calls.reset(token)
+
+    status = response.status_code if response is not None else 0
+    return Sample(session.scenario, step.name, status, latency, calls[0]), response
+
+
+async def _run_session(client: httpx.AsyncClient, session: Session, samples: list[Sample]) -> None:
+    variables: dict[str, str] = {}
+    for step in session.steps:
+        sample, response = await _run_step(client, session, step, variables)
+        samples.append(sample)
+        if response is None or not response.is_success:
+            return
+        if step.capture:
+            try:
+                body = response.json()
+            except json.JSONDecodeError:
+                return
+            for name in step.capture:
+                if isinstance(body, dict) and name in body:
+                    variables[name] = str(body[name])
+
+
+async def run_workload(
+        sessions: list[Session],
+        *,
+        concurrency: int,
+        repeat: int = 1,
+        warmup: int = 0) -> RunResult:
+    """Replay `sessions` (`repeat` times) with `concurrency` concurrent clients.
+
+    The first `warmup` sessions run once before timing starts and are not
+    reported (they fill caches and connection pools).
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            with count_db_round_trips():
+                discard: list[Sample] = []
+                for session in sessions[:warmup]:
+                    await _run_session(client, session, discard)
+
+                queue: asyncio.Queue[Session] = asyncio.Queue()
+                for _ in range(repeat):
+                    for session in sessions:
+                        queue.put_nowait(session)
+
+                samples: list[Sample] = []
+
+                async def worker() -> None:
+                    while True:
+                        try:
+                            session = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        await _run_session(client, session, samples)
+
+                started = time.perf_counter()
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+                duration = time.perf_counter() - started
+
+    return RunResult(
+        samples=samples,
+        duration_seconds=duration,
+        concurrency=concurrency,
+        sessions=len(sessions) * repeat,
+    )
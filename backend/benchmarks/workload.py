@@ -0,0 +1,242 @@
+"""Workload files: recorded client sessions, one JSON object per line.
+
+    {"scenario": "book", "steps": [
+        {"name": "PUT /book/reserve", "method": "PUT", "path": "/api/v1/book/reserve",
+         "user": 2, "json": {"show_id": "1", "seat_ids": ["3"]}, "capture": ["hold_token"]},
+        {"name": "POST /book", "method": "POST", "path": "/api/v1/book",
+         "user": 2, "json": {"show_id": "1", "seat_ids": ["3"], "hold_token": "${hold_token}"}}
+    ]}
+
+Steps of a session run in order. `capture` copies top-level fields of a
+step's JSON response into session variables, which later steps use as
+`${name}` in their path or body. A session stops at its first non-2xx step.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from urllib.parse import urlencode
+
+from sqlalchemy import select
+
+from app.config import CONFIG
+from app.db.models import Event, Inventory, InventoryStatus, Show, User, Venue
+from app.repositories.uow import AsyncUnitOfWork
+
+__all__ = [
+    "Step",
+    "Session",
+    "SCENARIOS",
+    "load_workload",
+    "save_workload",
+    "parse_mix",
+    "generate_workload",
+]
+
+# Default scenario weights of `generate`
+SCENARIOS = {
+    "browse": 50,         # GET /show listing pages
+    "details": 20,        # GET /show/{id}
+    "seatmap": 10,        # GET /show/{id}/seats
+    "reserve_storm": 10,  # PUT /book/reserve on a few seats of one hot show
+    "book": 10,           # reserve + POST /book on the hot show
+}
+
+# Seats of the hot show that the storm and booking scenarios fight over
+_HOT_SEATS = 24
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    method: str
+    path: str
+    user: int
+    json: Optional[dict[str, Any]] = None
+    capture: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"name": self.name, "method": self.method, "path": self.path, "user": self.user}
+        if self.json is not None:
+            out["json"] = self.json
+        if self.capture:
+            out["capture"] = list(self.capture)
+        return out
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Step":
+        return cls(
+            name=data.get("name") or f"{data['method']} {data['path']}",
+            method=data["method"].upper(),
+            path=data["path"],
+            user=int(data["user"]),
+            json=data.get("json"),
+            capture=tuple(data.get("capture") or ()),
+        )
+
+
+@dataclass(frozen=True)
+class Session:
+    scenario: str
+    steps: tuple[Step, ...] = field(default_factory=tuple)
+
+
+def load_workload(path: Path) -> list[Session]:
+    sessions = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+                sessions.append(Session(
+                    scenario=data["scenario"],
+                    steps=tuple(Step.from_dict(step) for step in data["steps"]),
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{n}: invalid session: {e}") from e
+    return sessions
+
+
+def save_workload(path: Path, sessions: Iterable[Session]) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for session in sessions:
+            f.write(json.dumps({
+                "scenario": session.scenario,
+                "steps": [step.to_dict() for step in session.steps],
+            }) + "\n")
+            count += 1
+    return count
+
+
+def parse_mix(spec: Optional[str]) -> dict[str, int]:
+    """"browse=60,book=40" -> weights; unknown scenarios are rejected."""
+    if not spec:
+        return dict(SCENARIOS)
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}; expected one of {sorted(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+@dataclass(frozen=True)
+class _Catalogue:
+    # (show_id, category, city)
+    shows: list[tuple[int, str, str]]
+    hot_show_id: int
+    hot_seat_ids: list[int]
+    user_ids: list[int]
+
+
+async def _load_catalogue(hot_show_id: Optional[int]) -> _Catalogue:
+    async with AsyncUnitOfWork() as uow:
+        rows = (await uow.session.execute(
+            select(Show.show_id, Event.event_type, Venue.city)
+            .join(Event, Event.event_id == Show.event_id)
+            .join(Venue, Venue.venue_id == Show.venue_id)
+            .order_by(Show.show_id)
+        )).all()
+        shows = [(int(show_id), getattr(kind, "value", kind), city) for show_id, kind, city in rows]
+        if not shows:
+            raise RuntimeError("no shows in the database; seed it with db/data_add_query.sql")
+
+        hot = hot_show_id or shows[0][0]
+        seat_ids = list((await uow.session.execute(
+            select(Inventory.seat_id)
+            .where(Inventory.show_id == hot, Inventory.status == InventoryStatus.available)
+            .order_by(Inventory.seat_id)
+            .limit(_HOT_SEATS)
+        )).scalars())
+        user_ids = list((await uow.session.execute(
+            select(User.user_id).order_by(User.user_id))).scalars())
+
+    if not seat_ids:
+        raise RuntimeError(f"show {hot} has no available seats")
+    if not user_ids:
+        raise RuntimeError("no users in the database")
+    return _Catalogue(shows, hot, seat_ids, user_ids)
+
+
+def _api(path: str) -> str:
+    return f"{CONFIG.api_v1_str}{path}"
+
+
+def _browse(rng: random.Random, cat: _Catalogue, user: int) -> Session:
+    _, category, city = rng.choice(cat.shows)
+    query = urlencode({"category": category, "city": city})
+    return Session("browse", (Step("GET /show", "GET", _api(f"/show?{query}"), user),))
+
+
+def _details(rng: random.Random, cat: _Catalogue, user: int) -> Session:
+    show_id = rng.choice(cat.shows)[0]
+    return Session("details", (Step("GET /show/{id}", "GET", _api(f"/show/{show_id}"), user),))
+
+
+def _seatmap(rng: random.Random, cat: _Catalogue, user: int) -> Session:
+    # Skewed towards the hot show, like an on-sale
+    show_id = cat.hot_show_id if rng.random() < 0.5 else rng.choice(cat.shows)[0]
+    return Session("seatmap", (Step("GET /show/{id}/seats", "GET", _api(f"/show/{show_id}/seats"), user),))
+
+
+def _pick_seats(rng: random.Random, cat: _Catalogue) -> list[str]:
+    return [str(s) for s in rng.sample(cat.hot_seat_ids, rng.randint(1, min(4, len(cat.hot_seat_ids))))]
+
+
+def _reserve_step(cat: _Catalogue, user: int, seats: list[str]) -> Step:
+    return Step(
+        "PUT /book/reserve", "PUT", _api("/book/reserve"), user,
+        json={"show_id": str(cat.hot_show_id), "seat_ids": seats},
+        capture=("hold_token",),
+    )
+
+
+def _reserve_storm(rng: random.Random, cat: _Catalogue, user: int) -> Session:
+    return Session("reserve_storm", (_reserve_step(cat, user, _pick_seats(rng, cat)),))
+
+
+def _book(rng: random.Random, cat: _Catalogue, user: int) -> Session:
+    seats = _pick_seats(rng, cat)
+    return Session("book", (
+        _reserve_step(cat, user, seats),
+        Step(
+            "POST /book", "POST", _api("/book"), user,
+            json={"show_id": str(cat.hot_show_id), "seat_ids": seats, "hold_token": "${hold_token}"},
+        ),
+    ))
+
+
+_BUILDERS = {
+    "browse": _browse,
+    "details": _details,
+    "seatmap": _seatmap,
+    "reserve_storm": _reserve_storm,
+    "book": _book,
+}
+
+
+async def generate_workload(
+        *,
+        sessions: int,
+        mix: dict[str, int],
+        seed: int,
+        hot_show_id: Optional[int] = None) -> list[Session]:
+    """Record `sessions` sessions drawn from `mix` against the seeded catalogue."""
+    cat = await _load_catalogue(hot_show_id)
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    return [
+        _BUILDERS[name](rng, cat, rng.choice(cat.user_ids))
+        for name in rng.choices(names, weights=weights, k=sessions)
+    ]
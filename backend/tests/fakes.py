@@ -0,0 +1,172 @@
+"""In-memory stand-ins for the unit of work and the seat lock service."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from app.db.models import BookingStatus, InventoryStatus, PaymentStatus
+
+
+@dataclass
+class FakeDB:
+    inventory: dict[tuple[int, int], InventoryStatus] = field(default_factory=dict)
+    bookings: dict[int, SimpleNamespace] = field(default_factory=dict)
+    payments: dict[int, SimpleNamespace] = field(default_factory=dict)
+    tickets: list[tuple[int, int]] = field(default_factory=list)
+    available_delta: int = 0
+
+
+class _Inventory:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def get_statuses(self, *, seats: list[tuple[int, int]]) -> dict:
+        return {key: self.db.inventory[key] for key in seats if key in self.db.inventory}
+
+    async def lock_for_update(self, *, show_id: int, seat_ids: list[int]) -> list[Any]:
+        return [
+            SimpleNamespace(seat_id=s, status=self.db.inventory[(show_id, s)])
+            for s in seat_ids if (show_id, s) in self.db.inventory
+        ]
+
+    async def mark_booked(self, *, show_id: int, seat_ids: list[int], booked_by: int) -> int:
+        updated = 0
+        for s in set(seat_ids):
+            if self.db.inventory.get((show_id, s)) == InventoryStatus.available:
+                self.db.inventory[(show_id, s)] = InventoryStatus.not_available
+                updated += 1
+        return updated
+
+    async def mark_booked_many(self, *, show_id: int, booked_by: dict[int, int]) -> int:
+        updated = 0
+        for s, user_id in booked_by.items():
+            updated += await self.mark_booked(show_id=show_id, seat_ids=[s], booked_by=user_id)
+        return updated
+
+
+class _Summary:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def apply_seats_delta(self, *, show_id: int, delta: int) -> None:
+        self.db.available_delta += delta
+
+
+class _Bookings:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def create_initiated(self, *, user_id: int, show_id: int,
+                               seat_ids: list[int], hold_token: str) -> Optional[int]:
+        if await self.get_initiated_by_hold(hold_token) is not None:
+            return None
+        booking_id = len(self.db.bookings) + 1
+        self.db.bookings[booking_id] = SimpleNamespace(
+            booking_id=booking_id, user_id=user_id, show_id=show_id,
+            status=BookingStatus.initiated, seat_ids=list(seat_ids), hold_token=hold_token)
+        return booking_id
+
+    async def create(self, *, user_id: int, show_id: int, status: BookingStatus,
+                     **_: Any) -> SimpleNamespace:
+        booking_id = len(self.db.bookings) + 1
+        booking = self.db.bookings[booking_id] = SimpleNamespace(
+            booking_id=booking_id, user_id=user_id, show_id=show_id,
+            status=status, seat_ids=None, hold_token=None)
+        return booking
+
+    async def create_many(self, *, rows: list[dict[str, Any]]) -> list[int]:
+        return [int((await self.create(**row)).booking_id) for row in rows]
+
+    async def get_initiated_by_hold(self, hold_token: str) -> Optional[SimpleNamespace]:
+        for booking in self.db.bookings.values():
+            if booking.hold_token == hold_token and booking.status == BookingStatus.initiated:
+                return booking
+        return None
+
+    async def get_for_update(self, booking_id: int) -> Optional[SimpleNamespace]:
+        return self.db.bookings.get(booking_id)
+
+    async def set_status(self, *, booking_id: int, status: BookingStatus,
+                         confirmed_at: Any = None) -> None:
+        self.db.bookings[booking_id].status = status
+
+
+class _Payments:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def create(self, *, booking_id: int, status: PaymentStatus, amount: int,
+                     currency: str, **_: Any) -> SimpleNamespace:
+        payment_id = len(self.db.payments) + 1
+        payment = SimpleNamespace(
+            payment_id=payment_id, booking_id=booking_id, status=status,
+            amount=amount, currency=currency)
+        self.db.payments[payment_id] = payment
+        return payment
+
+    async def create_many(self, *, rows: list[dict[str, Any]]) -> None:
+        for row in rows:
+            await self.create(**row)
+
+    async def get(self, payment_id: int) -> Optional[SimpleNamespace]:
+        return self.db.payments.get(payment_id)
+
+    async def set_status(self, *, payment_id: int, status: PaymentStatus) -> None:
+        self.db.payments[payment_id].status = status
+
+
+class _Tickets:
+    def __init__(self, db: FakeDB) -> None:
+        self.db = db
+
+    async def create_many(self, *, booking_id: int, seat_ids: list[int], **_: Any) -> None:
+        self.db.tickets += [(booking_id, s) for s in seat_ids]
+
+    async def create_for_bookings(self, *, seats_by_booking: dict[int, list[int]], **_: Any) -> None:
+        for booking_id, seat_ids in seats_by_booking.items():
+            await self.create_many(booking_id=booking_id, seat_ids=seat_ids)
+
+
+class FakeUnitOfWork:
+    """Applies writes immediately; good enough for single-task tests."""
+
+    def __init__(self, db: FakeDB) -> None:
+        self.table_inventory = _Inventory(db)
+        self.table_summary = _Summary(db)
+        self.table_bookings = _Bookings(db)
+        self.table_payments = _Payments(db)
+        self.table_tickets = _Tickets(db)
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+class FakeSeatLocks:
+    def __init__(self) -> None:
+        # seat key -> owner
+        self.holds: dict[str, str] = {}
+        # seat key -> TTL of the last extension
+        self.extended: dict[str, int] = {}
+
+    async def verify_holds(self, seat_keys: list[str], owner: str) -> list[str]:
+        return [key for key in seat_keys if self.holds.get(key) != owner]
+
+    async def extend_holds(self, seat_keys: list[str], owner: str, ttl_seconds: int) -> list[str]:
+        not_held = await self.verify_holds(seat_keys, owner)
+        if not not_held:
+            self.extended.update(dict.fromkeys(seat_keys, ttl_seconds))
+        return not_held
+
+    async def release_holds(self, seat_keys: list[str], owner: str) -> int:
+        released = [key for key in seat_keys if self.holds.get(key) == owner]
+        for key in released:
+            del self.holds[key]
+        return len(released)
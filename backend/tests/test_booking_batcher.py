@@ -0,0 +1,118 @@
+"""Group commit for book_seats: in-memory conflict resolution per caller.
+
+    python -m unittest discover -s tests -t .     (from backend/)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import BookingStatus, InventoryStatus
+from app.domain.errors import SeatNotAvailable
+from app.repositories.inventory_repo import InventoryRepo
+from app.services import bookings
+from app.services.bookings import BookingBatcher
+
+from .fakes import FakeDB, FakeUnitOfWork
+
+SHOW_ID = 7
+PRICE = 250
+
+
+class BookingBatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.db = FakeDB(inventory={
+            (SHOW_ID, seat_id): InventoryStatus.available for seat_id in range(1, 7)})
+        self.locked: list[list[int]] = []
+
+        async def price_seats(show_id: int, seat_ids: list[int]) -> tuple[int, str]:
+            return PRICE * len(seat_ids), "INR"
+
+        def unit_of_work(*_: Any, **__: Any) -> FakeUnitOfWork:
+            uow = FakeUnitOfWork(self.db)
+            lock_for_update = uow.table_inventory.lock_for_update
+
+            async def record_lock(*, show_id: int, seat_ids: list[int]) -> list[Any]:
+                self.locked.append(list(seat_ids))
+                return await lock_for_update(show_id=show_id, seat_ids=seat_ids)
+
+            uow.table_inventory.lock_for_update = record_lock  # type: ignore[method-assign]
+            return uow
+
+        for target, value in (("AsyncUnitOfWork", unit_of_work), ("price_seats", price_seats)):
+            patcher = mock.patch.object(bookings, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _book_together(self, *requests: tuple[int, list[int]]) -> list[Any]:
+        # A full batch flushes at once, in arrival order
+        batcher = BookingBatcher(window_ms=1000, max_size=len(requests))
+        return await asyncio.gather(
+            *(batcher.submit(user_id=user_id, show_id=SHOW_ID, seat_ids=seat_ids)
+              for user_id, seat_ids in requests),
+            return_exceptions=True,
+        )
+
+    def _owner(self, booking_id: int) -> int:
+        return self.db.bookings[booking_id].user_id
+
+    async def test_first_request_wins_an_overlapping_seat(self) -> None:
+        first, second, third = await self._book_together(
+            (1, [3, 1]), (2, [2, 3]), (3, [4, 5]))
+
+        self.assertEqual(self._owner(first), 1)
+        self.assertIsInstance(second, SeatNotAvailable)
+        self.assertEqual(second.args[0], [3])
+        self.assertEqual(self._owner(third), 3)
+        self.assertNotEqual(first, third)
+
+        self.assertEqual(sorted(self.db.tickets),
+                         [(first, 1), (first, 3), (third, 4), (third, 5)])
+        self.assertEqual(self.db.inventory[(SHOW_ID, 2)], InventoryStatus.available)
+        self.assertEqual(len(self.db.payments), 2)
+        self.assertEqual(self.db.available_delta, -4)
+        # One lock for the whole batch, over the union of its seats in order
+        self.assertEqual(self.locked, [[1, 2, 3, 4, 5]])
+
+    async def test_sold_seat_only_fails_its_own_request(self) -> None:
+        self.db.inventory[(SHOW_ID, 6)] = InventoryStatus.not_available
+        sold, booked = await self._book_together((1, [5, 6]), (2, [1]))
+
+        self.assertIsInstance(sold, SeatNotAvailable)
+        self.assertEqual(sold.args[0], [6])
+        self.assertEqual(self.db.bookings[booked].status, BookingStatus.confirmed)
+        self.assertEqual(self.db.tickets, [(booked, 1)])
+        self.assertEqual(self.db.inventory[(SHOW_ID, 5)], InventoryStatus.available)
+
+    async def test_batch_without_winners_writes_nothing(self) -> None:
+        self.db.inventory[(SHOW_ID, 1)] = InventoryStatus.not_available
+        results = await self._book_together((1, [1]), (2, [1, 2]))
+
+        self.assertTrue(all(isinstance(r, SeatNotAvailable) for r in results))
+        self.assertEqual(self.db.bookings, {})
+        self.assertEqual(self.db.payments, {})
+
+
+class InventoryLockOrderTest(unittest.IsolatedAsyncioTestCase):
+    async def test_rows_are_locked_in_seat_order(self) -> None:
+        statements: list[Any] = []
+
+        async def execute(stmt: Any) -> Any:
+            statements.append(stmt)
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=list))
+
+        repo = InventoryRepo(SimpleNamespace(execute=execute))  # type: ignore[arg-type]
+        await repo.lock_for_update(show_id=SHOW_ID, seat_ids=[3, 1, 2])
+
+        sql = str(statements[0].compile(dialect=postgresql.dialect()))
+        self.assertRegex(sql, r"ORDER BY inventories\.seat_id\s+FOR UPDATE")
+
+
+if __name__ == "__main__":
+    unittest.main()
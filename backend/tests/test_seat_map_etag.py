@@ -0,0 +1,32 @@
+"""If-None-Match handling of GET /show/{show_id}/seats."""
+
+from __future__ import annotations
+
+import unittest
+
+from app.api.v1.shows import _etag_matches
+
+ETAG = '"layout-avail"'
+
+
+class EtagMatchTest(unittest.TestCase):
+    def test_exact_tag(self) -> None:
+        self.assertTrue(_etag_matches(ETAG, ETAG))
+
+    def test_weakened_by_a_proxy(self) -> None:
+        self.assertTrue(_etag_matches(f"W/{ETAG}", ETAG))
+
+    def test_tag_in_a_list(self) -> None:
+        self.assertTrue(_etag_matches(f'"old", W/"a,b" , {ETAG}', ETAG))
+
+    def test_any_tag(self) -> None:
+        self.assertTrue(_etag_matches(" * ", ETAG))
+
+    def test_other_or_malformed_tags(self) -> None:
+        for header in ("", '"layout-old"', "layout-avail", 'W/"layout"'):
+            with self.subTest(header=header):
+                self.assertFalse(_etag_matches(header, ETAG))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""Two-phase booking (initiate -> provider -> confirm) with the stub provider.
+
+The unit of work, seat holds, pricing and availability fan-out are
+replaced by in-memory fakes, so these run without Postgres or Redis:
+
+    python -m unittest discover -s tests -t .     (from backend/)
+"""
+
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+from app.config import CONFIG
+from app.db.models import BookingStatus, InventoryStatus, PaymentStatus
+from app.domain.errors import BookingInProgress, HoldExpired, SeatNotAvailable
+from app.services import bookings
+from app.services.bookings import BookingService
+from app.services.payments import StubPaymentProvider
+from app.services.seat_lock import hold_owner, seat_lock_key
+
+from .fakes import FakeDB, FakeSeatLocks, FakeUnitOfWork
+
+SHOW_ID = 7
+USER_ID = 42
+HOLD_TOKEN = "hold-1"
+PRICE = 250
+
+
+class TwoPhaseBookingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.db = FakeDB(inventory={
+            (SHOW_ID, seat_id): InventoryStatus.available for seat_id in (1, 2, 3)})
+        self.locks = FakeSeatLocks()
+        self.provider = StubPaymentProvider(auto_complete=False, delay_ms=0)
+        self.published: list[tuple[int, str, list[int]]] = []
+
+        self.service = BookingService()
+        self.service._BookingService__seat_lock_service = self.locks  # type: ignore[attr-defined]
+        self.provider.on_settled(self.service.confirm_payment)
+
+        async def price_seats(show_id: int, seat_ids: list[int]) -> tuple[int, str]:
+            return PRICE * len(seat_ids), "INR"
+
+        async def publish(show_id: int, state: str, seat_ids: list[int]) -> None:
+            self.published.append((show_id, state, list(seat_ids)))
+
+        for target, value in (
+            ("AsyncUnitOfWork", lambda *_, **__: FakeUnitOfWork(self.db)),
+            ("price_seats", price_seats),
+            ("payment_provider", self.provider),
+            ("seat_availability", SimpleNamespace(publish=publish)),
+        ):
+            patcher = mock.patch.object(bookings, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _hold(self, *seat_ids: int, token: str = HOLD_TOKEN) -> None:
+        for seat_id in seat_ids:
+            self.locks.holds[seat_lock_key(SHOW_ID, seat_id)] = hold_owner(str(USER_ID), token)
+
+    async def _initiate(self, *seat_ids: int, token: str = HOLD_TOKEN) -> Any:
+        return await self.service.initiate_booking(
+            user_id=str(USER_ID),
+            show_id=str(SHOW_ID),
+            seat_ids=[str(s) for s in seat_ids],
+            hold_token=token,
+        )
+
+    async def test_initiate_leaves_booking_pending(self) -> None:
+        self._hold(1, 2)
+        init = await self._initiate(1, 2)
+
+        self.assertEqual(init.status, PaymentStatus.pending)
+        self.assertEqual(self.db.bookings[init.booking_id].status, BookingStatus.initiated)
+        self.assertEqual(self.db.payments[init.payment_id].amount, 2 * PRICE)
+        self.assertEqual(self.db.inventory[(SHOW_ID, 1)], InventoryStatus.available)
+        self.assertEqual(len(self.locks.holds), 2)
+        self.assertEqual(len(self.locks.extended), 2)
+
+    async def test_successful_payment_confirms_and_issues_tickets(self) -> None:
+        self._hold(1, 2)
+        init = await self._initiate(1, 2)
+        await self.provider.complete(init.payment_id, succeeded=True)
+
+        self.assertEqual(self.db.bookings[init.booking_id].status, BookingStatus.confirmed)
+        self.assertEqual(self.db.payments[init.payment_id].status, PaymentStatus.success)
+        self.assertEqual(sorted(self.db.tickets), [(init.booking_id, 1), (init.booking_id, 2)])
+        self.assertEqual(self.db.inventory[(SHOW_ID, 2)], InventoryStatus.not_available)
+        self.assertEqual(self.db.available_delta, -2)
+        self.assertEqual(self.locks.holds, {})
+        self.assertEqual(self.published, [(SHOW_ID, bookings.SEAT_BOOKED, [1, 2])])
+
+    async def test_failed_payment_cancels_and_releases_seats(self) -> None:
+        self._hold(3)
+        init = await self._initiate(3)
+        await self.provider.complete(init.payment_id, succeeded=False)
+
+        self.assertEqual(self.db.bookings[init.booking_id].status, BookingStatus.cancelled)
+        self.assertEqual(self.db.payments[init.payment_id].status, PaymentStatus.failed)
+        self.assertEqual(self.db.inventory[(SHOW_ID, 3)], InventoryStatus.available)
+        self.assertEqual(self.db.tickets, [])
+        self.assertEqual(self.locks.holds, {})
+        self.assertEqual(self.published, [(SHOW_ID, bookings.SEAT_RELEASED, [3])])
+
+    async def test_retried_webhook_changes_nothing(self) -> None:
+        self._hold(1)
+        init = await self._initiate(1)
+        await self.provider.complete(init.payment_id, succeeded=True)
+        status = await self.service.confirm_payment(init.payment_id, succeeded=True)
+
+        self.assertEqual(status, BookingStatus.confirmed)
+        self.assertEqual(len(self.db.tickets), 1)
+        self.assertEqual(self.db.available_delta, -1)
+
+    async def test_second_initiate_on_same_hold_is_refused(self) -> None:
+        self._hold(1, 2)
+        first = await self._initiate(1, 2)
+
+        with self.assertRaises(BookingInProgress) as raised:
+            await self._initiate(1, 2)
+
+        self.assertEqual(raised.exception.args[0], first.booking_id)
+        self.assertEqual(len(self.db.bookings), 1)
+        self.assertEqual(len(self.db.payments), 1)
+
+    async def test_refused_booking_does_not_extend_holds(self) -> None:
+        self.db.inventory[(SHOW_ID, 2)] = InventoryStatus.not_available
+        self._hold(1, 2)
+        with self.assertRaises(SeatNotAvailable):
+            await self._initiate(1, 2)
+        self.assertEqual(self.locks.extended, {})
+
+    async def test_hold_can_book_again_after_a_failed_payment(self) -> None:
+        self._hold(1)
+        first = await self._initiate(1)
+        await self.provider.complete(first.payment_id, succeeded=False)
+
+        self._hold(1)
+        second = await self._initiate(1)
+        self.assertNotEqual(second.booking_id, first.booking_id)
+
+    async def test_duplicate_seat_ids_are_rejected(self) -> None:
+        self._hold(1)
+        with self.assertRaises(ValueError):
+            await self._initiate(1, 1)
+        self.assertEqual(self.db.bookings, {})
+
+    async def test_inline_booking_accepts_unnormalized_ids(self) -> None:
+        self._hold(1, 3)
+        with mock.patch.object(CONFIG, "booking_group_commit", False), \
+                mock.patch.object(CONFIG, "booking_commit_engine", "orm"):
+            booking_id = await self.service.book_seats(
+                user_id=str(USER_ID), show_id="07", seat_ids=["01", " 3"], hold_token=HOLD_TOKEN)
+
+        self.assertEqual(self.db.bookings[booking_id].status, BookingStatus.confirmed)
+        self.assertEqual(sorted(self.db.tickets), [(booking_id, 1), (booking_id, 3)])
+        self.assertEqual(self.locks.holds, {})
+
+    async def test_seats_not_held_are_refused(self) -> None:
+        self._hold(1)
+        with self.assertRaises(HoldExpired) as raised:
+            await self._initiate(1, 2)
+        self.assertEqual(raised.exception.args[0], [2])
+
+    async def test_sold_seat_is_refused(self) -> None:
+        self.db.inventory[(SHOW_ID, 2)] = InventoryStatus.not_available
+        self._hold(2)
+        with self.assertRaises(SeatNotAvailable):
+            await self._initiate(2)
+        self.assertEqual(self.db.payments, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
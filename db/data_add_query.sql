@@ -4,6 +4,7 @@ BEGIN;
 -- 0) Reset (drop data only)
 -- ------------------------------------------------------------
 TRUNCATE TABLE
+  show_summary,
   tickets,
   payments,
   bookings,
@@ -199,6 +200,22 @@ JOIN venue_sections vs ON vs.venue_id = v.venue_id
 JOIN venue_seats seat ON seat.section_id = vs.section_id
 JOIN show_pricings sp ON sp.show_id = s.show_id AND sp.section_id = vs.section_id;
 
+-- ------------------------------------------------------------
+-- 9) Show summary: listing projection (min price + seats left)
+-- ------------------------------------------------------------
+INSERT INTO show_summary (show_id, min_price, currency, total_seats, available_seats, sold_out, updated_at)
+SELECT
+  s.show_id,
+  (SELECT min(sp.amount)   FROM show_pricings sp WHERE sp.show_id = s.show_id),
+  (SELECT min(sp.currency) FROM show_pricings sp WHERE sp.show_id = s.show_id),
+  count(i.seat_id),
+  count(i.seat_id) FILTER (WHERE i.status = 'available'),
+  count(i.seat_id) FILTER (WHERE i.status = 'available') = 0,
+  now()
+FROM shows s
+LEFT JOIN inventories i ON i.show_id = s.show_id
+GROUP BY s.show_id;
+
 COMMIT;
 
 -- Quick sanity checks (optional)
@@ -0,0 +1,6 @@
+-- inventories had no primary key: lock_for_update / mark_booked filter on
+-- (show_id, seat_id) and fell back to sequential scans.
+ALTER TABLE "inventories"
+  ALTER COLUMN "show_id" SET NOT NULL,
+  ALTER COLUMN "seat_id" SET NOT NULL,
+  ADD CONSTRAINT "pk_inventories" PRIMARY KEY ("show_id", "seat_id");
@@ -0,0 +1,39 @@
+-- Bring the baseline DDL in line with the constraints declared in
+-- app/db/models.py.
+
+-- bookings: typo in the column name, missing show FK
+ALTER TABLE "bookings" RENAME COLUMN "confirnmed_at" TO "confirmed_at";
+ALTER TABLE "bookings"
+  ADD CONSTRAINT "FK_bookings_show_id"
+    FOREIGN KEY ("show_id") REFERENCES "shows"("show_id");
+
+-- payments: missing booking FK
+ALTER TABLE "payments"
+  ADD CONSTRAINT "FK_payments_booking_id"
+    FOREIGN KEY ("booking_id") REFERENCES "bookings"("booking_id");
+
+-- show_pricings: show_id was a SERIAL with no FK and there was no key at all
+ALTER TABLE "show_pricings" ALTER COLUMN "show_id" DROP DEFAULT;
+DROP SEQUENCE IF EXISTS "show_pricings_show_id_seq";
+ALTER TABLE "show_pricings"
+  ALTER COLUMN "section_id" SET NOT NULL,
+  ADD CONSTRAINT "pk_show_pricings" PRIMARY KEY ("show_id", "section_id"),
+  ADD CONSTRAINT "FK_show_pricings_show_id"
+    FOREIGN KEY ("show_id") REFERENCES "shows"("show_id");
+
+-- tickets: the models (and the booking paths) write tickets.show_id
+ALTER TABLE "tickets" ADD COLUMN "show_id" int4;
+UPDATE "tickets" t
+SET "show_id" = b."show_id"
+FROM "bookings" b
+WHERE b."booking_id" = t."booking_id";
+ALTER TABLE "tickets"
+  ALTER COLUMN "show_id" SET NOT NULL,
+  ADD CONSTRAINT "FK_tickets_show_id"
+    FOREIGN KEY ("show_id") REFERENCES "shows"("show_id");
+
+-- unique constraints declared on the models
+ALTER TABLE "venue_sections"
+  ADD CONSTRAINT "uq_venue_sections_venue_id_name" UNIQUE ("venue_id", "name");
+ALTER TABLE "venue_seats"
+  ADD CONSTRAINT "uq_venue_seats_section_row_col" UNIQUE ("section_id", "row_nums", "col_nums");
@@ -0,0 +1,21 @@
+-- Indexes for the predicates of the repositories' hot queries.
+
+-- ShowsRepo.list_by_venue, and show listings joined per venue
+CREATE INDEX IF NOT EXISTS "idx_shows_venue_id_start_time" ON "shows" ("venue_id", "start_time");
+-- ShowsRepo.list_by_event
+CREATE INDEX IF NOT EXISTS "idx_shows_event_id" ON "shows" ("event_id");
+-- Keyset pagination of show listings (also in the baseline since it was added)
+CREATE INDEX IF NOT EXISTS "idx_shows_start_time_show_id" ON "shows" ("start_time", "show_id");
+
+-- list_shows filters on lower(city); covering so the venue name comes from the index
+CREATE INDEX IF NOT EXISTS "idx_venues_lower_city"
+  ON "venues" (lower("city")) INCLUDE ("venue_id", "name");
+
+-- Seat layout loads (venue_seats by section)
+CREATE INDEX IF NOT EXISTS "idx_venue_seats_section_id" ON "venue_seats" ("section_id");
+
+-- Tickets of a booking
+CREATE INDEX IF NOT EXISTS "idx_tickets_booking_id" ON "tickets" ("booking_id");
+
+-- Bookings of a user
+CREATE INDEX IF NOT EXISTS "idx_bookings_user_id" ON "bookings" ("user_id");
@@ -0,0 +1,6 @@
+-- The hold reaper expires bookings left in `initiated`; it needs their age.
+ALTER TABLE "bookings" ADD COLUMN "created_at" timestamptz NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS "idx_bookings_initiated_created_at"
+  ON "bookings" ("created_at")
+  WHERE "status" = 'initiated';
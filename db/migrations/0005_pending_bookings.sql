@@ -0,0 +1,5 @@
+-- Two-phase booking: an `initiated` booking remembers its seats and the
+-- seat hold it was made under until the payment webhook confirms it.
+ALTER TABLE "bookings"
+  ADD COLUMN "seat_ids" int4[],
+  ADD COLUMN "hold_token" text;
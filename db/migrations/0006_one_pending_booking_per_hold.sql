@@ -0,0 +1,4 @@
+-- At most one `initiated` booking per seat hold: a double-submitted
+-- POST /book must not start a second payment for the same seats.
+CREATE UNIQUE INDEX IF NOT EXISTS "uq_bookings_initiated_hold_token"
+  ON "bookings" ("hold_token") WHERE "status" = 'initiated';
@@ -0,0 +1,49 @@
+-- The show_summary listing projection (ShowSummaryRepo) was only added to
+-- the baseline schema; create it on databases that predate it and backfill
+-- it the way ShowSummaryRepo.rebuild() does. A no-op on fresh baselines
+-- apart from refreshing the summaries.
+CREATE TABLE IF NOT EXISTS "show_summary" (
+  "show_id" int4,
+  "min_price" int4,
+  "currency" varchar(3),
+  "total_seats" int4 NOT NULL DEFAULT 0,
+  "available_seats" int4 NOT NULL DEFAULT 0,
+  "sold_out" boolean NOT NULL DEFAULT false,
+  "updated_at" timestamptz,
+  PRIMARY KEY ("show_id"),
+  CONSTRAINT "FK_show_summary_show_id"
+    FOREIGN KEY ("show_id")
+      REFERENCES "shows"("show_id")
+      ON DELETE CASCADE
+);
+
+INSERT INTO "show_summary"
+  ("show_id", "min_price", "currency", "total_seats", "available_seats", "sold_out", "updated_at")
+SELECT
+  prices.show_id,
+  prices.min_price,
+  prices.currency,
+  coalesce(seats.total_seats, 0),
+  coalesce(seats.available_seats, 0),
+  coalesce(seats.available_seats, 0) <= 0,
+  now()
+FROM (
+  SELECT "show_id", min("amount") AS min_price, min("currency") AS currency
+  FROM "show_pricings"
+  GROUP BY "show_id"
+) AS prices
+LEFT OUTER JOIN (
+  SELECT
+    "show_id",
+    count("seat_id") AS total_seats,
+    count("seat_id") FILTER (WHERE "status" = 'available') AS available_seats
+  FROM "inventories"
+  GROUP BY "show_id"
+) AS seats ON seats.show_id = prices.show_id
+ON CONFLICT ("show_id") DO UPDATE SET
+  "min_price" = excluded."min_price",
+  "currency" = excluded."currency",
+  "total_seats" = excluded."total_seats",
+  "available_seats" = excluded."available_seats",
+  "sold_out" = excluded."sold_out",
+  "updated_at" = excluded."updated_at";
@@ -1,3 +1,5 @@
+-- Baseline schema. Later changes live in db/migrations and are applied
+-- with `make migrate` (backend/).
 BEGIN;
 DROP SCHEMA public CASCADE;
 CREATE SCHEMA public;
@@ -70,6 +72,9 @@ CREATE TABLE "shows" (
       REFERENCES "venues"("venue_id")
 );
 
+-- Keyset pagination of show listings
+CREATE INDEX "idx_shows_start_time_show_id" ON "shows" ("start_time", "show_id");
+
 CREATE TABLE "venue_seats" (
   "seat_id" SERIAL,
   "section_id" int4,
@@ -155,4 +160,19 @@ CREATE TABLE "tickets" (
       REFERENCES "bookings"("booking_id")
 );
 
+CREATE TABLE "show_summary" (
+  "show_id" int4,
+  "min_price" int4,
+  "currency" varchar(3),
+  "total_seats" int4 NOT NULL DEFAULT 0,
+  "available_seats" int4 NOT NULL DEFAULT 0,
+  "sold_out" boolean NOT NULL DEFAULT false,
+  "updated_at" timestamptz,
+  PRIMARY KEY ("show_id"),
+  CONSTRAINT "FK_show_summary_show_id"
+    FOREIGN KEY ("show_id")
+      REFERENCES "shows"("show_id")
+      ON DELETE CASCADE
+);
+
 COMMIT;
\ No newline at end of file